@@ -2,6 +2,7 @@
 Django admin customization.
 """
 from django.contrib import admin
+from django.db import router, transaction
 from accounts.models import User, Profile
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 
@@ -31,6 +32,13 @@ class UserAdmin(BaseUserAdmin):
         }),
     )
 
+    def save_model(self, request, obj, form, change):
+        """Create a new user's profile in the same transaction."""
+        with transaction.atomic(using=router.db_for_write(User)):
+            super().save_model(request, obj, form, change)
+            if not change:
+                Profile.objects.create(user=obj)
+
 
 admin.site.register(User, UserAdmin)
 admin.site.register(Profile)
@@ -45,6 +45,26 @@ class RegisterSerializer(serializers.ModelSerializer):
         return get_user_model().objects.create_user(**validated_data)
 
 
+class ProvisionUserSerializer(serializers.ModelSerializer):
+    """Serializer for one user of a bulk provisioning batch."""
+
+    email = serializers.EmailField(max_length=255)
+    password = serializers.CharField(
+        max_length=68, min_length=6, write_only=True, required=False
+    )
+
+    class Meta:
+        model = Profile
+        fields = [
+            'email',
+            'password',
+            'first_name',
+            'last_name',
+            'phone',
+            'about_me',
+        ]
+
+
 class AuthTokenSerializer(serializers.Serializer):
     """Serializer for the user auth token."""
     email = serializers.EmailField()
@@ -3,6 +3,7 @@ from .views import (
     RegisterUserView,
     ProfileUserView,
     CreateTokenView,
+    BulkProvisionUsersView,
 )
 
 
@@ -10,4 +11,7 @@ urlpatterns = [
     path("register/", RegisterUserView.as_view(), name='register'),
     path("profile/", ProfileUserView.as_view(), name='profile'),
     path("token/", CreateTokenView.as_view(), name='token'),
+    path(
+        "users/bulk/", BulkProvisionUsersView.as_view(), name='users-bulk'
+    ),
 ]
@@ -1,14 +1,22 @@
 """
 Views for user API.
 """
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError
 from django.shortcuts import get_object_or_404
-from rest_framework import generics, authentication, permissions
+from rest_framework import generics, permissions, status
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from accounts.authentication import CachedTokenAuthentication
+from accounts.throttling import BucketThrottle
 from .serializers import (
     RegisterSerializer,
     ProfileSerializer,
     AuthTokenSerializer,
+    ProvisionUserSerializer,
 )
 from accounts.models import Profile
+from resume.signals import notify_resumes_created
 from rest_framework.authtoken.views import ObtainAuthToken
 from rest_framework.settings import api_settings
 
@@ -22,13 +30,15 @@ class CreateTokenView(ObtainAuthToken):
     """Create a new auth token for user."""
     serializer_class = AuthTokenSerializer
     render_classes = api_settings.DEFAULT_RENDERER_CLASSES
+    # ObtainAuthToken disables throttling; passwords are checked here.
+    throttle_classes = [BucketThrottle]
 
 
 class ProfileUserView(generics.RetrieveUpdateAPIView):
     """Manage profile of authenticated user"""
     queryset = Profile.objects.all()
     serializer_class = ProfileSerializer
-    authentication_classes = [authentication.TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [permissions.IsAuthenticated]
 
     def get_object(self):
@@ -36,3 +46,79 @@ class ProfileUserView(generics.RetrieveUpdateAPIView):
         queryset = self.get_queryset()
         obj = get_object_or_404(queryset, user=self.request.user)
         return obj
+
+
+class BulkProvisionUsersView(generics.GenericAPIView):
+    """
+    Create many users and their profiles in one request for the SSO
+    importer. Invalid items and taken emails are reported by index
+    while the other users are created.
+    """
+    serializer_class = ProvisionUserSerializer
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [permissions.IsAdminUser]
+    max_items = 1000
+
+    def post(self, request, *args, **kwargs):
+        data = request.data
+        if not isinstance(data, list) or not data:
+            raise ValidationError(
+                {'non_field_errors': ['Expected a non-empty list of users.']}
+            )
+        if len(data) > self.max_items:
+            raise ValidationError({'non_field_errors': [
+                f'Ensure this list has at most {self.max_items} items.'
+            ]})
+
+        User = get_user_model()
+        entries, errors = [], []
+        seen = set()
+        for index, item in enumerate(data):
+            serializer = self.get_serializer(data=item)
+            if not serializer.is_valid():
+                errors.append({'index': index, 'errors': serializer.errors})
+                continue
+            entry = dict(serializer.validated_data)
+            entry['email'] = User.objects.normalize_email(entry['email'])
+            if entry['email'] in seen:
+                errors.append({'index': index, 'errors': {
+                    'email': ['Duplicate email in this batch.']
+                }})
+                continue
+            seen.add(entry['email'])
+            entries.append((index, entry))
+
+        taken = set(User.objects.filter(email__in=seen).values_list(
+            'email', flat=True
+        ))
+        for index, entry in entries:
+            if entry['email'] in taken:
+                errors.append({'index': index, 'errors': {
+                    'email': ['user with this email already exists.']
+                }})
+        entries = [
+            entry for _, entry in entries if entry['email'] not in taken
+        ]
+        errors.sort(key=lambda error: error['index'])
+
+        if not entries:
+            return Response(
+                {'results': [], 'errors': errors},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        try:
+            users = User.objects.bulk_create_users(entries)
+        except IntegrityError:
+            raise ValidationError({'non_field_errors': [
+                'An email of this batch was registered concurrently.'
+            ]})
+        notify_resumes_created(user.pk for user in users)
+        return Response(
+            {
+                'results': [
+                    {'id': user.pk, 'email': user.email} for user in users
+                ],
+                'errors': errors,
+            },
+            status=status.HTTP_201_CREATED,
+        )
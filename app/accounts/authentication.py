@@ -0,0 +1,243 @@
+"""
+Authentication classes for the APIs.
+"""
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework import exceptions
+from rest_framework.authentication import (
+    TokenAuthentication,
+    get_authorization_header,
+)
+from rest_framework.authtoken.models import Token
+
+
+TOKEN_KEY = 'auth:token:{key}'
+
+
+class LocalCache:
+    """
+    A thread-safe, size bounded LRU mapping whose entries expire
+    ``ttl`` seconds after they were stored.
+    """
+
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            value, expires = entry
+            if expires <= time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + self.ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+local_tokens = LocalCache(
+    maxsize=getattr(settings, 'TOKEN_LOCAL_CACHE_SIZE', 1024),
+    ttl=getattr(settings, 'TOKEN_LOCAL_CACHE_TTL', 30),
+)
+
+
+def get_token_cache():
+    """Return the shared cache backend holding tokens."""
+    return caches[getattr(settings, 'TOKEN_CACHE_ALIAS', 'default')]
+
+
+def _user_fields():
+    # Everything but the password hash, which stays out of the cache.
+    return [
+        field.attname
+        for field in get_user_model()._meta.concrete_fields
+        if field.attname != 'password'
+    ]
+
+
+def dump_token(token):
+    """Return the plain values the shared cache keeps of a token."""
+    return {
+        'db': token._state.db,
+        'token': [
+            getattr(token, field.attname)
+            for field in Token._meta.concrete_fields
+        ],
+        'user': [getattr(token.user, name) for name in _user_fields()],
+    }
+
+
+def load_token(data):
+    """
+    Rebuild a token and its user from ``dump_token`` values. The user's
+    password is deferred and loaded from the database if ever read.
+    """
+    user = get_user_model().from_db(data['db'], _user_fields(), data['user'])
+    token = Token.from_db(
+        data['db'],
+        [field.attname for field in Token._meta.concrete_fields],
+        data['token'],
+    )
+    token.user = user
+    return token
+
+
+def invalidate_tokens(*keys):
+    """Forget cached tokens in this process and in the shared cache."""
+    for key in keys:
+        local_tokens.delete(key)
+    get_token_cache().delete_many([TOKEN_KEY.format(key=key) for key in keys])
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    Token authentication that avoids the token and user lookup on
+    every request.
+
+    Tokens are looked up in a per-process LRU first, then in the shared
+    cache, and only then in the database. The shared cache holds the
+    token and user fields as plain values, without the password hash.
+    Deleting a token or saving its user invalidates both caches; other
+    processes notice once their local entry expires after
+    ``TOKEN_LOCAL_CACHE_TTL`` seconds.
+
+    ``aauthenticate`` is the native coroutine counterpart of
+    ``authenticate`` for async views.
+    """
+
+    def get_token(self, key):
+        token = local_tokens.get(key)
+        if token is not None:
+            return token
+
+        cache_key = TOKEN_KEY.format(key=key)
+        shared = get_token_cache()
+        data = shared.get(cache_key)
+        if data is not None:
+            token = load_token(data)
+        else:
+            model = self.get_model()
+            try:
+                token = model.objects.select_related('user').get(key=key)
+            except model.DoesNotExist:
+                return None
+            shared.set(
+                cache_key,
+                dump_token(token),
+                timeout=getattr(settings, 'TOKEN_CACHE_TIMEOUT', 300),
+            )
+        local_tokens.set(key, token)
+        return token
+
+    async def aget_token(self, key):
+        token = local_tokens.get(key)
+        if token is not None:
+            return token
+
+        cache_key = TOKEN_KEY.format(key=key)
+        shared = get_token_cache()
+        data = await shared.aget(cache_key)
+        if data is not None:
+            token = load_token(data)
+        else:
+            model = self.get_model()
+            try:
+                token = await model.objects.select_related('user').aget(
+                    key=key
+                )
+            except model.DoesNotExist:
+                return None
+            await shared.aset(
+                cache_key,
+                dump_token(token),
+                timeout=getattr(settings, 'TOKEN_CACHE_TIMEOUT', 300),
+            )
+        local_tokens.set(key, token)
+        return token
+
+    def get_key(self, request):
+        """
+        Return the token key of the Authorization header, or None when
+        the request does not use token authentication.
+        """
+        auth = get_authorization_header(request).split()
+        if not auth or auth[0].lower() != self.keyword.lower().encode():
+            return None
+        if len(auth) == 1:
+            raise exceptions.AuthenticationFailed(
+                'Invalid token header. No credentials provided.'
+            )
+        if len(auth) > 2:
+            raise exceptions.AuthenticationFailed(
+                'Invalid token header. '
+                'Token string should not contain spaces.'
+            )
+        try:
+            return auth[1].decode()
+        except UnicodeError:
+            raise exceptions.AuthenticationFailed(
+                'Invalid token header. '
+                'Token string should not contain invalid characters.'
+            )
+
+    async def aauthenticate(self, request):
+        key = self.get_key(request)
+        if key is None:
+            return None
+        return self.check_token(await self.aget_token(key))
+
+    def authenticate_credentials(self, key):
+        return self.check_token(self.get_token(key))
+
+    def check_token(self, token):
+        if token is None:
+            raise exceptions.AuthenticationFailed('Invalid token.')
+
+        if not token.user.is_active:
+            raise exceptions.AuthenticationFailed('User inactive or deleted.')
+
+        # Hand out copies so a request can never change the cached objects.
+        user = copy.copy(token.user)
+        token = copy.copy(token)
+        token.user = user
+        return (user, token)
+
+
+@receiver(post_delete, sender=Token)
+def token_deleted(sender, instance, **kwargs):
+    invalidate_tokens(instance.key)
+
+
+@receiver(post_save, sender=get_user_model())
+def user_saved(sender, instance, created, **kwargs):
+    if created:
+        return
+    keys = Token.objects.filter(user=instance).values_list('key', flat=True)
+    invalidate_tokens(*keys)
@@ -0,0 +1,39 @@
+"""
+Authentication backends.
+"""
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+
+from accounts import hashing
+
+
+class PooledModelBackend(ModelBackend):
+    """
+    ModelBackend hashing in the bounded pool of ``accounts.hashing``.
+
+    The user is loaded and saved in the request thread; only the
+    password check, and the rehash of outdated hashes, use the pool.
+    """
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        UserModel = get_user_model()
+        if username is None:
+            username = kwargs.get(UserModel.USERNAME_FIELD)
+        if username is None or password is None:
+            return None
+        try:
+            user = UserModel._default_manager.get_by_natural_key(username)
+        except UserModel.DoesNotExist:
+            # Hash anyway so unknown users take as long as wrong passwords.
+            hashing.make_password(password)
+            return None
+
+        valid, upgraded = hashing.verify_password(password, user.password)
+        if not valid:
+            return None
+        if upgraded is not None:
+            user.password = upgraded
+            user.save(update_fields=['password'])
+        if self.user_can_authenticate(user):
+            return user
+        return None
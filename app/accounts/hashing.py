@@ -0,0 +1,136 @@
+"""
+Password hashing in a bounded worker pool.
+
+Slow hashes run on at most ``PASSWORD_HASH_WORKERS`` threads so a burst
+of logins or registrations cannot occupy every request thread. At most
+``PASSWORD_HASH_MAX_PENDING`` hashes wait for or use the pool; callers
+beyond that wait ``PASSWORD_HASH_WAIT_TIMEOUT`` seconds for a slot and
+then get a 503. The hashers release the GIL, so the pool also spreads
+hashes over the available cores.
+"""
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import django
+from django.conf import settings
+from django.contrib.auth import hashers
+from rest_framework import exceptions
+
+
+class HashingPoolBusy(exceptions.APIException):
+    status_code = 503
+    default_detail = 'Too many password operations, try again later.'
+    default_code = 'hashing_pool_busy'
+
+
+_lock = threading.Lock()
+_pool = None
+
+
+def _workers():
+    return getattr(settings, 'PASSWORD_HASH_WORKERS', os.cpu_count() or 1)
+
+
+def get_pool():
+    """Return the process wide hashing pool and its slots."""
+    global _pool
+    if _pool is None:
+        with _lock:
+            if _pool is None:
+                workers = _workers()
+                pending = getattr(
+                    settings, 'PASSWORD_HASH_MAX_PENDING', workers * 4
+                )
+                _pool = (
+                    ThreadPoolExecutor(
+                        max_workers=workers,
+                        thread_name_prefix='password-hash',
+                    ),
+                    threading.BoundedSemaphore(max(pending, workers)),
+                )
+    return _pool
+
+
+def reset_pool():
+    """Shut the pool down so it is rebuilt from the current settings."""
+    global _pool
+    with _lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool[0].shutdown(wait=True)
+
+
+def run(func, *args):
+    """Run ``func(*args)`` in the hashing pool and return its result."""
+    executor, slots = get_pool()
+    timeout = getattr(settings, 'PASSWORD_HASH_WAIT_TIMEOUT', 5)
+    if not slots.acquire(timeout=timeout):
+        raise HashingPoolBusy()
+    try:
+        return executor.submit(func, *args).result()
+    finally:
+        slots.release()
+
+
+def make_password(password):
+    """Hash ``password`` with the preferred hasher in the pool."""
+    return run(hashers.make_password, password)
+
+
+def make_passwords(passwords):
+    """
+    Hash many passwords in parallel in the pool and return the hashes in
+    order. The batch takes one slot and queues one hash per worker at a
+    time, so the hashes of requests meanwhile do not wait for all of it.
+    """
+    executor, slots = get_pool()
+    timeout = getattr(settings, 'PASSWORD_HASH_WAIT_TIMEOUT', 5)
+    if not slots.acquire(timeout=timeout):
+        raise HashingPoolBusy()
+    try:
+        wave = _workers()
+        hashed = []
+        for start in range(0, len(passwords), wave):
+            hashed.extend(executor.map(
+                hashers.make_password, passwords[start:start + wave]
+            ))
+        return hashed
+    finally:
+        slots.release()
+
+
+def _verify(password, encoded):
+    if not hashers.check_password(password, encoded):
+        return False, None
+    hasher = hashers.identify_hasher(encoded)
+    preferred = hashers.get_hasher('default')
+    if (hasher.algorithm != preferred.algorithm
+            or preferred.must_update(encoded)):
+        return True, preferred.encode(password, preferred.salt())
+    return True, None
+
+
+def verify_password(password, encoded):
+    """
+    Check ``password`` against ``encoded`` in the pool.
+
+    Return ``(valid, new_encoded)`` where ``new_encoded`` is the
+    password hashed with the preferred hasher when ``encoded`` uses an
+    outdated algorithm or work factor, and None otherwise.
+    """
+    return run(_verify, password, encoded)
+
+
+def init_process():
+    """Initializer of worker processes used by ``make_password_in_process``."""
+    django.setup()
+
+
+def make_password_in_process(password):
+    """
+    Hash ``password`` in a worker process of a ProcessPoolExecutor set
+    up with ``init_process``, for batch jobs outside of requests. This
+    module is importable before Django is set up, unlike the models.
+    """
+    return hashers.make_password(password)
@@ -0,0 +1,199 @@
+"""
+Streaming import of users with their profile and resume sections.
+
+Rows are read lazily from CSV or JSONL, validated with the API
+serializers and written in chunks, so memory use depends on the chunk
+size rather than the file size. On PostgreSQL profiles and sections are
+written with ``COPY``; users still use ``bulk_create`` because their
+generated ids are needed to link the other rows.
+"""
+import csv
+import datetime
+import io
+import json
+
+from django.contrib.auth import get_user_model, hashers
+from django.db import DEFAULT_DB_ALIAS, connections, models, transaction
+
+from accounts import hashing
+from accounts.api.serializers import ProvisionUserSerializer
+from accounts.models import Profile
+from resume.api import serializers as resume_serializers
+from resume.models import (
+    Skill,
+    Education,
+    Certificate,
+    Experience
+)
+from resume.signals import notify_resumes_created, sections_bulk_written
+
+
+SECTIONS = {
+    'skills': (Skill, resume_serializers.SkillSerializer),
+    'educations': (Education, resume_serializers.EducationSerializer),
+    'certificates': (Certificate, resume_serializers.CertificateSerializer),
+    'experiences': (Experience, resume_serializers.ExperienceSerializer),
+}
+
+
+def read_rows(stream, format):
+    """
+    Yield ``(line, row)`` pairs from a CSV or JSONL text stream, ``row``
+    being None for lines that are not valid JSON objects.
+
+    CSV cells of the resume sections hold JSON lists.
+    """
+    if format == 'jsonl':
+        for line, text in enumerate(stream, 1):
+            if not text.strip():
+                continue
+            try:
+                row = json.loads(text)
+            except ValueError:
+                row = None
+            yield line, row if isinstance(row, dict) else None
+        return
+
+    reader = csv.DictReader(stream)
+    for row in reader:
+        row = {key: value for key, value in row.items() if value != ''}
+        try:
+            for name in SECTIONS.keys() & row.keys():
+                row[name] = json.loads(row[name])
+        except ValueError:
+            row = None
+        yield reader.line_num, row
+
+
+def validate_row(row):
+    """
+    Return ``(entry, errors)`` for a row, ``entry`` holding the
+    validated user fields, profile fields and section rows.
+    """
+    if row is None:
+        return None, {'non_field_errors': ['Malformed row.']}
+    errors = {}
+    user = ProvisionUserSerializer(data=row)
+    if not user.is_valid():
+        errors.update(user.errors)
+    sections = {}
+    for name, (_, serializer_class) in SECTIONS.items():
+        serializer = serializer_class(data=row.get(name, []), many=True)
+        if serializer.is_valid():
+            sections[name] = serializer.validated_data
+        else:
+            errors[name] = serializer.errors
+    if errors:
+        return None, errors
+
+    entry = dict(user.validated_data)
+    entry['email'] = get_user_model().objects.normalize_email(entry['email'])
+    entry['sections'] = sections
+    return entry, None
+
+
+def hash_passwords(entries, pool=None):
+    """Replace the raw passwords of ``entries`` by hashes, in ``pool``."""
+    pending = [entry for entry in entries if entry.get('password')]
+    passwords = [entry['password'] for entry in pending]
+    if pool is not None:
+        hashed = pool.map(
+            hashing.make_password_in_process, passwords, chunksize=16
+        )
+    else:
+        hashed = map(hashers.make_password, passwords)
+    for entry, encoded in zip(pending, hashed):
+        entry['password'] = encoded
+
+
+def _copy_value(value):
+    if value is None:
+        return '\\N'
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    return (
+        str(value).replace('\\', '\\\\').replace('\t', '\\t')
+        .replace('\n', '\\n').replace('\r', '\\r')
+    )
+
+
+def copy_buffer(objs, fields, connection):
+    """Return ``objs`` in the text format of PostgreSQL ``COPY``."""
+    buffer = io.StringIO()
+    for obj in objs:
+        buffer.write('\t'.join(
+            _copy_value(field.get_db_prep_save(
+                field.pre_save(obj, add=True), connection=connection
+            ))
+            for field in fields
+        ))
+        buffer.write('\n')
+    buffer.seek(0)
+    return buffer
+
+
+def insert_rows(model, objs, using=DEFAULT_DB_ALIAS, batch_size=1000):
+    """
+    Insert ``objs`` without returning their ids: with ``COPY`` on
+    PostgreSQL and ``bulk_create`` elsewhere.
+    """
+    if not objs:
+        return
+    connection = connections[using]
+    if connection.vendor != 'postgresql':
+        model.objects.using(using).bulk_create(objs, batch_size=batch_size)
+        return
+    fields = [
+        field for field in model._meta.concrete_fields
+        if not isinstance(field, models.AutoField)
+    ]
+    quote = connection.ops.quote_name
+    sql = 'COPY {} ({}) FROM STDIN'.format(
+        quote(model._meta.db_table),
+        ', '.join(quote(field.column) for field in fields),
+    )
+    with connection.cursor() as cursor:
+        cursor.copy_expert(sql, copy_buffer(objs, fields, connection))
+
+
+def write_chunk(entries, using=DEFAULT_DB_ALIAS):
+    """
+    Create the users, profiles and sections of validated ``entries``
+    whose passwords are already hashed, and return the users.
+    """
+    User = get_user_model()
+    users = []
+    # (user, row) pairs per model, the user ids being unknown yet.
+    rows = {Profile: []}
+    rows.update((model, []) for model, _ in SECTIONS.values())
+    for entry in entries:
+        entry = dict(entry)
+        password = entry.pop('password', None)
+        user = User(
+            email=entry.pop('email'),
+            password=password or hashers.make_password(None),
+        )
+        users.append(user)
+        for name, section in entry.pop('sections').items():
+            model = SECTIONS[name][0]
+            rows[model].extend((user, model(**data)) for data in section)
+        rows[Profile].append((user, Profile(**entry)))
+
+    with transaction.atomic(using=using):
+        User.objects.using(using).bulk_create(users, batch_size=1000)
+        # COPY bypasses the manager, which links skills on bulk_create.
+        Skill.objects.db_manager(using).link_canonical(
+            skill for _, skill in rows[Skill]
+        )
+        for model, pairs in rows.items():
+            for user, obj in pairs:
+                obj.user = user
+            objs = [obj for _, obj in pairs]
+            insert_rows(model, objs, using=using)
+            sections_bulk_written.send(
+                sender=model, objs=objs, previous=[], using=using
+            )
+        notify_resumes_created(user.pk for user in users)
+    return users
@@ -0,0 +1,144 @@
+"""
+Django command to import users from a CSV or JSONL file.
+"""
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from multiprocessing import get_context
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts import hashing, importing
+
+
+class Command(BaseCommand):
+    """Stream users with their profile and resume into the database."""
+    help = (
+        'Import users with their profile and resume sections from a CSV '
+        'or JSONL file in chunks, reporting progress and row errors.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV or JSONL file, - for stdin.')
+        parser.add_argument(
+            '--format', choices=['csv', 'jsonl'],
+            help='Input format, guessed from the file extension.',
+        )
+        parser.add_argument('--chunk-size', type=int, default=1000)
+        parser.add_argument(
+            '--workers', type=int, default=os.cpu_count() or 1,
+            help='Processes hashing passwords, 0 to hash in this process.',
+        )
+        parser.add_argument(
+            '--errors',
+            help='Write row errors as JSONL to this file instead of stderr.',
+        )
+
+    def get_format(self, options):
+        if options['format']:
+            return options['format']
+        extension = os.path.splitext(options['path'])[1].lower()
+        if extension in ('.csv', '.jsonl'):
+            return extension[1:]
+        raise CommandError('Cannot guess the format, use --format.')
+
+    def handle(self, *args, **options):
+        if options['chunk_size'] < 1 or options['workers'] < 0:
+            raise CommandError(
+                '--chunk-size must be positive and --workers not negative.'
+            )
+        format = self.get_format(options)
+
+        pool = None
+        if options['workers']:
+            pool = ProcessPoolExecutor(
+                max_workers=options['workers'],
+                mp_context=get_context('spawn'),
+                initializer=hashing.init_process,
+            )
+        stream = (
+            sys.stdin if options['path'] == '-'
+            else open(options['path'], newline='', encoding='utf-8')
+        )
+        errors_file = (
+            open(options['errors'], 'w') if options['errors'] else None
+        )
+        try:
+            self.stats = {'rows': 0, 'created': 0, 'failed': 0}
+            self.errors_file = errors_file
+            self.start = time.perf_counter()
+            rows = importing.read_rows(stream, format)
+            seen = set()
+            while True:
+                chunk = list(islice(rows, options['chunk_size']))
+                if not chunk:
+                    break
+                self.import_chunk(chunk, seen, pool)
+                self.report_progress()
+        finally:
+            if pool is not None:
+                pool.shutdown()
+            if stream is not sys.stdin:
+                stream.close()
+            if errors_file is not None:
+                errors_file.close()
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {self.stats['created']} users, "
+            f"{self.stats['failed']} rows failed."
+        ))
+
+    def import_chunk(self, chunk, seen, pool):
+        valid = []
+        for line, row in chunk:
+            entry, errors = importing.validate_row(row)
+            if entry is not None and entry['email'] in seen:
+                entry, errors = None, {
+                    'email': ['Duplicate email in this file.']
+                }
+            if entry is None:
+                self.report_error(line, row, errors)
+                continue
+            seen.add(entry['email'])
+            valid.append((line, entry))
+
+        taken = set(get_user_model().objects.filter(
+            email__in=[entry['email'] for _, entry in valid]
+        ).values_list('email', flat=True))
+        entries = []
+        for line, entry in valid:
+            if entry['email'] in taken:
+                self.report_error(line, entry, {
+                    'email': ['user with this email already exists.']
+                })
+            else:
+                entries.append(entry)
+
+        importing.hash_passwords(entries, pool)
+        importing.write_chunk(entries)
+        self.stats['rows'] += len(chunk)
+        self.stats['created'] += len(entries)
+
+    def report_error(self, line, row, errors):
+        self.stats['failed'] += 1
+        record = json.dumps({
+            'line': line,
+            'email': (row or {}).get('email'),
+            'errors': errors,
+        })
+        if self.errors_file is not None:
+            self.errors_file.write(record + '\n')
+        else:
+            self.stderr.write(record)
+
+    def report_progress(self):
+        elapsed = time.perf_counter() - self.start
+        self.stdout.write(
+            f"{self.stats['rows']} rows, {self.stats['created']} created, "
+            f"{self.stats['failed']} failed "
+            f"({self.stats['rows'] / elapsed:.0f} rows/s)"
+        )
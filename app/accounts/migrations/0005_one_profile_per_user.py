@@ -0,0 +1,33 @@
+# Generated by Django 4.2.30 on 2026-10-18 11:00
+
+from django.db import migrations
+from django.db.models import Min
+
+
+def one_profile_per_user(apps, schema_editor):
+    """Keep the oldest profile of every user and create missing ones."""
+    User = apps.get_model('accounts', 'User')
+    Profile = apps.get_model('accounts', 'Profile')
+    db = schema_editor.connection.alias
+
+    keep = Profile.objects.using(db).values('user').annotate(
+        first=Min('id')
+    ).values('first')
+    Profile.objects.using(db).exclude(id__in=keep).delete()
+
+    missing = User.objects.using(db).filter(profile__isnull=True)
+    Profile.objects.using(db).bulk_create(
+        [Profile(user_id=pk) for pk in missing.values_list('pk', flat=True)],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0004_alter_profile_phone'),
+    ]
+
+    operations = [
+        migrations.RunPython(one_profile_per_user, migrations.RunPython.noop),
+    ]
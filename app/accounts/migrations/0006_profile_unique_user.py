@@ -0,0 +1,19 @@
+# Generated by Django 4.2.30 on 2026-10-18 11:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # Separate from the data migration: PostgreSQL cannot alter a table
+    # with pending trigger events from its deletes in one transaction.
+
+    dependencies = [
+        ('accounts', '0005_one_profile_per_user'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='profile',
+            constraint=models.UniqueConstraint(fields=('user',), name='profile_unique_user'),
+        ),
+    ]
@@ -1,25 +1,64 @@
-from django.db import models
-from django.dispatch import receiver
-from django.db.models.signals import post_save
+from django.contrib.auth import hashers
+from django.db import models, transaction
 from django.contrib.auth.models import (
     AbstractBaseUser,
     PermissionsMixin,
     BaseUserManager
 )
 
+from accounts import hashing
+
 
 class UserManager(BaseUserManager):
     "Custom manager for users."
 
     def create_user(self, email, password=None, **extra_fields):
-        "Create, save and return a new user."
+        "Create, save and return a new user and their profile."
         if not email:
             raise ValueError('User must have an email address.')
         user = self.model(email=self.normalize_email(email), **extra_fields)
         user.set_password(password)
-        user.save()
+        with transaction.atomic(using=self.db):
+            user.save(using=self.db)
+            Profile.objects.using(self.db).create(user=user)
         return user
 
+    def bulk_create_users(self, entries, batch_size=500):
+        """
+        Create users and their profiles with one ``bulk_create`` per
+        table and return the users.
+
+        Every entry is a dict with an ``email``, an optional
+        ``password`` and optional Profile fields. Users without a
+        password get an unusable one. Emails must not exist yet. The
+        passwords are hashed in parallel in the hashing pool.
+        """
+        users, profiles, passwords = [], [], []
+        for entry in entries:
+            entry = dict(entry)
+            password = entry.pop('password', None)
+            user = self.model(email=self.normalize_email(entry.pop('email')))
+            if password is None:
+                user.password = hashers.make_password(None)
+            else:
+                passwords.append((user, password))
+            users.append(user)
+            profiles.append(Profile(**entry))
+        hashed = hashing.make_passwords(
+            [password for _, password in passwords]
+        )
+        for (user, _), encoded in zip(passwords, hashed):
+            user.password = encoded
+
+        with transaction.atomic(using=self.db):
+            self.bulk_create(users, batch_size=batch_size)
+            for user, profile in zip(users, profiles):
+                profile.user = user
+            Profile.objects.using(self.db).bulk_create(
+                profiles, batch_size=batch_size
+            )
+        return users
+
     def create_superuser(self, email, password, **extra_fields):
         "Create, save and return a new superuser."
         extra_fields.setdefault("is_staff", True)
@@ -47,6 +86,11 @@ class User(AbstractBaseUser, PermissionsMixin):
     def __str__(self):
         return self.email
 
+    def set_password(self, raw_password):
+        """Hash the password in the bounded hashing pool."""
+        self.password = hashing.make_password(raw_password)
+        self._password = raw_password
+
 
 class Profile(models.Model):
     """
@@ -65,10 +109,12 @@ class Profile(models.Model):
     created_date = models.DateTimeField(auto_now_add=True)
     updated_date = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user'], name='profile_unique_user'
+            ),
+        ]
+
     def __str__(self):
         return self.user.email
-
-    @receiver(post_save, sender=User)
-    def create_user_profile(sender, instance, created, **kwargs):
-        if created:
-            Profile.objects.create(user=instance)
@@ -3,13 +3,17 @@ from rest_framework.test import APIClient
 from rest_framework import status
 from django.contrib.auth import get_user_model
 from django.urls import reverse
+from accounts import throttling
 from accounts.models import Profile
+from metrics.testing import QueryPatternAssertionsMixin
 
 
 class RegisterUserAPITests(TestCase):
     """Tests for the RegisterUserView."""
 
     def setUp(self):
+        throttling.reset()
+        throttling.get_throttle_cache().clear()
         self.client = APIClient()
         self.url = reverse('accounts:register')
 
@@ -99,6 +103,8 @@ class TokenAPITests(TestCase):
     """
 
     def setUp(self):
+        throttling.reset()
+        throttling.get_throttle_cache().clear()
         self.client = APIClient()
         self.user = get_user_model().objects.create_user(
             email='test@example.com',
@@ -131,7 +137,7 @@ class TokenAPITests(TestCase):
         self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
 
 
-class ProfileAPITests(TestCase):
+class ProfileAPITests(QueryPatternAssertionsMixin, TestCase):
 
     def setUp(self):
         self.client = APIClient()
@@ -178,3 +184,12 @@ class ProfileAPITests(TestCase):
         self.assertEqual(profile.last_name, payload['last_name'])
         self.assertEqual(profile.about_me, payload['about_me'])
         self.assertEqual(profile.phone, payload['phone'])
+
+    def test_profile_has_no_duplicate_queries(self):
+        """Test reading and updating the profile repeats no query."""
+        self.client.force_authenticate(user=self.user)
+
+        with self.assertNoDuplicateQueries():
+            self.client.get(self.url)
+        with self.assertNoDuplicateQueries():
+            self.client.patch(self.url, {'first_name': 'test'})
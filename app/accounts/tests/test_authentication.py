@@ -0,0 +1,142 @@
+"""
+Tests for the cached token authentication.
+"""
+from django.contrib.auth import get_user_model
+from django.test import RequestFactory, TestCase
+from django.urls import reverse
+from rest_framework import exceptions, status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from accounts.authentication import (
+    TOKEN_KEY,
+    CachedTokenAuthentication,
+    LocalCache,
+    get_token_cache,
+    local_tokens,
+)
+
+
+class LocalCacheTests(TestCase):
+    """Test the in-process LRU cache."""
+
+    def test_evicts_least_recently_used(self):
+        cache = LocalCache(maxsize=2, ttl=60)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+
+        self.assertEqual(cache.get('a'), 1)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('c'), 3)
+
+    def test_entries_expire(self):
+        cache = LocalCache(maxsize=2, ttl=0)
+        cache.set('a', 1)
+
+        self.assertIsNone(cache.get('a'))
+
+
+class CachedTokenAuthenticationTests(TestCase):
+    """Test token lookups are cached and invalidated."""
+
+    def setUp(self):
+        local_tokens.clear()
+        get_token_cache().clear()
+        self.user = get_user_model().objects.create_user(
+            email='test@example.com',
+            password='testpass123',
+        )
+        self.token = Token.objects.create(user=self.user)
+        self.auth = CachedTokenAuthentication()
+
+    def test_cached_lookup_skips_database(self):
+        """Test only the first authentication queries the database."""
+        with self.assertNumQueries(1):
+            user, token = self.auth.authenticate_credentials(self.token.key)
+        with self.assertNumQueries(0):
+            user, token = self.auth.authenticate_credentials(self.token.key)
+
+        self.assertEqual(user, self.user)
+        self.assertEqual(token.key, self.token.key)
+
+    def test_shared_cache_used_after_local_miss(self):
+        """Test a process without a local entry reads the shared cache."""
+        self.auth.authenticate_credentials(self.token.key)
+        local_tokens.clear()
+
+        with self.assertNumQueries(0):
+            self.auth.authenticate_credentials(self.token.key)
+
+    def test_shared_cache_keeps_no_password(self):
+        """Test the shared cache holds plain values without the hash."""
+        self.auth.authenticate_credentials(self.token.key)
+        data = get_token_cache().get(TOKEN_KEY.format(key=self.token.key))
+        local_tokens.clear()
+
+        self.assertNotIn(self.user.password, repr(data))
+        user, token = self.auth.authenticate_credentials(self.token.key)
+        self.assertEqual(
+            (user.pk, user.email, token.key),
+            (self.user.pk, self.user.email, self.token.key),
+        )
+        self.assertTrue(user.check_password('testpass123'))
+
+    def test_returns_copies(self):
+        """Test requests never share the cached user instance."""
+        first, _ = self.auth.authenticate_credentials(self.token.key)
+        first.email = 'changed@example.com'
+
+        second, _ = self.auth.authenticate_credentials(self.token.key)
+
+        self.assertEqual(second.email, 'test@example.com')
+
+    def test_deleted_token_rejected(self):
+        """Test deleting a token invalidates the cache."""
+        self.auth.authenticate_credentials(self.token.key)
+        self.token.delete()
+
+        with self.assertRaises(exceptions.AuthenticationFailed):
+            self.auth.authenticate_credentials(self.token.key)
+
+    def test_deactivated_user_rejected(self):
+        """Test deactivating the user invalidates the cache."""
+        self.auth.authenticate_credentials(self.token.key)
+        self.user.is_active = False
+        self.user.save()
+
+        with self.assertRaises(exceptions.AuthenticationFailed):
+            self.auth.authenticate_credentials(self.token.key)
+
+    def test_invalid_token_rejected(self):
+        with self.assertRaises(exceptions.AuthenticationFailed):
+            self.auth.authenticate_credentials('invalid')
+
+    def test_profile_view_with_token(self):
+        """Test the API accepts the token header."""
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+
+        res = client.get(reverse('accounts:profile'))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['email'], self.user.email)
+
+    async def test_async_authentication_shares_caches(self):
+        """Test async lookups use and fill the same caches."""
+        request = RequestFactory().get(
+            '/', HTTP_AUTHORIZATION=f'Token {self.token.key}'
+        )
+
+        user, token = await self.auth.aauthenticate(request)
+
+        self.assertEqual(user.pk, self.user.pk)
+        self.assertIsNotNone(local_tokens.get(self.token.key))
+        self.assertIsNone(
+            await self.auth.aauthenticate(RequestFactory().get('/'))
+        )
+        with self.assertRaises(exceptions.AuthenticationFailed):
+            await self.auth.aauthenticate(RequestFactory().get(
+                '/', HTTP_AUTHORIZATION='Token invalid'
+            ))
@@ -0,0 +1,115 @@
+"""
+Tests for pooled password hashing.
+"""
+import threading
+from unittest import mock
+
+from django.contrib.auth import get_user_model, hashers
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from accounts import hashing, throttling
+
+
+TOKEN_URL = reverse('accounts:token')
+
+
+class HashingPoolTests(TestCase):
+
+    def setUp(self):
+        hashing.reset_pool()
+        self.addCleanup(hashing.reset_pool)
+        throttling.reset()
+        throttling.get_throttle_cache().clear()
+        self.client = APIClient()
+
+    def test_passwords_hashed_in_pool(self):
+        """Test set_password hashes outside the request thread."""
+        threads = []
+        make_password = hashers.make_password
+
+        def record(password):
+            threads.append(threading.current_thread().name)
+            return make_password(password)
+
+        with mock.patch.object(hashers, 'make_password', record):
+            user = get_user_model().objects.create_user(
+                'test@example.com', 'testpass123'
+            )
+
+        self.assertTrue(threads[0].startswith('password-hash'))
+        self.assertTrue(user.check_password('testpass123'))
+
+    @override_settings(PASSWORD_HASH_WORKERS=2)
+    def test_passwords_hashed_in_parallel(self):
+        """Test a batch of passwords is hashed by the pool, in order."""
+        threads = set()
+        make_password = hashers.make_password
+
+        def record(password):
+            threads.add(threading.current_thread().name)
+            return make_password(password)
+
+        with mock.patch.object(hashers, 'make_password', record):
+            hashed = hashing.make_passwords(['a', 'b', 'c'])
+
+        self.assertTrue(all(
+            name.startswith('password-hash') for name in threads
+        ))
+        self.assertEqual(
+            [hashers.check_password(p, e) for p, e in zip('abc', hashed)],
+            [True, True, True],
+        )
+        self.assertFalse(hashers.check_password('b', hashed[0]))
+
+    def test_login_upgrades_outdated_hash(self):
+        """Test logging in rehashes with the preferred hasher."""
+        user = get_user_model().objects.create_user('test@example.com')
+        user.password = hashers.make_password(
+            'testpass123', hasher='pbkdf2_sha1'
+        )
+        user.save()
+
+        res = self.client.post(
+            TOKEN_URL, {'email': user.email, 'password': 'testpass123'}
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        user.refresh_from_db()
+        self.assertTrue(user.password.startswith('pbkdf2_sha256$'))
+        self.assertTrue(user.check_password('testpass123'))
+
+    def test_wrong_password_not_upgraded(self):
+        """Test a failed login leaves the stored hash alone."""
+        user = get_user_model().objects.create_user('test@example.com')
+        encoded = hashers.make_password('testpass123', hasher='pbkdf2_sha1')
+        user.password = encoded
+        user.save()
+
+        res = self.client.post(
+            TOKEN_URL, {'email': user.email, 'password': 'wrongpass'}
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        user.refresh_from_db()
+        self.assertEqual(user.password, encoded)
+
+    @override_settings(
+        PASSWORD_HASH_WORKERS=1,
+        PASSWORD_HASH_MAX_PENDING=1,
+        PASSWORD_HASH_WAIT_TIMEOUT=0,
+    )
+    def test_busy_pool_returns_503(self):
+        """Test requests are rejected when every slot is taken."""
+        hashing.reset_pool()
+        _, slots = hashing.get_pool()
+        slots.acquire()
+        self.addCleanup(slots.release)
+
+        res = self.client.post(
+            TOKEN_URL, {'email': 'test@example.com', 'password': 'pass'}
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
@@ -0,0 +1,138 @@
+"""
+Tests for the import_users management command.
+"""
+import io
+import json
+import os
+import tempfile
+
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import TestCase
+
+from accounts import importing
+from accounts.models import Profile
+from resume.models import Skill, Education
+
+
+class ImportUsersCommandTests(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def write(self, name, text):
+        path = os.path.join(self.directory.name, name)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        return path
+
+    def call(self, *args, **options):
+        out = io.StringIO()
+        call_command(
+            'import_users', *args, stdout=out, stderr=io.StringIO(),
+            **options
+        )
+        return out.getvalue()
+
+    def test_import_jsonl(self):
+        """Test valid rows are imported and the others reported."""
+        get_user_model().objects.create_user('taken@example.com')
+        rows = [
+            {
+                'email': 'one@example.com',
+                'first_name': 'One',
+                'skills': [{'title': 'Python'}, {'title': 'SQL'}],
+                'educations': [{
+                    'institution': 'Uni',
+                    'degree': 'BSc',
+                    'start_date': '2010-09-01',
+                    'end_date': '2014-06-30',
+                }],
+            },
+            {'email': 'not-an-email'},
+            {'email': 'taken@example.com'},
+            {'email': 'one@example.com'},
+            {
+                'email': 'two@example.com',
+                'educations': [{
+                    'institution': 'Uni',
+                    'degree': 'BSc',
+                    'start_date': '2014-09-01',
+                    'end_date': '2010-06-30',
+                }],
+            },
+            {'email': 'three@example.com'},
+        ]
+        text = '\n'.join(json.dumps(row) for row in rows)
+        path = self.write('users.jsonl', text + '\n{broken\n')
+        errors = os.path.join(self.directory.name, 'errors.jsonl')
+
+        out = self.call(path, workers=0, chunk_size=2, errors=errors)
+
+        self.assertIn('Imported 2 users, 5 rows failed.', out)
+        self.assertIn('7 rows, 2 created, 5 failed', out)
+        with open(errors) as f:
+            reported = [json.loads(line) for line in f]
+        self.assertEqual(
+            sorted(error["line"] for error in reported), [2, 3, 4, 5, 7]
+        )
+        self.assertIn('educations', reported[-2]['errors'])
+        user = get_user_model().objects.get(email='one@example.com')
+        self.assertFalse(user.has_usable_password())
+        self.assertEqual(Profile.objects.get(user=user).first_name, 'One')
+        self.assertEqual(
+            list(Skill.objects.filter(user=user).values_list(
+                'title', flat=True
+            )),
+            ['Python', 'SQL'],
+        )
+        self.assertEqual(Education.objects.filter(user=user).count(), 1)
+        self.assertTrue(Profile.objects.filter(
+            user__email='three@example.com'
+        ).exists())
+
+    def test_import_csv_hashes_in_process_pool(self):
+        """Test CSV input with passwords hashed by worker processes."""
+        path = self.write('users.csv', (
+            'email,password,last_name,skills\n'
+            'one@example.com,testpass123,Smith,"[{""title"": ""Go""}]"\n'
+            'two@example.com,,,\n'
+        ))
+
+        self.call(path, workers=1)
+
+        one = get_user_model().objects.get(email='one@example.com')
+        self.assertTrue(one.check_password('testpass123'))
+        self.assertEqual(Profile.objects.get(user=one).last_name, 'Smith')
+        self.assertEqual(Skill.objects.get(user=one).title, 'Go')
+        two = get_user_model().objects.get(email='two@example.com')
+        self.assertFalse(two.has_usable_password())
+
+    def test_unknown_format(self):
+        path = self.write('users.txt', '')
+
+        with self.assertRaises(CommandError):
+            self.call(path)
+
+
+class CopyBufferTests(TestCase):
+
+    def test_copy_text_format(self):
+        """Test values are escaped for PostgreSQL COPY."""
+        user = get_user_model().objects.create_user('one@example.com')
+        profile = Profile(
+            user=user, first_name='Tab\there', about_me='a\\b\nc'
+        )
+        fields = [
+            Profile._meta.get_field(name)
+            for name in ('user', 'first_name', 'about_me', 'phone')
+        ]
+
+        buffer = importing.copy_buffer([profile], fields, connection)
+
+        self.assertEqual(
+            buffer.getvalue(),
+            f'{user.pk}\tTab\\there\ta\\\\b\\nc\t\\N\n',
+        )
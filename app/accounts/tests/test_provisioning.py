@@ -0,0 +1,174 @@
+"""
+Tests for user and profile provisioning.
+"""
+from unittest import mock
+
+from django.contrib import admin
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, connection, transaction
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from accounts.models import Profile
+
+
+BULK_URL = reverse('accounts:users-bulk')
+
+
+def inserts(queries):
+    return [
+        query for query in queries.captured_queries
+        if query['sql'].startswith('INSERT')
+    ]
+
+
+class ProvisioningModelTests(TestCase):
+
+    def test_create_user_inserts_user_and_profile(self):
+        """Test a user and their profile take one INSERT each."""
+        with CaptureQueriesContext(connection) as queries:
+            user = get_user_model().objects.create_user(
+                'test@example.com', 'testpass123'
+            )
+
+        self.assertEqual(len(inserts(queries)), 2)
+        self.assertTrue(Profile.objects.filter(user=user).exists())
+
+    def test_create_user_is_atomic(self):
+        """Test no user is left behind when the profile fails."""
+        with mock.patch.object(Profile, 'save', side_effect=IntegrityError):
+            with self.assertRaises(IntegrityError):
+                get_user_model().objects.create_user(
+                    'test@example.com', 'testpass123'
+                )
+
+        self.assertFalse(get_user_model().objects.exists())
+
+    def test_admin_save_is_atomic(self):
+        """Test the admin leaves no user behind when the profile fails."""
+        user_admin = admin.site._registry[get_user_model()]
+        user = get_user_model()(email='test@example.com')
+
+        with mock.patch.object(Profile, 'save', side_effect=IntegrityError):
+            with self.assertRaises(IntegrityError):
+                user_admin.save_model(None, user, None, change=False)
+
+        self.assertFalse(get_user_model().objects.exists())
+
+    def test_one_profile_per_user(self):
+        """Test a second profile for a user is rejected."""
+        user = get_user_model().objects.create_user('test@example.com')
+
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Profile.objects.create(user=user)
+
+    def test_bulk_create_users(self):
+        """Test bulk provisioning uses one INSERT per table."""
+        entries = [
+            {'email': f'user{i}@EXAMPLE.com', 'first_name': f'User {i}'}
+            for i in range(3)
+        ]
+        entries[0]['password'] = 'testpass123'
+
+        with CaptureQueriesContext(connection) as queries:
+            users = get_user_model().objects.bulk_create_users(entries)
+
+        self.assertEqual(len(inserts(queries)), 2)
+        self.assertEqual(users[1].email, 'user1@example.com')
+        self.assertEqual(
+            Profile.objects.get(user=users[2]).first_name, 'User 2'
+        )
+        self.assertTrue(users[0].check_password('testpass123'))
+        self.assertFalse(users[1].has_usable_password())
+
+
+class BulkProvisionAPITests(TestCase):
+
+    def setUp(self):
+        self.admin = get_user_model().objects.create_superuser(
+            'admin@example.com', 'testpass123'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.admin)
+
+    def test_staff_required(self):
+        """Test regular users cannot provision users."""
+        user = get_user_model().objects.create_user('user@example.com')
+        self.client.force_authenticate(user=user)
+
+        res = self.client.post(
+            BULK_URL, [{'email': 'new@example.com'}], format='json'
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_bulk_provision(self):
+        """Test valid users are created and the rest reported by index."""
+        payload = [
+            {'email': 'one@example.com', 'first_name': 'One'},
+            {'email': 'not-an-email'},
+            {'email': 'admin@example.com'},
+            {'email': 'two@example.com', 'password': 'testpass123'},
+            {'email': 'one@example.com'},
+        ]
+
+        res = self.client.post(BULK_URL, payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            [user['email'] for user in res.data['results']],
+            ['one@example.com', 'two@example.com'],
+        )
+        self.assertEqual(
+            [error['index'] for error in res.data['errors']], [1, 2, 4]
+        )
+        self.assertEqual(
+            Profile.objects.get(user__email='one@example.com').first_name,
+            'One',
+        )
+        res = self.client.post(
+            reverse('accounts:token'),
+            {'email': 'two@example.com', 'password': 'testpass123'},
+        )
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_nothing_valid(self):
+        """Test a batch without valid users is rejected."""
+        res = self.client.post(
+            BULK_URL, [{'email': 'admin@example.com'}], format='json'
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(get_user_model().objects.count(), 1)
+
+    def test_payload_must_be_list(self):
+        res = self.client.post(
+            BULK_URL, {'email': 'one@example.com'}, format='json'
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class AdminProvisioningTests(TestCase):
+
+    def test_admin_add_user_creates_profile(self):
+        """Test users added in the admin get a profile."""
+        admin = get_user_model().objects.create_superuser(
+            'admin@example.com', 'testpass123'
+        )
+        self.client.force_login(admin)
+
+        res = self.client.post(reverse('admin:accounts_user_add'), {
+            'email': 'new@example.com',
+            'password1': 'Complex-pass-123',
+            'password2': 'Complex-pass-123',
+            'is_active': 'on',
+        })
+
+        self.assertEqual(res.status_code, 302)
+        self.assertTrue(
+            Profile.objects.filter(user__email='new@example.com').exists()
+        )
@@ -0,0 +1,160 @@
+"""
+Tests for the token bucket throttling.
+"""
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from accounts import throttling
+
+
+TOKEN_URL = reverse('accounts:token')
+SKILLS_URL = reverse('resume:skill-list')
+
+
+def create_user(email='user@example.com', password='testpass123'):
+    """Create and return a user."""
+    return get_user_model().objects.create_user(email, password)
+
+
+class BucketTests(TestCase):
+    """Test the token bucket arithmetic."""
+
+    def test_parse_rate(self):
+        self.assertEqual(throttling.parse_rate('10/min'), (10, 10 / 60))
+        self.assertEqual(throttling.parse_rate('5/s'), (5, 5))
+        self.assertIsNone(throttling.parse_rate(None))
+
+    def test_lease_refills_over_time(self):
+        throttle = throttling.BucketThrottle()
+        rate = throttling.parse_rate('100/min')
+
+        # A new bucket is full and a tenth of it is leased.
+        self.assertEqual(throttle.lease(None, rate, 1000), (10, (90, 1000), 0))
+        # Half of the period refills half of the bucket.
+        leased, state, _ = throttle.lease((0, 1000), rate, 1030)
+        self.assertEqual((leased, state), (10, (40, 1030)))
+        # An empty bucket tells how long until the next token.
+        leased, state, wait = throttle.lease((0.5, 1000), rate, 1000)
+        self.assertEqual((leased, state), (0, None))
+        self.assertAlmostEqual(wait, 0.3)
+        # Unspent tokens of an expired lease are given back.
+        leased, state, _ = throttle.lease((0, 1000), rate, 1000, unspent=7)
+        self.assertEqual((leased, state), (7, (0, 1000)))
+
+
+@override_settings(THROTTLE_RATES={
+    'accounts:token': '3/min',
+    'resume:*': '2/min',
+})
+class ThrottleAPITests(TestCase):
+
+    def setUp(self):
+        throttling.reset()
+        throttling.get_throttle_cache().clear()
+        self.client = APIClient()
+        self.user = create_user()
+
+    def login(self, **extra):
+        return self.client.post(
+            TOKEN_URL,
+            {'email': 'user@example.com', 'password': 'wrongpass'},
+            **extra,
+        )
+
+    def test_token_throttled_per_address(self):
+        """Test login attempts are refused once the bucket is empty."""
+        for _ in range(3):
+            self.assertEqual(
+                self.login().status_code, status.HTTP_400_BAD_REQUEST
+            )
+
+        with mock.patch(
+            'accounts.api.serializers.AuthTokenSerializer.validate'
+        ) as validate:
+            res = self.login()
+
+        self.assertEqual(res.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        # A token every 20s, less the time the test took so far.
+        self.assertIn(int(res['Retry-After']), range(15, 21))
+        validate.assert_not_called()
+        res = self.login(REMOTE_ADDR='10.0.0.2')
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_front_bucket_spares_cache(self):
+        """Test refusals and leased tokens are served in process."""
+        with mock.patch.object(
+            throttling, 'get_throttle_cache',
+            wraps=throttling.get_throttle_cache,
+        ) as get_cache:
+            for _ in range(6):
+                self.login()
+
+        # One lease per token of the 3/min bucket, then local refusals.
+        self.assertEqual(get_cache.call_count, 4)
+
+    def test_buckets_shared_between_processes(self):
+        """Test another process cannot reuse spent tokens."""
+        for _ in range(3):
+            self.login()
+
+        # As seen from a new process.
+        throttling.local_buckets.clear()
+
+        self.assertEqual(
+            self.login().status_code, status.HTTP_429_TOO_MANY_REQUESTS
+        )
+
+    @override_settings(THROTTLE_RATES={'accounts:token': '100/min'})
+    def test_expired_lease_given_back(self):
+        """Test the tokens left of an expired lease return to the bucket."""
+        key = throttling.THROTTLE_KEY.format(
+            scope='accounts:token', ident='ip:127.0.0.1'
+        )
+        self.login()
+        cache = throttling.get_throttle_cache()
+        tokens, _ = cache.get(key)
+        self.assertAlmostEqual(tokens, 90, delta=1)
+
+        throttling.local_buckets.get(key).expires = 0
+        self.login()
+
+        # 9 tokens given back and 10 leased again.
+        tokens, _ = cache.get(key)
+        self.assertAlmostEqual(tokens, 89, delta=1)
+        self.assertEqual(throttling.local_buckets.get(key).tokens, 9)
+
+    def test_resume_throttled_per_user(self):
+        """Test the resume views share one bucket per user."""
+        self.client.force_authenticate(user=self.user)
+        self.client.get(SKILLS_URL)
+        self.client.get(reverse('resume:resume-retrieve'))
+
+        res = self.client.get(SKILLS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.client.force_authenticate(
+            user=create_user(email='other@example.com')
+        )
+        self.assertEqual(
+            self.client.get(SKILLS_URL).status_code, status.HTTP_200_OK
+        )
+
+    def test_async_views_throttled(self):
+        """Test the async views are throttled with Retry-After."""
+        url = reverse('resume:async-section-list', args=['skills'])
+        token = self.client.post(reverse('accounts:token'), {
+            'email': 'user@example.com', 'password': 'testpass123'
+        }).data['token']
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {token}')
+        for _ in range(2):
+            self.assertEqual(self.client.get(url).status_code, 200)
+
+        res = self.client.get(url)
+
+        self.assertEqual(res.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertIn(int(res['Retry-After']), range(25, 31))
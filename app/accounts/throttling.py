@@ -0,0 +1,231 @@
+"""
+Token bucket throttling of the APIs.
+
+Rates are configured per URL name in ``THROTTLE_RATES``, or for every
+URL of an app with ``"<namespace>:*"``, which then share one bucket.
+Authenticated requests are counted per user and anonymous ones per
+client address.
+
+The buckets live in the shared cache so all processes enforce the same
+rate, but a check rarely goes there: every process leases a tenth of a
+bucket at once and spends it from an in-process front bucket. A lease is
+spent within ``THROTTLE_LOCAL_TTL`` seconds; the tokens left then go back
+to the shared bucket with the next lease, so a client whose requests are
+spread over many processes is not refused for tokens idling in the
+others. A client that ran out is refused locally until the bucket
+refills, so a burst of refused requests costs no cache round trip
+either.
+"""
+import math
+import threading
+import time
+from collections import namedtuple
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from rest_framework.throttling import BaseThrottle
+
+from accounts.authentication import LocalCache
+
+
+THROTTLE_KEY = 'throttle:{scope}:{ident}'
+
+PERIODS = {'s': 1, 'm': 60, 'h': 60 * 60, 'd': 24 * 60 * 60}
+
+
+Rate = namedtuple('Rate', ['capacity', 'per_second'])
+
+
+def parse_rate(rate):
+    """
+    Parse ``"<capacity>/<period>"`` such as ``"10/min"``: bursts of
+    ``capacity`` requests, refilled over the period.
+    """
+    if rate is None:
+        return None
+    capacity, period = rate.split('/')
+    capacity = int(capacity)
+    return Rate(capacity, capacity / PERIODS[period.strip()[0]])
+
+
+class _FrontBucket:
+    __slots__ = ('tokens', 'expires', 'blocked_until')
+
+    def __init__(self, tokens, expires, blocked_until=0):
+        self.tokens = tokens
+        self.expires = expires
+        self.blocked_until = blocked_until
+
+
+_lock = threading.Lock()
+# Rate of every view name, read from the settings once.
+_rates = {}
+# Seconds a lease is spent from the front bucket.
+LEASE_TTL = getattr(settings, 'THROTTLE_LOCAL_TTL', 5)
+# Front buckets are kept past their lease to give back the unspent tokens.
+local_buckets = LocalCache(
+    maxsize=getattr(settings, 'THROTTLE_LOCAL_CACHE_SIZE', 10000),
+    ttl=2 * LEASE_TTL,
+)
+
+
+def get_throttle_cache():
+    """Return the shared cache backend holding the buckets."""
+    return caches[getattr(settings, 'THROTTLE_CACHE_ALIAS', 'default')]
+
+
+def get_rate(view_name):
+    """Return the ``(scope, Rate)`` of a view name, Rate None if free."""
+    try:
+        return _rates[view_name]
+    except KeyError:
+        pass
+    rates = getattr(settings, 'THROTTLE_RATES', {})
+    scope = view_name
+    if view_name not in rates and ':' in view_name:
+        scope = view_name.rsplit(':', 1)[0] + ':*'
+    _rates[view_name] = scope, parse_rate(rates.get(scope))
+    return _rates[view_name]
+
+
+def reset():
+    """Forget the rates and the buckets of this process."""
+    with _lock:
+        _rates.clear()
+    local_buckets.clear()
+
+
+@receiver(setting_changed)
+def throttle_settings_changed(setting, **kwargs):
+    if setting.startswith('THROTTLE_'):
+        reset()
+
+
+class BucketThrottle(BaseThrottle):
+    """
+    Throttle the views that have a rate in ``THROTTLE_RATES`` with the
+    shared token buckets.
+
+    ``aallow_request`` is the native coroutine counterpart of
+    ``allow_request`` for async views.
+    """
+    # Share of a bucket a process takes from the shared cache at once.
+    lease_fraction = 0.1
+
+    def __init__(self):
+        self.wait_time = None
+        # Unspent tokens of an expired lease, to give back.
+        self.unspent = 0
+
+    def get_bucket(self, request, user):
+        """Return the cache key and Rate of a request, Rate None if free."""
+        match = getattr(request, 'resolver_match', None)
+        if match is None:
+            return None, None
+        scope, rate = get_rate(match.view_name)
+        if rate is None:
+            return None, None
+        if user is not None and user.is_authenticated:
+            ident = f'user:{user.pk}'
+        else:
+            ident = f'ip:{self.get_ident(request)}'
+        return THROTTLE_KEY.format(scope=scope, ident=ident), rate
+
+    def take_local(self, key):
+        """
+        Spend a token of the front bucket: True or False when it decided,
+        None when a lease is needed.
+        """
+        with _lock:
+            front = local_buckets.get(key)
+            if front is None:
+                return None
+            now = time.monotonic()
+            if front.expires <= now:
+                local_buckets.delete(key)
+                self.unspent = front.tokens
+                return None
+            if front.tokens >= 1:
+                front.tokens -= 1
+                return True
+            wait = front.blocked_until - now
+            if wait > 0:
+                self.wait_time = wait
+                return False
+        return None
+
+    def lease(self, bucket, rate, now, unspent=0):
+        """
+        Give ``unspent`` tokens back and take a lease out of the shared
+        ``bucket`` state. Return the leased tokens, the new state to
+        store or None, and the seconds to wait when nothing was leased.
+        """
+        tokens, stamp = bucket or (rate.capacity, now)
+        tokens = min(
+            rate.capacity,
+            tokens + max(now - stamp, 0) * rate.per_second + unspent,
+        )
+        if tokens < 1:
+            return 0, None, (1 - tokens) / rate.per_second
+        leased = min(
+            int(tokens), max(1, int(rate.capacity * self.lease_fraction))
+        )
+        return leased, (tokens - leased, now), 0
+
+    def store_lease(self, key, leased, wait):
+        now = time.monotonic()
+        with _lock:
+            if leased:
+                local_buckets.set(
+                    key, _FrontBucket(leased - 1, now + LEASE_TTL)
+                )
+                return True
+            local_buckets.set(
+                key, _FrontBucket(0, now + LEASE_TTL, now + wait)
+            )
+            self.wait_time = wait
+            return False
+
+    def get_timeout(self, rate):
+        # Long enough to refill from empty, after which the bucket is full
+        # as if new.
+        return math.ceil(rate.capacity / rate.per_second) + 1
+
+    def allow_request(self, request, view):
+        key, rate = self.get_bucket(request, request.user)
+        if rate is None:
+            return True
+        allowed = self.take_local(key)
+        if allowed is not None:
+            return allowed
+
+        # The shared state is read and written without a lock, as DRF's
+        # own throttles do; concurrent leases may take the same tokens.
+        cache = get_throttle_cache()
+        leased, state, wait = self.lease(
+            cache.get(key), rate, time.time(), self.unspent
+        )
+        if state is not None:
+            cache.set(key, state, timeout=self.get_timeout(rate))
+        return self.store_lease(key, leased, wait)
+
+    async def aallow_request(self, request, user):
+        key, rate = self.get_bucket(request, user)
+        if rate is None:
+            return True
+        allowed = self.take_local(key)
+        if allowed is not None:
+            return allowed
+
+        cache = get_throttle_cache()
+        leased, state, wait = self.lease(
+            await cache.aget(key), rate, time.time(), self.unspent
+        )
+        if state is not None:
+            await cache.aset(key, state, timeout=self.get_timeout(rate))
+        return self.store_lease(key, leased, wait)
+
+    def wait(self):
+        return self.wait_time
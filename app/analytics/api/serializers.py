@@ -0,0 +1,21 @@
+"""
+Serializers for the analytics API.
+"""
+from rest_framework import serializers
+
+
+class RollupQuerySerializer(serializers.Serializer):
+    """Validate the query parameters of a rollup."""
+    limit = serializers.IntegerField(
+        min_value=1, max_value=100, required=False, default=10
+    )
+    year = serializers.IntegerField(
+        min_value=1, max_value=9999, required=False
+    )
+
+
+class RollupSerializer(serializers.Serializer):
+    """A counted value of a rollup."""
+    name = serializers.CharField()
+    count = serializers.IntegerField()
+    year = serializers.IntegerField(required=False)
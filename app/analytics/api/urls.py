@@ -0,0 +1,13 @@
+"""
+Url mappings for the analytics app.
+"""
+from django.urls import path
+
+from analytics.api import views
+
+
+app_name = 'analytics'
+
+urlpatterns = [
+    path('<str:metric>/', views.RollupAPIView.as_view(), name='rollup'),
+]
@@ -0,0 +1,39 @@
+"""
+Views for the analytics API.
+"""
+from django.http import Http404
+from rest_framework import generics
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from accounts.authentication import CachedTokenAuthentication
+from analytics import rollups
+from analytics.api import serializers
+
+
+class RollupAPIView(generics.GenericAPIView):
+    """
+    API view of the most common values across all resumes, for staff.
+
+    ``skills`` counts the skill rows of every canonical skill,
+    ``employers`` the experiences at every company and ``certificates``
+    the certificates of every issuer per year, optionally for one
+    ``year``. The counts are read from the precomputed rollups.
+    """
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [IsAdminUser]
+    serializer_class = serializers.RollupQuerySerializer
+
+    def get(self, request, metric, *args, **kwargs):
+        if metric not in rollups.METRICS:
+            raise Http404
+        params = self.get_serializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        results = rollups.top(
+            rollups.METRICS[metric],
+            limit=params.validated_data['limit'],
+            year=params.validated_data.get('year'),
+        )
+        return Response({
+            'metric': metric,
+            'results': serializers.RollupSerializer(results, many=True).data,
+        })
@@ -0,0 +1,27 @@
+"""
+Django command to rebuild the analytics rollups.
+"""
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS
+
+from analytics import rollups
+from analytics.models import Rollup
+
+
+class Command(BaseCommand):
+    """Recompute the rollups from the resume sections."""
+    help = (
+        'Recompute every analytics rollup from the resume sections, to '
+        'repair counts that drifted from the data. Safe to run '
+        'periodically.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        rollups.rebuild(using=options['database'])
+        count = Rollup.objects.using(options['database']).count()
+        self.stdout.write(self.style.SUCCESS(
+            f'Rebuilt {count} rollups.'
+        ))
@@ -0,0 +1,31 @@
+# Generated by Django 4.2.30 on 2026-10-18 11:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Rollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('metric', models.CharField(max_length=20)),
+                ('key', models.CharField(max_length=255)),
+                ('year', models.PositiveSmallIntegerField(default=0)),
+                ('count', models.IntegerField(default=0)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['metric', 'year', '-count'], name='rollup_metric_count_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='rollup',
+            constraint=models.UniqueConstraint(fields=('metric', 'key', 'year'), name='rollup_unique_key'),
+        ),
+    ]
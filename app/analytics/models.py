@@ -0,0 +1,33 @@
+"""
+Models of the cross-user analytics.
+"""
+from django.db import models
+
+
+class Rollup(models.Model):
+    """
+    The number of resume rows sharing a value, such as the skill rows
+    linked to a canonical skill, maintained as rows are written.
+    """
+    metric = models.CharField(max_length=20)
+    key = models.CharField(max_length=255)
+    # 0 for metrics that are not counted per year.
+    year = models.PositiveSmallIntegerField(default=0)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['metric', 'key', 'year'],
+                name='rollup_unique_key',
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=['metric', 'year', '-count'],
+                name='rollup_metric_count_idx',
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.metric} {self.key} {self.year}: {self.count}'
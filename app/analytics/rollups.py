@@ -0,0 +1,259 @@
+"""
+Rollups of the resume sections across users.
+
+Every metric counts section rows per value: skills per canonical skill,
+experiences per company and certificates per issuer and year. Counts
+are adjusted in the writing transaction from the model signals and from
+``sections_bulk_written``, so the top values are read with one index
+scan of the rollup table however many rows there are. The
+``rebuild_rollups`` command recomputes them from the sections to repair
+drift, for instance after writes that bypass the signals.
+"""
+from collections import Counter
+from types import SimpleNamespace
+
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.db.models import Count, F, Value
+from django.db.models.functions import ExtractYear, Trim
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from analytics.models import Rollup
+from resume.models import (
+    CanonicalSkill,
+    Skill,
+    Certificate,
+    Experience
+)
+from resume.signals import sections_bulk_written
+
+
+class Metric:
+    """
+    Count ``model`` rows per value of ``field``, and per year of
+    ``year_field`` when given. Text values are counted without their
+    surrounding spaces.
+    """
+
+    def __init__(self, name, model, field, year_field=None):
+        self.name = name
+        self.model = model
+        self.field = model._meta.get_field(field)
+        self.year_field = (
+            model._meta.get_field(year_field) if year_field else None
+        )
+        self.fields = [
+            field for field in (self.field, self.year_field) if field
+        ]
+
+    def get_key(self, obj):
+        """Return the ``(metric, key, year)`` of a row, or None."""
+        value = getattr(obj, self.field.attname)
+        if isinstance(value, str):
+            value = value.strip(' ')
+        if value is None or value == '':
+            return None
+        year = 0
+        if self.year_field is not None:
+            date = self.year_field.to_python(
+                getattr(obj, self.year_field.attname)
+            )
+            if date is None:
+                return None
+            year = date.year
+        return self.name, str(value), year
+
+    def aggregate(self, using=DEFAULT_DB_ALIAS):
+        """Yield ``(key, year, count)`` computed from the section table."""
+        key = F(self.field.attname)
+        if self.field.get_internal_type() in ('CharField', 'TextField'):
+            key = Trim(self.field.attname)
+        year = Value(0)
+        if self.year_field is not None:
+            year = ExtractYear(self.year_field.attname)
+        rows = self.model.objects.using(using).order_by().values(
+            rollup_key=key, rollup_year=year
+        ).annotate(count=Count('pk'))
+        for row in rows.iterator():
+            if row['rollup_key'] not in (None, ''):
+                yield str(row['rollup_key']), row['rollup_year'], row['count']
+
+    def get_labels(self, keys, using=DEFAULT_DB_ALIAS):
+        """Return the display name of every key."""
+        return {key: key for key in keys}
+
+
+class SkillMetric(Metric):
+    """Skills are counted per canonical skill, shown by its name."""
+
+    def get_labels(self, keys, using=DEFAULT_DB_ALIAS):
+        names = CanonicalSkill.objects.using(using).in_bulk(
+            [int(key) for key in keys]
+        )
+        return {
+            key: names[int(key)].name if int(key) in names else key
+            for key in keys
+        }
+
+
+METRICS = {
+    metric.name: metric for metric in [
+        SkillMetric('skills', Skill, 'canonical'),
+        Metric('employers', Experience, 'company'),
+        Metric(
+            'certificates', Certificate, 'issuing_organization', 'issue_date'
+        ),
+    ]
+}
+
+METRICS_BY_MODEL = {}
+for _metric in METRICS.values():
+    METRICS_BY_MODEL.setdefault(_metric.model, []).append(_metric)
+
+
+def get_keys(obj, model=None):
+    metrics = METRICS_BY_MODEL[model or type(obj)]
+    keys = (metric.get_key(obj) for metric in metrics)
+    return [key for key in keys if key is not None]
+
+
+def apply(deltas, using=DEFAULT_DB_ALIAS, batch_size=500):
+    """
+    Add ``{(metric, key, year): delta}`` to the rollups with one upsert
+    per batch, creating missing rows.
+    """
+    rows = [
+        (*key, delta) for key, delta in sorted(deltas.items()) if delta
+    ]
+    if not rows:
+        return
+    connection = connections[using]
+    quote = connection.ops.quote_name
+    table = quote(Rollup._meta.db_table)
+    columns = ', '.join(
+        quote(column) for column in ('metric', 'key', 'year', 'count')
+    )
+    with connection.cursor() as cursor:
+        for start in range(0, len(rows), batch_size):
+            batch = rows[start:start + batch_size]
+            cursor.execute(
+                f'INSERT INTO {table} ({columns}) VALUES '
+                + ', '.join(['(%s, %s, %s, %s)'] * len(batch))
+                + f' ON CONFLICT ({columns.rsplit(", ", 1)[0]})'
+                f' DO UPDATE SET {quote("count")} ='
+                f' {table}.{quote("count")} + EXCLUDED.{quote("count")}',
+                [value for row in batch for value in row],
+            )
+
+
+def rebuild(using=DEFAULT_DB_ALIAS):
+    """Recompute every rollup from the section tables."""
+    connection = connections[using]
+    with transaction.atomic(using=using):
+        if connection.vendor == 'postgresql':
+            # Writers wait for the rebuild instead of adding deltas to
+            # counts it is replacing; readers are not blocked.
+            with connection.cursor() as cursor:
+                cursor.execute('LOCK TABLE {} IN EXCLUSIVE MODE'.format(
+                    connection.ops.quote_name(Rollup._meta.db_table)
+                ))
+        Rollup.objects.using(using).all().delete()
+        for metric in METRICS.values():
+            Rollup.objects.using(using).bulk_create(
+                (
+                    Rollup(metric=metric.name, key=key, year=year, count=n)
+                    for key, year, n in metric.aggregate(using)
+                ),
+                batch_size=1000,
+            )
+
+
+def top(metric, limit=10, year=None, using=DEFAULT_DB_ALIAS):
+    """
+    Return the ``limit`` most counted values of ``metric`` as dicts with
+    a ``name``, a ``count`` and for yearly metrics a ``year``.
+    """
+    rollups = Rollup.objects.using(using).filter(
+        metric=metric.name, count__gt=0
+    )
+    if metric.year_field is None:
+        rollups = rollups.filter(year=0)
+    elif year is not None:
+        rollups = rollups.filter(year=year)
+    rows = list(rollups.order_by('-count', 'key').values(
+        'key', 'year', 'count'
+    )[:limit])
+
+    labels = metric.get_labels([row['key'] for row in rows], using=using)
+    results = []
+    for row in rows:
+        result = {'name': labels[row['key']], 'count': row['count']}
+        if metric.year_field is not None:
+            result['year'] = row['year']
+        results.append(result)
+    return results
+
+
+def remember_previous_keys(sender, instance, raw=False, using=None,
+                           update_fields=None, **kwargs):
+    """
+    Keep the keys the row had before the save, from the values it was
+    loaded with. Only rows saved without being loaded, or loaded without
+    the counted fields, are read again.
+    """
+    if raw or instance._state.adding:
+        return
+    fields = [
+        field for metric in METRICS_BY_MODEL[sender]
+        for field in metric.fields
+    ]
+    if update_fields is not None and not any(
+        field.name in update_fields for field in fields
+    ):
+        # The counted values are left as they are in the table.
+        instance._rollup_previous = get_keys(instance)
+        return
+    loaded = instance._loaded_values
+    if all(field.attname in loaded for field in fields):
+        previous = SimpleNamespace(**loaded)
+        instance._rollup_previous = get_keys(previous, sender)
+        return
+    previous = sender._base_manager.using(using).filter(
+        pk=instance.pk
+    ).first()
+    instance._rollup_previous = get_keys(previous) if previous else []
+
+
+def count_saved(sender, instance, raw=False, using=None, **kwargs):
+    if raw:
+        return
+    deltas = Counter(get_keys(instance))
+    deltas.subtract(instance.__dict__.pop('_rollup_previous', []))
+    apply(deltas, using=using)
+
+
+def count_deleted(sender, instance, using=None, **kwargs):
+    apply(
+        Counter({key: -1 for key in get_keys(instance)}), using=using
+    )
+
+
+# Connected per model: a receiver for every sender would keep Django
+# from deleting any other model's rows without loading them.
+for model in METRICS_BY_MODEL:
+    pre_save.connect(remember_previous_keys, sender=model)
+    post_save.connect(count_saved, sender=model)
+    post_delete.connect(count_deleted, sender=model)
+
+
+@receiver(sections_bulk_written)
+def count_bulk_written(sender, objs, previous, using=DEFAULT_DB_ALIAS,
+                       **kwargs):
+    if sender not in METRICS_BY_MODEL:
+        return
+    deltas = Counter()
+    for obj in objs:
+        deltas.update(get_keys(obj))
+    for obj in previous:
+        deltas.subtract(get_keys(obj))
+    apply(deltas, using=using)
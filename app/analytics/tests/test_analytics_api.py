@@ -0,0 +1,67 @@
+"""
+Tests for the analytics API.
+"""
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+from resume.models import Skill
+
+
+def rollup_url(metric):
+    """Create and return a rollup URL."""
+    return reverse('analytics:rollup', args=[metric])
+
+
+class AnalyticsApiTests(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.admin = get_user_model().objects.create_superuser(
+            'admin@example.com', 'testpass123'
+        )
+        self.client.force_authenticate(user=self.admin)
+        Skill.objects.create(user=self.admin, title='Python')
+        Skill.objects.create(user=self.admin, title='SQL')
+        user = get_user_model().objects.create_user(
+            'user@example.com', 'testpass123'
+        )
+        Skill.objects.create(user=user, title='SQL')
+
+    def test_staff_required(self):
+        """Test users who are not staff are forbidden."""
+        client = APIClient()
+        client.force_authenticate(
+            user=get_user_model().objects.get(email='user@example.com')
+        )
+
+        res = client.get(rollup_url('skills'))
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_top_skills(self):
+        """Test the most listed skills are returned first."""
+        res = self.client.get(rollup_url('skills'), {'limit': 5})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data, {
+            'metric': 'skills',
+            'results': [
+                {'name': 'SQL', 'count': 2},
+                {'name': 'Python', 'count': 1},
+            ],
+        })
+
+    def test_unknown_metric(self):
+        """Test unknown metrics are not found."""
+        res = self.client.get(rollup_url('hobbies'))
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_invalid_parameters(self):
+        """Test the limit is bounded."""
+        res = self.client.get(rollup_url('skills'), {'limit': 500})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
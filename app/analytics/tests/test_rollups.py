@@ -0,0 +1,169 @@
+"""
+Tests for the analytics rollups.
+"""
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework.test import APIClient
+from analytics import rollups
+from analytics.models import Rollup
+from resume.models import (
+    Skill,
+    Certificate,
+    Experience,
+)
+
+
+def create_user(email='user@example.com', password='testpass123'):
+    """Create and return a user."""
+    return get_user_model().objects.create_user(email, password)
+
+
+def create_experience(user, company):
+    return Experience.objects.create(
+        user=user,
+        company=company,
+        position='Developer',
+        description='Worked on developing applications.',
+        start_date='2020-01-01',
+    )
+
+
+def counts(metric):
+    return dict(
+        Rollup.objects.filter(metric=metric).exclude(count=0).values_list(
+            'key', 'count'
+        )
+    )
+
+
+def top(metric, **kwargs):
+    return [
+        (row['name'], row['count'])
+        for row in rollups.top(rollups.METRICS[metric], **kwargs)
+    ]
+
+
+class RollupTests(TestCase):
+
+    def setUp(self):
+        self.user = create_user()
+        self.other = create_user(email='other@example.com')
+
+    def test_counts_follow_writes(self):
+        """Test creating, editing and deleting rows adjusts the counts."""
+        create_experience(self.user, 'Acme')
+        create_experience(self.other, ' Acme ')
+        experience = create_experience(self.other, 'Globex')
+
+        self.assertEqual(counts('employers'), {'Acme': 2, 'Globex': 1})
+
+        experience.company = 'Acme'
+        experience.save()
+        self.assertEqual(counts('employers'), {'Acme': 3})
+
+        experience.delete()
+        self.assertEqual(top('employers'), [('Acme', 2)])
+
+    def test_updates_not_read_again(self):
+        """Test saving a loaded row adjusts the counts without a SELECT."""
+        create_experience(self.user, 'Acme')
+        experience = Experience.objects.get(user=self.user)
+
+        experience.company = 'Globex'
+        # The update and the rollup upsert.
+        with self.assertNumQueries(2):
+            experience.save()
+        experience.company = 'Initech'
+        with self.assertNumQueries(2):
+            experience.save()
+        experience.position = 'Lead'
+        with self.assertNumQueries(1):
+            experience.save(update_fields=['position'])
+
+        self.assertEqual(counts('employers'), {'Initech': 1})
+
+    def test_skills_counted_per_canonical_skill(self):
+        """Test spellings of a skill are counted together by name."""
+        Skill.objects.create(user=self.user, title='Python')
+        Skill.objects.create(user=self.other, title='python ')
+        Skill.objects.create(user=self.other, title='Go')
+
+        self.assertEqual(top('skills'), [('Python', 2), ('Go', 1)])
+        self.assertEqual(top('skills', limit=1), [('Python', 2)])
+
+    def test_certificates_counted_per_year(self):
+        """Test certificates are counted per issuer and year."""
+        for user, date in [
+            (self.user, '2021-05-01'),
+            (self.other, '2021-09-01'),
+            (self.other, '2022-01-01'),
+        ]:
+            Certificate.objects.create(
+                user=user,
+                title='Cloud Practitioner',
+                issuing_organization='AWS',
+                issue_date=date,
+            )
+
+        rows = rollups.top(rollups.METRICS['certificates'])
+        self.assertEqual(
+            [(row['name'], row['year'], row['count']) for row in rows],
+            [('AWS', 2021, 2), ('AWS', 2022, 1)],
+        )
+        rows = rollups.top(rollups.METRICS['certificates'], year=2022)
+        self.assertEqual([row['count'] for row in rows], [1])
+
+    def test_bulk_writes_counted(self):
+        """Test the bulk endpoints adjust the counts."""
+        client = APIClient()
+        client.force_authenticate(user=self.user)
+        res = client.post(
+            reverse('resume:skill-bulk'),
+            [{'title': 'Python'}, {'title': 'Go'}],
+            format='json',
+        )
+        ids = [row['id'] for row in res.data['results']]
+
+        client.patch(
+            reverse('resume:skill-bulk'),
+            [{'id': ids[1], 'title': 'Python'}],
+            format='json',
+        )
+
+        self.assertEqual(top('skills'), [('Python', 2)])
+
+    def test_deleted_user_uncounted(self):
+        """Test deleting a user removes their rows from the counts."""
+        create_experience(self.user, 'Acme')
+        create_experience(self.other, 'Acme')
+
+        self.user.delete()
+
+        self.assertEqual(counts('employers'), {'Acme': 1})
+
+    def test_rebuild_repairs_drift(self):
+        """Test the command recomputes counts written around signals."""
+        create_experience(self.user, 'Acme')
+        Experience.objects.filter(user=self.user).update(company='Globex')
+        Rollup.objects.create(metric='employers', key='Initech', count=4)
+
+        out = StringIO()
+        call_command('rebuild_rollups', stdout=out)
+
+        self.assertEqual(counts('employers'), {'Globex': 1})
+        self.assertIn('Rebuilt 1 rollups.', out.getvalue())
+
+    def test_top_reads_one_query(self):
+        """Test reading a rollup does not scan the sections."""
+        for i in range(5):
+            create_experience(self.user, f'Company {i}')
+
+        with self.assertNumQueries(1):
+            rows = top('employers', limit=3)
+
+        self.assertEqual(len(rows), 3)
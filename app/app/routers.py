@@ -0,0 +1,169 @@
+"""
+Database routing to read replicas.
+
+Reads of the resume models go to an alias of ``REPLICA_DATABASES``,
+picked at random once per request so its queries see the same lag, and
+every write goes to ``default``. A client that
+writes is pinned to ``default`` for the rest of the request and for
+``REPLICA_PIN_SECONDS`` afterwards, so it reads its own writes while the
+replicas catch up.
+"""
+import contextlib
+import contextvars
+import hashlib
+import random
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+REPLICA_MODELS = {
+    'accounts.profile',
+    'resume.skill',
+    'resume.education',
+    'resume.certificate',
+    'resume.experience',
+}
+
+PIN_KEY = 'db:pinned:{client}'
+
+# Per request state: the client key, whether it reads from default,
+# whether it wrote and the replica it reads from.
+_client = contextvars.ContextVar('replica_client', default=None)
+_pinned = contextvars.ContextVar('replica_pinned', default=False)
+_wrote = contextvars.ContextVar('replica_wrote', default=False)
+_replica = contextvars.ContextVar('replica_alias', default=None)
+
+
+def get_replicas():
+    return getattr(settings, 'REPLICA_DATABASES', [])
+
+
+def client_key(request):
+    """Identify the client of ``request`` by its credentials, if any."""
+    credentials = request.META.get('HTTP_AUTHORIZATION') or (
+        request.COOKIES.get(settings.SESSION_COOKIE_NAME)
+    )
+    if not credentials:
+        return None
+    return hashlib.sha256(credentials.encode()).hexdigest()
+
+
+def pin():
+    """Send the reads of the current request and client to ``default``."""
+    if _wrote.get():
+        return
+    _wrote.set(True)
+    _pinned.set(True)
+    client = _client.get()
+    if client is not None:
+        cache.set(
+            PIN_KEY.format(client=client),
+            True,
+            timeout=getattr(settings, 'REPLICA_PIN_SECONDS', 5),
+        )
+
+
+def is_pinned():
+    return _pinned.get()
+
+
+def get_replica(replicas):
+    """Return the replica of the current request, picking it if needed."""
+    replica = _replica.get()
+    if replica not in replicas:
+        replica = random.choice(replicas)
+        _replica.set(replica)
+    return replica
+
+
+@contextlib.contextmanager
+def primary_reads():
+    """
+    Read from ``default`` within the block, without pinning the client,
+    for reads whose result outlives the request, such as cache entries.
+    """
+    token = _pinned.set(True)
+    try:
+        yield
+    finally:
+        _pinned.reset(token)
+
+
+class ReplicaRouter:
+    """Route resume reads to replicas and all writes to default."""
+
+    def db_for_read(self, model, **hints):
+        replicas = get_replicas()
+        if (not replicas
+                or model._meta.label_lower not in REPLICA_MODELS
+                or is_pinned()
+                # Reads in a transaction usually precede a write.
+                or connections[DEFAULT_DB_ALIAS].in_atomic_block):
+            return None
+        return get_replica(replicas)
+
+    def db_for_write(self, model, **hints):
+        if get_replicas():
+            pin()
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *get_replicas()}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+
+class ReplicaPinningMiddleware:
+    """
+    Restore the pin of a client that wrote recently. Removed from the
+    chain when no replicas are configured.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not get_replicas():
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def start(self, client, pinned):
+        """Set the request state, returning the tokens to reset it."""
+        return [
+            (_client, _client.set(client)),
+            (_pinned, _pinned.set(pinned)),
+            (_wrote, _wrote.set(False)),
+            (_replica, _replica.set(None)),
+        ]
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        client = client_key(request)
+        pinned = client is not None and bool(
+            cache.get(PIN_KEY.format(client=client))
+        )
+        tokens = self.start(client, pinned)
+        try:
+            return self.get_response(request)
+        finally:
+            for var, token in tokens:
+                var.reset(token)
+
+    async def __acall__(self, request):
+        client = client_key(request)
+        pinned = client is not None and bool(
+            await cache.aget(PIN_KEY.format(client=client))
+        )
+        tokens = self.start(client, pinned)
+        try:
+            return await self.get_response(request)
+        finally:
+            for var, token in tokens:
+                var.reset(token)
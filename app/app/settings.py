@@ -13,6 +13,8 @@ https://docs.djangoproject.com/en/4.2/ref/settings/
 from pathlib import Path
 import os
 
+from django.core.exceptions import ImproperlyConfigured
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -49,9 +51,18 @@ INSTALLED_APPS = [
     'drf_yasg',
     'accounts',
     'resume',
+    'search',
+    'analytics',
+    'jobs',
+    'benchmarks',
+    'metrics',
 ]
 
 MIDDLEWARE = [
+    # Outermost so it measures the whole request; inert unless enabled.
+    'metrics.middleware.MetricsMiddleware',
+    'metrics.middleware.DuplicateQueryMiddleware',
+    'app.routers.ReplicaPinningMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -85,6 +96,15 @@ WSGI_APPLICATION = 'app.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/4.2/ref/settings/#databases
 
+# DB_POOL_MODE is 'session' for a direct connection or a session pooler,
+# and 'transaction' behind a transaction pooler such as PgBouncer, where
+# server-side cursors do not survive between transactions.
+DB_POOL_MODE = os.environ.get('DB_POOL_MODE', default='session')
+if DB_POOL_MODE not in ('session', 'transaction'):
+    raise ImproperlyConfigured(
+        "DB_POOL_MODE must be 'session' or 'transaction'."
+    )
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.postgresql',
@@ -92,10 +112,71 @@ DATABASES = {
         'NAME': os.environ.get('DB_NAME', default="postgres"),
         'USER': os.environ.get('DB_USER', default="postgres"),
         'PASSWORD': os.environ.get('DB_PASS', default="postgres"),
-        'PORT': 5432,
+        'PORT': int(os.environ.get('DB_PORT', default=5432)),
+        # Seconds a connection is reused across requests, 0 to close it
+        # after every request.
+        'CONN_MAX_AGE': int(os.environ.get('DB_CONN_MAX_AGE', default=60)),
+        'CONN_HEALTH_CHECKS': bool(
+            int(os.environ.get('DB_CONN_HEALTH_CHECKS', default=1))
+        ),
+        'DISABLE_SERVER_SIDE_CURSORS': DB_POOL_MODE == 'transaction',
     }
 }
 
+# Comma separated hosts of read replicas of the default database.
+REPLICA_DATABASES = []
+for index, host in enumerate(
+    filter(None, os.environ.get('DB_REPLICA_HOSTS', '').split(',')), 1
+):
+    DATABASES[f'replica_{index}'] = {
+        **DATABASES['default'],
+        'HOST': host,
+        'TEST': {'MIRROR': 'default'},
+    }
+    REPLICA_DATABASES.append(f'replica_{index}')
+
+REPLICA_PIN_SECONDS = int(os.environ.get('REPLICA_PIN_SECONDS', default=5))
+
+DATABASE_ROUTERS = ['app.routers.ReplicaRouter']
+
+
+# Password hashing
+# PASSWORD_HASHER picks the hasher of new and upgraded hashes; passwords
+# stored with the others still verify and are rehashed on login.
+
+PASSWORD_HASHER_CHOICES = {
+    'pbkdf2': 'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+    'argon2': 'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'scrypt': 'django.contrib.auth.hashers.ScryptPasswordHasher',
+}
+PASSWORD_HASHER = os.environ.get('PASSWORD_HASHER', default='pbkdf2')
+if PASSWORD_HASHER not in PASSWORD_HASHER_CHOICES:
+    raise ImproperlyConfigured(
+        'PASSWORD_HASHER must be one of '
+        f"{', '.join(PASSWORD_HASHER_CHOICES)}."
+    )
+
+PASSWORD_HASHERS = [
+    PASSWORD_HASHER_CHOICES[PASSWORD_HASHER],
+    *(
+        hasher for name, hasher in PASSWORD_HASHER_CHOICES.items()
+        if name != PASSWORD_HASHER
+    ),
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+]
+
+AUTHENTICATION_BACKENDS = ['accounts.backends.PooledModelBackend']
+
+PASSWORD_HASH_WORKERS = int(
+    os.environ.get('PASSWORD_HASH_WORKERS', default=os.cpu_count() or 1)
+)
+PASSWORD_HASH_MAX_PENDING = int(os.environ.get(
+    'PASSWORD_HASH_MAX_PENDING', default=PASSWORD_HASH_WORKERS * 4
+))
+PASSWORD_HASH_WAIT_TIMEOUT = float(
+    os.environ.get('PASSWORD_HASH_WAIT_TIMEOUT', default=5)
+)
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
@@ -133,6 +214,9 @@ USE_TZ = True
 
 STATIC_URL = 'static/'
 
+# Files written by background jobs, such as resume exports.
+MEDIA_ROOT = os.environ.get('MEDIA_ROOT', default=BASE_DIR / 'media')
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/4.2/ref/settings/#default-auto-field
 
@@ -144,9 +228,38 @@ AUTH_USER_MODEL = 'accounts.User'
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework.authentication.TokenAuthentication',
+        'accounts.authentication.CachedTokenAuthentication',
+    ),
+    'DEFAULT_RENDERER_CLASSES': (
+        'resume.api.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_THROTTLE_CLASSES': (
+        'accounts.throttling.BucketThrottle',
+    ),
+}
+
+# Token buckets per URL name, or "<namespace>:*" for one bucket per client
+# across an app. "10/min" allows bursts of 10 requests refilled over a minute.
+THROTTLE_RATES = {
+    'accounts:token': os.environ.get('THROTTLE_TOKEN_RATE', default='10/min'),
+    'accounts:register': os.environ.get(
+        'THROTTLE_REGISTER_RATE', default='20/hour'
     ),
+    'resume:*': os.environ.get('THROTTLE_RESUME_RATE', default='600/min'),
 }
+THROTTLE_CACHE_ALIAS = 'default'
+THROTTLE_LOCAL_CACHE_SIZE = int(
+    os.environ.get('THROTTLE_LOCAL_CACHE_SIZE', default=10000)
+)
+THROTTLE_LOCAL_TTL = int(os.environ.get('THROTTLE_LOCAL_TTL', default=5))
+
+TOKEN_CACHE_ALIAS = 'default'
+TOKEN_CACHE_TIMEOUT = int(os.environ.get('TOKEN_CACHE_TIMEOUT', default=300))
+TOKEN_LOCAL_CACHE_SIZE = int(
+    os.environ.get('TOKEN_LOCAL_CACHE_SIZE', default=1024)
+)
+TOKEN_LOCAL_CACHE_TTL = int(os.environ.get('TOKEN_LOCAL_CACHE_TTL', default=30))
 
 SWAGGER_SETTINGS = {
     'SECURITY_DEFINITIONS': {
@@ -157,4 +270,54 @@ SWAGGER_SETTINGS = {
         }
     },
     'USE_SESSION_AUTH': False,
-}
\ No newline at end of file
+}
+
+
+CACHES = {
+    'default': {
+        'BACKEND': os.environ.get(
+            'CACHE_BACKEND',
+            default='django.core.cache.backends.locmem.LocMemCache',
+        ),
+        'LOCATION': os.environ.get('CACHE_LOCATION', default=''),
+    }
+}
+
+RESUME_CACHE_ALIAS = 'default'
+RESUME_CACHE_TIMEOUT = int(os.environ.get('RESUME_CACHE_TIMEOUT', default=3600))
+
+# Resumes with more section rows are rendered to HTML/PDF in the background.
+RESUME_RENDER_INLINE_ROWS = int(
+    os.environ.get('RESUME_RENDER_INLINE_ROWS', default=200)
+)
+# Most render jobs running at once across all workers.
+RESUME_RENDER_WORKERS = int(os.environ.get('RESUME_RENDER_WORKERS', default=2))
+
+# Skill autocomplete trie: rebuilt every TTL seconds, most used skills only.
+SKILL_AUTOCOMPLETE_TTL = int(
+    os.environ.get('SKILL_AUTOCOMPLETE_TTL', default=300)
+)
+SKILL_AUTOCOMPLETE_CACHE_SIZE = int(
+    os.environ.get('SKILL_AUTOCOMPLETE_CACHE_SIZE', default=50000)
+)
+
+# Background jobs: seconds an idle worker waits between polls, the delay
+# before the first retry of a failed job, doubled at every attempt, and
+# how long finished jobs are kept.
+JOB_POLL_INTERVAL = float(os.environ.get('JOB_POLL_INTERVAL', default=1))
+JOB_RETRY_DELAY = int(os.environ.get('JOB_RETRY_DELAY', default=10))
+JOB_RETENTION = int(
+    os.environ.get('JOB_RETENTION', default=7 * 24 * 60 * 60)
+)
+
+METRICS_ENABLED = bool(int(os.environ.get('METRICS_ENABLED', default=0)))
+# Bearer token of the scrapers reading /metrics, which staff can read too.
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN', default='')
+
+# '' (off), 'warn' or 'raise' on repeated query shapes within a request.
+DUPLICATE_QUERY_DETECTION = os.environ.get(
+    'DUPLICATE_QUERY_DETECTION', default=''
+)
+DUPLICATE_QUERY_THRESHOLD = int(
+    os.environ.get('DUPLICATE_QUERY_THRESHOLD', default=2)
+)
@@ -18,6 +18,7 @@ from django.contrib import admin
 from django.urls import path, include
 from drf_yasg.views import get_schema_view
 from drf_yasg import openapi
+from metrics.views import metrics_view
 
 
 schema_view = get_schema_view(
@@ -34,6 +35,10 @@ urlpatterns = [
     path('admin/', admin.site.urls),
     path('accounts/', include("accounts.urls")),
     path('resume/', include('resume.api.urls')),
+    path('search/', include('search.api.urls')),
+    path('analytics/', include('analytics.api.urls')),
+    path('jobs/', include('jobs.api.urls')),
+    path('metrics', metrics_view, name='metrics'),
 
     # api doc app
     path('swagger/api.json', schema_view.without_ui(
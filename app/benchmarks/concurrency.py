@@ -0,0 +1,181 @@
+"""
+Throughput of the sync and async resume views under concurrency.
+
+``wsgi-sync`` drives the sync view through the WSGI handler from a
+pool of threads, one per concurrent client. ``asgi-sync`` and
+``asgi-async`` run that many concurrent clients on one event loop
+through the ASGI handler against the sync and the async view.
+"""
+import asyncio
+import statistics
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connections
+from django.test import AsyncClient, Client
+from django.test.utils import override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from benchmarks.runner import (
+    DEFAULT_SIZES,
+    _ms,
+    clear_caches,
+    percentile,
+    seed,
+)
+
+
+MODES = {
+    'wsgi-sync': 'resume:resume-retrieve',
+    'asgi-sync': 'resume:resume-retrieve',
+    'asgi-async': 'resume:async-resume-retrieve',
+}
+
+
+def _shares(requests, concurrency):
+    """Split ``requests`` over ``concurrency`` clients."""
+    base, extra = divmod(requests, concurrency)
+    return [base + (i < extra) for i in range(concurrency)]
+
+
+def _run_threads(url, headers, requests, concurrency):
+    def client(index, count):
+        client = Client()
+        timings = []
+        try:
+            for i in range(count):
+                start = time.perf_counter()
+                response = client.get(
+                    url, HTTP_AUTHORIZATION=headers[(index + i) % len(headers)]
+                )
+                timings.append((time.perf_counter() - start, response))
+        finally:
+            connections.close_all()
+        return timings
+
+    with ThreadPoolExecutor(concurrency) as pool:
+        futures = [
+            pool.submit(client, index, count)
+            for index, count in enumerate(_shares(requests, concurrency))
+        ]
+        return [timing for f in futures for timing in f.result()]
+
+
+async def _run_tasks(url, headers, requests, concurrency):
+    async def client(index, count):
+        client = AsyncClient()
+        timings = []
+        for i in range(count):
+            start = time.perf_counter()
+            response = await client.get(
+                url,
+                headers={'Authorization': headers[(index + i) % len(headers)]},
+            )
+            timings.append((time.perf_counter() - start, response))
+        return timings
+
+    results = await asyncio.gather(*[
+        client(index, count)
+        for index, count in enumerate(_shares(requests, concurrency))
+    ])
+    return [timing for timings in results for timing in timings]
+
+
+def measure(mode, headers, requests, concurrency, warmup=5):
+    """Return the throughput and latency of ``mode``."""
+    url = reverse(MODES[mode])
+    if mode == 'wsgi-sync':
+        def execute(count, workers):
+            return _run_threads(url, headers, count, workers)
+    else:
+        def execute(count, workers):
+            return async_to_sync(_run_tasks)(url, headers, count, workers)
+
+    if warmup:
+        execute(warmup, min(warmup, concurrency))
+    start = time.perf_counter()
+    timings = execute(requests, concurrency)
+    elapsed = time.perf_counter() - start
+
+    latencies = [latency for latency, _ in timings]
+    statuses = Counter(response.status_code for _, response in timings)
+    return {
+        'requests': requests,
+        'concurrency': concurrency,
+        'status_codes': {str(code): n for code, n in statuses.items()},
+        'elapsed_s': round(elapsed, 3),
+        'throughput_rps': round(requests / elapsed, 2),
+        'latency_ms': {
+            'mean': _ms(statistics.fmean(latencies)),
+            'p50': _ms(percentile(latencies, 50)),
+            'p95': _ms(percentile(latencies, 95)),
+            'p99': _ms(percentile(latencies, 99)),
+            'max': _ms(max(latencies)),
+        },
+    }
+
+
+def run(modes=None, users=10, sizes=None, requests=200, concurrency=32,
+        warmup=5, resume_cache=False, label=None):
+    """
+    Seed the database, measure every mode and return the results as a
+    JSON serializable dict.
+
+    Worker threads use their own database connections, so the seeded
+    data is committed and deleted again at the end of the run. Unless
+    ``resume_cache`` is set the resume document cache is bypassed so
+    every request reads the database.
+    """
+    sizes = {**DEFAULT_SIZES, **(sizes or {})}
+    modes = modes or list(MODES)
+    report = {
+        'meta': {
+            'label': label,
+            'timestamp': timezone.now().isoformat(),
+            'database': connections['default'].vendor,
+            'params': {
+                'users': users,
+                'sizes': sizes,
+                'requests': requests,
+                'concurrency': concurrency,
+                'resume_cache': resume_cache,
+            },
+        },
+        'results': {},
+    }
+
+    overrides = {
+        'ALLOWED_HOSTS': [*settings.ALLOWED_HOSTS, 'testserver'],
+        # Measure the endpoints, not the throttles.
+        'THROTTLE_RATES': {},
+    }
+    if not resume_cache:
+        overrides['CACHES'] = {
+            **settings.CACHES,
+            'benchmark-dummy': {
+                'BACKEND': 'django.core.cache.backends.dummy.DummyCache',
+            },
+        }
+        overrides['RESUME_CACHE_ALIAS'] = 'benchmark-dummy'
+
+    ctx = seed(users, sizes)
+    headers = [f'Token {key}' for key in ctx.tokens.values()]
+    try:
+        with override_settings(**overrides):
+            for mode in modes:
+                clear_caches()
+                report['results'][mode] = measure(
+                    mode, headers, requests, concurrency, warmup=warmup
+                )
+    finally:
+        get_user_model().objects.filter(
+            pk__in=[user.pk for user in ctx.users]
+        ).delete()
+        clear_caches()
+
+    return report
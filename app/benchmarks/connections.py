@@ -0,0 +1,129 @@
+"""
+Per-request database connection overhead.
+
+The test client skips the ``request_started`` and ``request_finished``
+handlers that recycle connections, so every request here is wrapped in
+``close_old_connections()`` calls like a real request. Each
+``CONN_MAX_AGE`` setting is measured with the seeded data committed,
+since closing a connection would roll back an open transaction.
+"""
+import statistics
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import close_old_connections, connection
+from django.db.backends.signals import connection_created
+from django.test.utils import override_settings
+from django.utils import timezone
+
+from benchmarks.runner import (
+    DEFAULT_SIZES,
+    _ms,
+    clear_caches,
+    percentile,
+    seed,
+)
+from benchmarks.scenarios import SCENARIOS
+
+
+def handshake(samples):
+    """Return the mean seconds to open and close a connection."""
+    timings = []
+    for _ in range(samples):
+        connection.close()
+        start = time.perf_counter()
+        connection.ensure_connection()
+        timings.append(time.perf_counter() - start)
+    return statistics.fmean(timings)
+
+
+def measure(func, ctx, requests, conn_max_age, health_checks, warmup=5):
+    """Return latency and connections opened per request."""
+    opened = []
+
+    def count(sender, connection, **kwargs):
+        opened.append(connection.alias)
+
+    original = connection.settings_dict.copy()
+    connection.settings_dict['CONN_MAX_AGE'] = conn_max_age
+    connection.settings_dict['CONN_HEALTH_CHECKS'] = health_checks
+    connection.close()
+    connection_created.connect(count)
+    try:
+        for _ in range(warmup):
+            close_old_connections()
+            func(ctx)
+            close_old_connections()
+        opened.clear()
+
+        latencies = []
+        for _ in range(requests):
+            start = time.perf_counter()
+            close_old_connections()
+            func(ctx)
+            close_old_connections()
+            latencies.append(time.perf_counter() - start)
+    finally:
+        connection_created.disconnect(count)
+        connection.close()
+        connection.settings_dict.update(original)
+
+    return {
+        'conn_max_age': conn_max_age,
+        'health_checks': health_checks,
+        'requests': requests,
+        'connections_per_request': round(len(opened) / requests, 3),
+        'latency_ms': {
+            'mean': _ms(statistics.fmean(latencies)),
+            'p50': _ms(percentile(latencies, 50)),
+            'p95': _ms(percentile(latencies, 95)),
+            'p99': _ms(percentile(latencies, 99)),
+        },
+    }
+
+
+def run(scenario='profile', users=10, sizes=None, requests=200,
+        conn_max_age=60, health_checks=True, warmup=5, label=None):
+    """
+    Measure ``scenario`` closing the connection after every request and
+    with persistent connections, and return a JSON serializable dict.
+    """
+    sizes = {**DEFAULT_SIZES, **(sizes or {})}
+    report = {
+        'meta': {
+            'label': label,
+            'timestamp': timezone.now().isoformat(),
+            'database': connection.vendor,
+            'scenario': scenario,
+            'params': {
+                'users': users,
+                'sizes': sizes,
+                'requests': requests,
+            },
+        },
+        'results': {},
+    }
+
+    hosts = [*settings.ALLOWED_HOSTS, 'testserver']
+    ctx = seed(users, sizes)
+    try:
+        # Measure the endpoints, not the throttles.
+        with override_settings(ALLOWED_HOSTS=hosts, THROTTLE_RATES={}):
+            report['handshake_ms'] = _ms(handshake(min(requests, 20)))
+            for name, max_age, checks in [
+                ('per-request', 0, False),
+                ('persistent', conn_max_age, health_checks),
+            ]:
+                clear_caches()
+                report['results'][name] = measure(
+                    SCENARIOS[scenario], ctx, requests, max_age, checks,
+                    warmup=warmup,
+                )
+    finally:
+        get_user_model().objects.filter(
+            pk__in=[user.pk for user in ctx.users]
+        ).delete()
+        clear_caches()
+
+    return report
@@ -0,0 +1,157 @@
+"""
+Login throughput per password hasher.
+
+Every seeded account gets its password hashed with the hasher under
+test, then ``/accounts/.../token/`` is called from a pool of threads.
+As in ``benchmarks.concurrency`` the seeded data is committed and
+deleted at the end of the run.
+"""
+import importlib.util
+import statistics
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import get_user_model, hashers
+from django.db import connections
+from django.test import Client
+from django.test.utils import override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from accounts import hashing
+from benchmarks.concurrency import _shares
+from benchmarks.runner import (
+    DEFAULT_SIZES,
+    _ms,
+    clear_caches,
+    percentile,
+    seed,
+)
+
+
+# Hashers and the module they need, if any.
+HASHERS = {
+    'pbkdf2': None,
+    'scrypt': None,
+    'argon2': 'argon2',
+}
+
+
+def available(name):
+    module = HASHERS[name]
+    return module is None or importlib.util.find_spec(module) is not None
+
+
+def _login(ctx, requests, concurrency):
+    url = reverse('accounts:token')
+
+    def client(index, count):
+        client = Client()
+        timings = []
+        try:
+            for i in range(count):
+                user = ctx.users[(index + i) % len(ctx.users)]
+                start = time.perf_counter()
+                response = client.post(
+                    url, {'email': user.email, 'password': ctx.password}
+                )
+                timings.append((time.perf_counter() - start, response))
+        finally:
+            connections.close_all()
+        return timings
+
+    with ThreadPoolExecutor(concurrency) as pool:
+        futures = [
+            pool.submit(client, index, count)
+            for index, count in enumerate(_shares(requests, concurrency))
+        ]
+        return [timing for f in futures for timing in f.result()]
+
+
+def measure(ctx, requests, concurrency, warmup=2):
+    """Return the login throughput with the current hasher."""
+    start = time.perf_counter()
+    encoded = hashers.make_password(ctx.password)
+    hash_time = time.perf_counter() - start
+    get_user_model().objects.filter(
+        pk__in=[user.pk for user in ctx.users]
+    ).update(password=encoded)
+    clear_caches()
+
+    if warmup:
+        _login(ctx, warmup, min(warmup, concurrency))
+    start = time.perf_counter()
+    timings = _login(ctx, requests, concurrency)
+    elapsed = time.perf_counter() - start
+
+    latencies = [latency for latency, _ in timings]
+    statuses = Counter(response.status_code for _, response in timings)
+    return {
+        'algorithm': encoded.split('$', 1)[0],
+        'hash_ms': _ms(hash_time),
+        'requests': requests,
+        'concurrency': concurrency,
+        'status_codes': {str(code): n for code, n in statuses.items()},
+        'elapsed_s': round(elapsed, 3),
+        'throughput_rps': round(requests / elapsed, 2),
+        'latency_ms': {
+            'mean': _ms(statistics.fmean(latencies)),
+            'p50': _ms(percentile(latencies, 50)),
+            'p95': _ms(percentile(latencies, 95)),
+            'p99': _ms(percentile(latencies, 99)),
+        },
+    }
+
+
+def run(hasher_names=None, users=10, requests=100, concurrency=8,
+        workers=None, warmup=2, label=None):
+    """Measure login throughput per hasher and return a JSON dict."""
+    hasher_names = hasher_names or list(HASHERS)
+    if workers is None:
+        workers = getattr(settings, 'PASSWORD_HASH_WORKERS', None)
+    overrides = {
+        'ALLOWED_HOSTS': [*settings.ALLOWED_HOSTS, 'testserver'],
+        'PASSWORD_HASH_WORKERS': workers,
+        # Measure the hashers, not the throttles.
+        'THROTTLE_RATES': {},
+    }
+    report = {
+        'meta': {
+            'label': label,
+            'timestamp': timezone.now().isoformat(),
+            'database': connections['default'].vendor,
+            'params': {
+                'users': users,
+                'requests': requests,
+                'concurrency': concurrency,
+                'workers': workers,
+            },
+        },
+        'results': {},
+    }
+
+    ctx = seed(users, {section: 0 for section in DEFAULT_SIZES})
+    try:
+        for name in hasher_names:
+            if not available(name):
+                report['results'][name] = {'skipped': 'not installed'}
+                continue
+            preferred = settings.PASSWORD_HASHER_CHOICES[name]
+            with override_settings(**overrides, PASSWORD_HASHERS=[
+                preferred,
+                *(h for h in settings.PASSWORD_HASHERS if h != preferred),
+            ]):
+                hashing.reset_pool()
+                report['results'][name] = measure(
+                    ctx, requests, concurrency, warmup=warmup
+                )
+    finally:
+        hashing.reset_pool()
+        get_user_model().objects.filter(
+            pk__in=[user.pk for user in ctx.users]
+        ).delete()
+        clear_caches()
+
+    return report
@@ -0,0 +1,61 @@
+"""
+Django command to benchmark the resume and accounts APIs.
+"""
+from django.core.management.base import CommandError
+
+from benchmarks import runner
+from benchmarks.scenarios import SCENARIOS
+
+
+class Command(runner.BenchmarkCommand):
+    """Seed data, measure the API scenarios and print JSON results."""
+    help = (
+        'Measure latency percentiles, queries per request and memory '
+        'allocations of the API endpoints against the configured database.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--scenario', action='append', dest='scenarios',
+            choices=sorted(SCENARIOS),
+            help='Scenario to run, may be repeated. Defaults to all.',
+        )
+        parser.add_argument('--users', type=int, default=10)
+        for section, size in runner.DEFAULT_SIZES.items():
+            parser.add_argument(
+                f'--{section}', type=int, default=size,
+                help=f'Seeded {section} per user (default {size}).',
+            )
+        parser.add_argument('--requests', type=int, default=50)
+        parser.add_argument('--warmup', type=int, default=5)
+        parser.add_argument(
+            '--allocation-samples', type=int, default=10,
+            help='Requests traced with tracemalloc, 0 to disable.',
+        )
+        parser.add_argument(
+            '--cold-cache', action='store_true',
+            help='Clear all caches before every request.',
+        )
+        parser.add_argument(
+            '--keep-data', action='store_true',
+            help='Commit the seeded data instead of rolling it back.',
+        )
+        super().add_arguments(parser)
+
+    def benchmark(self, **options):
+        if options['users'] < 1 or options['requests'] < 1:
+            raise CommandError('--users and --requests must be positive.')
+
+        return runner.run(
+            scenarios=options['scenarios'],
+            users=options['users'],
+            sizes={
+                section: options[section] for section in runner.DEFAULT_SIZES
+            },
+            requests=options['requests'],
+            warmup=options['warmup'],
+            allocation_samples=options['allocation_samples'],
+            cold_cache=options['cold_cache'],
+            keep_data=options['keep_data'],
+            label=options['label'],
+        )
@@ -0,0 +1,56 @@
+"""
+Django command comparing sync WSGI and async ASGI resume throughput.
+"""
+from django.core.management.base import CommandError
+
+from benchmarks import concurrency, runner
+
+
+class Command(runner.BenchmarkCommand):
+    """Seed data, load the resume views concurrently and print JSON."""
+    help = (
+        'Measure throughput and latency of the sync resume view under '
+        'WSGI and ASGI and of the async view under ASGI at a given '
+        'concurrency.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--mode', action='append', dest='modes',
+            choices=sorted(concurrency.MODES),
+            help='Mode to run, may be repeated. Defaults to all.',
+        )
+        parser.add_argument('--users', type=int, default=10)
+        for section, size in runner.DEFAULT_SIZES.items():
+            parser.add_argument(
+                f'--{section}', type=int, default=size,
+                help=f'Seeded {section} per user (default {size}).',
+            )
+        parser.add_argument('--requests', type=int, default=200)
+        parser.add_argument('--concurrency', type=int, default=32)
+        parser.add_argument('--warmup', type=int, default=5)
+        parser.add_argument(
+            '--resume-cache', action='store_true',
+            help='Serve the sync view from the resume document cache.',
+        )
+        super().add_arguments(parser)
+
+    def benchmark(self, **options):
+        if min(options['users'], options['requests'],
+               options['concurrency']) < 1:
+            raise CommandError(
+                '--users, --requests and --concurrency must be positive.'
+            )
+
+        return concurrency.run(
+            modes=options['modes'],
+            users=options['users'],
+            sizes={
+                section: options[section] for section in runner.DEFAULT_SIZES
+            },
+            requests=options['requests'],
+            concurrency=options['concurrency'],
+            warmup=options['warmup'],
+            resume_cache=options['resume_cache'],
+            label=options['label'],
+        )
@@ -0,0 +1,53 @@
+"""
+Django command measuring per-request database connection overhead.
+"""
+from django.core.management.base import CommandError
+from django.db import connection
+
+from benchmarks import connections, runner
+from benchmarks.scenarios import SCENARIOS
+
+
+class Command(runner.BenchmarkCommand):
+    """Compare per-request and persistent database connections."""
+    help = (
+        'Measure a scenario with a new database connection per request '
+        'and with persistent connections, and print JSON results.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--scenario', default='profile', choices=sorted(SCENARIOS),
+        )
+        parser.add_argument('--users', type=int, default=10)
+        parser.add_argument('--requests', type=int, default=200)
+        parser.add_argument('--warmup', type=int, default=5)
+        parser.add_argument(
+            '--conn-max-age', type=int, default=60,
+            help='CONN_MAX_AGE of the persistent run (default 60).',
+        )
+        parser.add_argument(
+            '--no-health-checks', action='store_false',
+            dest='health_checks',
+            help='Disable CONN_HEALTH_CHECKS in the persistent run.',
+        )
+        super().add_arguments(parser)
+
+    def benchmark(self, **options):
+        if options['users'] < 1 or options['requests'] < 1:
+            raise CommandError('--users and --requests must be positive.')
+        if connection.in_atomic_block:
+            raise CommandError(
+                'Cannot run in a transaction: closing the connection would '
+                'roll it back.'
+            )
+
+        return connections.run(
+            scenario=options['scenario'],
+            users=options['users'],
+            requests=options['requests'],
+            conn_max_age=options['conn_max_age'],
+            health_checks=options['health_checks'],
+            warmup=options['warmup'],
+            label=options['label'],
+        )
@@ -0,0 +1,47 @@
+"""
+Django command measuring login throughput per password hasher.
+"""
+from django.core.management.base import CommandError
+
+from benchmarks import login, runner
+
+
+class Command(runner.BenchmarkCommand):
+    """Seed accounts, log in concurrently and print JSON results."""
+    help = (
+        'Measure token endpoint throughput and latency for each password '
+        'hasher at a given concurrency.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--hasher', action='append', dest='hashers',
+            choices=sorted(login.HASHERS),
+            help='Hasher to measure, may be repeated. Defaults to all.',
+        )
+        parser.add_argument('--users', type=int, default=10)
+        parser.add_argument('--requests', type=int, default=100)
+        parser.add_argument('--concurrency', type=int, default=8)
+        parser.add_argument(
+            '--workers', type=int,
+            help='Hashing pool size (default PASSWORD_HASH_WORKERS).',
+        )
+        parser.add_argument('--warmup', type=int, default=2)
+        super().add_arguments(parser)
+
+    def benchmark(self, **options):
+        if min(options['users'], options['requests'],
+               options['concurrency']) < 1:
+            raise CommandError(
+                '--users, --requests and --concurrency must be positive.'
+            )
+
+        return login.run(
+            hasher_names=options['hashers'],
+            users=options['users'],
+            requests=options['requests'],
+            concurrency=options['concurrency'],
+            workers=options['workers'],
+            warmup=options['warmup'],
+            label=options['label'],
+        )
@@ -0,0 +1,41 @@
+"""
+Django command measuring the cost of the throttle check.
+"""
+from django.core.management.base import CommandError
+
+from benchmarks import runner, throttle
+
+
+class Command(runner.BenchmarkCommand):
+    """Time BucketThrottle checks per mode."""
+    help = (
+        'Time the token bucket throttle check without a rate, from the '
+        'in-process front bucket, through the shared cache and when '
+        'refusing, and print JSON results in microseconds.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--mode', action='append', dest='modes',
+            choices=sorted(throttle.MODES),
+            help='Mode to run, may be repeated. Defaults to all.',
+        )
+        parser.add_argument('--checks', type=int, default=10000)
+        parser.add_argument(
+            '--clients', type=int, default=100,
+            help='Distinct client addresses the checks rotate over.',
+        )
+        parser.add_argument('--warmup', type=int, default=100)
+        super().add_arguments(parser)
+
+    def benchmark(self, **options):
+        if options['checks'] < 1 or options['clients'] < 1:
+            raise CommandError('--checks and --clients must be positive.')
+
+        return throttle.run(
+            modes=options['modes'],
+            checks=options['checks'],
+            clients=options['clients'],
+            warmup=options['warmup'],
+            label=options['label'],
+        )
@@ -0,0 +1,294 @@
+"""
+Seeding and measurement for the benchmark suite.
+"""
+import itertools
+import json
+import math
+import platform
+import statistics
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+
+import django
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.cache import caches
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import override_settings
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from accounts.authentication import local_tokens
+from accounts.models import Profile
+from benchmarks.scenarios import SCENARIOS
+from resume.models import (
+    Skill,
+    Education,
+    Certificate,
+    Experience
+)
+
+
+PASSWORD = 'benchpass123'
+
+DEFAULT_SIZES = {
+    'skills': 10,
+    'educations': 3,
+    'certificates': 5,
+    'experiences': 5,
+}
+
+
+class Rollback(Exception):
+    """Raised to discard the seeded data at the end of a run."""
+
+
+class Context:
+    """State shared by the scenarios of a run."""
+
+    def __init__(self, users, tokens, password=PASSWORD):
+        self.client = APIClient()
+        self.users = users
+        self.tokens = tokens
+        self.password = password
+        self._users = itertools.cycle(users)
+
+    def next_user(self):
+        return next(self._users)
+
+    def authenticate(self, user):
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f'Token {self.tokens[user.pk]}'
+        )
+
+
+def seed(users, sizes, password=PASSWORD):
+    """
+    Create ``users`` accounts with tokens and ``sizes`` rows in every
+    resume section, and return a Context for them.
+    """
+    User = get_user_model()
+    prefix = f'bench-{time.time_ns()}'
+    hashed = make_password(password)
+    accounts = User.objects.bulk_create([
+        User(email=f'{prefix}-{i}@bench.example.com', password=hashed)
+        for i in range(users)
+    ])
+    Profile.objects.bulk_create([
+        Profile(user=user, first_name='Bench', last_name=str(user.pk))
+        for user in accounts
+    ])
+    tokens = Token.objects.bulk_create([
+        Token(user=user, key=Token.generate_key()) for user in accounts
+    ])
+
+    rows = {Skill: [], Education: [], Certificate: [], Experience: []}
+    for user in accounts:
+        for i in range(sizes['skills']):
+            rows[Skill].append(Skill(user=user, title=f'Skill {i}'))
+        for i in range(sizes['educations']):
+            rows[Education].append(Education(
+                user=user,
+                institution=f'Institution {i}',
+                degree='Bachelor',
+                start_date=f'{2000 + i}-09-01',
+                end_date=f'{2004 + i}-06-30',
+            ))
+        for i in range(sizes['certificates']):
+            rows[Certificate].append(Certificate(
+                user=user,
+                title=f'Certificate {i}',
+                issuing_organization='Benchmark Institute',
+                issue_date=f'{2010 + i}-01-15',
+            ))
+        for i in range(sizes['experiences']):
+            rows[Experience].append(Experience(
+                user=user,
+                company=f'Company {i}',
+                position='Engineer',
+                description='Built and maintained services. ' * 10,
+                start_date=f'{2010 + i}-03-01',
+                end_date=f'{2011 + i}-02-28',
+            ))
+    for model, objs in rows.items():
+        model.objects.bulk_create(objs, batch_size=1000)
+
+    return Context(
+        accounts, {token.user_id: token.key for token in tokens}, password
+    )
+
+
+def clear_caches():
+    for cache in caches.all():
+        cache.clear()
+    local_tokens.clear()
+
+
+def percentile(values, percent):
+    """Return the nearest-rank percentile of ``values``."""
+    ordered = sorted(values)
+    rank = max(math.ceil(percent / 100 * len(ordered)) - 1, 0)
+    return ordered[rank]
+
+
+def _ms(seconds):
+    return round(seconds * 1000, 3)
+
+
+@contextmanager
+def count_queries():
+    """Count the queries executed on the default connection."""
+    counter = Counter()
+
+    def wrapper(execute, sql, params, many, context):
+        counter['queries'] += 1
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(wrapper):
+        yield counter
+
+
+def measure(func, ctx, requests, warmup=5, allocation_samples=10,
+            cold_cache=False):
+    """Run a scenario and return its latency, query and memory stats."""
+    for _ in range(warmup):
+        func(ctx)
+
+    latencies = []
+    queries = []
+    statuses = Counter()
+    for _ in range(requests):
+        if cold_cache:
+            clear_caches()
+        with count_queries() as counter:
+            start = time.perf_counter()
+            response = func(ctx)
+            latencies.append(time.perf_counter() - start)
+        queries.append(counter['queries'])
+        statuses[response.status_code] += 1
+
+    result = {
+        'requests': requests,
+        'status_codes': {str(code): n for code, n in statuses.items()},
+        'latency_ms': {
+            'mean': _ms(statistics.fmean(latencies)),
+            'min': _ms(min(latencies)),
+            'p50': _ms(percentile(latencies, 50)),
+            'p90': _ms(percentile(latencies, 90)),
+            'p95': _ms(percentile(latencies, 95)),
+            'p99': _ms(percentile(latencies, 99)),
+            'max': _ms(max(latencies)),
+        },
+        'queries_per_request': round(statistics.fmean(queries), 2),
+        'throughput_rps': round(requests / sum(latencies), 2),
+    }
+
+    if allocation_samples:
+        allocated = []
+        peaks = []
+        tracemalloc.start()
+        try:
+            for _ in range(allocation_samples):
+                if cold_cache:
+                    clear_caches()
+                tracemalloc.reset_peak()
+                before, _ = tracemalloc.get_traced_memory()
+                func(ctx)
+                after, peak = tracemalloc.get_traced_memory()
+                allocated.append(after - before)
+                peaks.append(peak - before)
+        finally:
+            tracemalloc.stop()
+        result['memory_kb'] = {
+            'retained_mean': round(statistics.fmean(allocated) / 1024, 1),
+            'peak_mean': round(statistics.fmean(peaks) / 1024, 1),
+        }
+
+    return result
+
+
+def run(scenarios=None, users=10, sizes=None, requests=50, warmup=5,
+        allocation_samples=10, cold_cache=False, keep_data=False,
+        label=None):
+    """
+    Seed the database, measure the scenarios and return the results
+    as a JSON serializable dict. Seeded data is rolled back unless
+    ``keep_data`` is set.
+    """
+    sizes = {**DEFAULT_SIZES, **(sizes or {})}
+    scenarios = scenarios or list(SCENARIOS)
+    report = {
+        'meta': {
+            'label': label,
+            'timestamp': timezone.now().isoformat(),
+            'database': connection.vendor,
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'params': {
+                'users': users,
+                'sizes': sizes,
+                'requests': requests,
+                'warmup': warmup,
+                'cold_cache': cold_cache,
+            },
+        },
+        'results': {},
+    }
+
+    hosts = [*settings.ALLOWED_HOSTS, 'testserver']
+    try:
+        # Measure the endpoints, not the throttles.
+        with override_settings(
+            ALLOWED_HOSTS=hosts, THROTTLE_RATES={}
+        ), transaction.atomic():
+            ctx = seed(users, sizes)
+            for name in scenarios:
+                report['results'][name] = measure(
+                    SCENARIOS[name],
+                    ctx,
+                    requests,
+                    warmup=warmup,
+                    allocation_samples=allocation_samples,
+                    cold_cache=cold_cache,
+                )
+            if not keep_data:
+                raise Rollback
+    except Rollback:
+        pass
+    finally:
+        clear_caches()
+
+    return report
+
+
+class BenchmarkCommand(BaseCommand):
+    """
+    Base of the benchmark commands: ``benchmark()`` runs the benchmark
+    with the parsed options and returns the report, which is printed as
+    JSON or written to ``--output``.
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument('--label', help='Free text stored in the results.')
+        parser.add_argument('--output', help='Write the JSON to this file.')
+
+    def benchmark(self, **options):
+        raise NotImplementedError(
+            'subclasses of BenchmarkCommand must provide a benchmark() method'
+        )
+
+    def handle(self, *args, **options):
+        output = json.dumps(self.benchmark(**options), indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                f.write(output + '\n')
+            self.stdout.write(self.style.SUCCESS(
+                f"Wrote results to {options['output']}"
+            ))
+        else:
+            self.stdout.write(output)
@@ -0,0 +1,87 @@
+"""
+Request scenarios measured by the benchmark suite.
+
+Every scenario issues exactly one request through ``ctx.client`` and
+returns the response. ``ctx`` also holds the seeded users so scenarios
+can spread their requests across accounts.
+"""
+import itertools
+
+from django.urls import reverse
+
+
+SCENARIOS = {}
+
+_counter = itertools.count()
+
+
+def scenario(name):
+    """Register a scenario function under ``name``."""
+    def decorator(func):
+        SCENARIOS[name] = func
+        return func
+    return decorator
+
+
+def _section_create(url_name, payload):
+    def run(ctx):
+        ctx.authenticate(ctx.next_user())
+        return ctx.client.post(reverse(url_name), payload, format='json')
+    return run
+
+
+def _get(url_name):
+    def run(ctx):
+        ctx.authenticate(ctx.next_user())
+        return ctx.client.get(reverse(url_name))
+    return run
+
+
+scenario('resume-retrieve')(_get('resume:resume-retrieve'))
+scenario('profile')(_get('accounts:profile'))
+
+for _name in ('skill', 'education', 'certificate', 'experience'):
+    scenario(f'{_name}-list')(_get(f'resume:{_name}-list'))
+
+scenario('skill-create')(_section_create(
+    'resume:skill-list', {'title': 'Benchmarking'}
+))
+scenario('education-create')(_section_create('resume:education-list', {
+    'institution': 'Tech Uni',
+    'degree': 'Bachelor',
+    'start_date': '2020-01-01',
+    'end_date': '2023-01-01',
+}))
+scenario('certificate-create')(_section_create('resume:certificate-list', {
+    'title': 'Django Developer',
+    'issuing_organization': 'Django Institute',
+    'issue_date': '2023-06-01',
+}))
+scenario('experience-create')(_section_create('resume:experience-list', {
+    'company': 'Tech Group',
+    'position': 'Software Engineer',
+    'description': 'Worked on developing applications.',
+    'start_date': '2022-04-12',
+    'end_date': '2023-05-06',
+}))
+
+
+@scenario('token')
+def token(ctx):
+    user = ctx.next_user()
+    ctx.client.credentials()
+    return ctx.client.post(reverse('accounts:token'), {
+        'email': user.email,
+        'password': ctx.password,
+    })
+
+
+@scenario('register')
+def register(ctx):
+    ctx.client.credentials()
+    email = f'register-{next(_counter)}-{id(ctx)}@bench.example.com'
+    return ctx.client.post(reverse('accounts:register'), {
+        'email': email,
+        'password': ctx.password,
+        'password1': ctx.password,
+    })
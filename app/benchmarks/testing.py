@@ -0,0 +1,30 @@
+"""
+Test helpers for the benchmark commands.
+"""
+import io
+import json
+import os
+import tempfile
+
+from django.core.management import call_command
+
+
+class BenchmarkCommandTestMixin:
+    """TestCase mixin running a benchmark command for its report."""
+
+    def call_benchmark(self, name, to_file=False, **options):
+        """
+        Run the benchmark command ``name`` and return its report, read
+        from ``--output`` when ``to_file`` is set and from stdout
+        otherwise.
+        """
+        out = io.StringIO()
+        if not to_file:
+            call_command(name, stdout=out, **options)
+            return json.loads(out.getvalue())
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'results.json')
+            call_command(name, output=path, stdout=out, **options)
+            self.assertIn(path, out.getvalue())
+            with open(path) as f:
+                return json.load(f)
@@ -0,0 +1,36 @@
+"""
+Tests for the benchmark management command.
+"""
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from benchmarks.testing import BenchmarkCommandTestMixin
+from resume.models import Skill
+
+
+class BenchmarkCommandTests(BenchmarkCommandTestMixin, TestCase):
+
+    def test_benchmark_writes_json_results(self):
+        """Test results are written per scenario and data rolled back."""
+        report = self.call_benchmark(
+            'benchmark',
+            to_file=True,
+            scenarios=['resume-retrieve', 'skill-create'],
+            users=2,
+            skills=3,
+            requests=3,
+            warmup=1,
+            allocation_samples=1,
+        )
+
+        self.assertEqual(
+            set(report['results']), {'resume-retrieve', 'skill-create'}
+        )
+        retrieve = report['results']['resume-retrieve']
+        self.assertEqual(retrieve['status_codes'], {'200': 3})
+        self.assertIn('p99', retrieve['latency_ms'])
+        self.assertIn('peak_mean', retrieve['memory_kb'])
+        self.assertGreater(retrieve['queries_per_request'], 0)
+        self.assertEqual(report['meta']['params']['sizes']['skills'], 3)
+        self.assertFalse(get_user_model().objects.exists())
+        self.assertFalse(Skill.objects.exists())
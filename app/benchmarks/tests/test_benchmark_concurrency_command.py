@@ -0,0 +1,34 @@
+"""
+Tests for the concurrency benchmark command.
+"""
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from benchmarks.testing import BenchmarkCommandTestMixin
+from resume.models import Skill
+
+
+class BenchmarkConcurrencyCommandTests(BenchmarkCommandTestMixin, TestCase):
+
+    def test_benchmark_reports_every_mode(self):
+        """Test throughput is reported per mode and data removed."""
+        # Worker threads of the WSGI mode cannot see the test transaction.
+        report = self.call_benchmark(
+            'benchmark_concurrency',
+            modes=['asgi-sync', 'asgi-async'],
+            users=2,
+            skills=3,
+            requests=6,
+            concurrency=3,
+            warmup=1,
+        )
+
+        self.assertEqual(
+            set(report['results']), {'asgi-sync', 'asgi-async'}
+        )
+        for result in report['results'].values():
+            self.assertEqual(result['status_codes'], {'200': 6})
+            self.assertGreater(result['throughput_rps'], 0)
+            self.assertIn('p99', result['latency_ms'])
+        self.assertFalse(get_user_model().objects.exists())
+        self.assertFalse(Skill.objects.exists())
@@ -0,0 +1,51 @@
+"""
+Tests for the connection overhead benchmark command.
+"""
+from django.contrib.auth import get_user_model
+from django.core.management.base import CommandError
+from django.db import connection, transaction
+from django.test import TransactionTestCase
+
+from benchmarks.testing import BenchmarkCommandTestMixin
+
+
+class BenchmarkConnectionsCommandTests(
+    BenchmarkCommandTestMixin, TransactionTestCase
+):
+    """
+    The benchmark closes the default connection, which would roll back
+    the transaction a TestCase runs in. Its requests read from the
+    replicas when there are any.
+    """
+    databases = '__all__'
+
+    def test_benchmark_compares_connection_modes(self):
+        """Test both modes are reported and the settings restored."""
+        settings_dict = connection.settings_dict.copy()
+        report = self.call_benchmark(
+            'benchmark_connections',
+            users=2,
+            requests=3,
+            warmup=1,
+            conn_max_age=30,
+        )
+
+        self.assertEqual(
+            set(report['results']), {'per-request', 'persistent'}
+        )
+        self.assertEqual(report['results']['per-request']['conn_max_age'], 0)
+        self.assertEqual(report['results']['persistent']['conn_max_age'], 30)
+        self.assertIn(
+            'connections_per_request', report['results']['persistent']
+        )
+        self.assertIn('handshake_ms', report)
+        self.assertEqual(connection.settings_dict, settings_dict)
+        self.assertFalse(get_user_model().objects.exists())
+
+    def test_refuses_to_run_in_transaction(self):
+        """Test the benchmark does not close a connection in a transaction."""
+        with transaction.atomic():
+            with self.assertRaises(CommandError):
+                self.call_benchmark(
+                    'benchmark_connections', users=1, requests=1
+                )
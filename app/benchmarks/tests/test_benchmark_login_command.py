@@ -0,0 +1,30 @@
+"""
+Tests for the login throughput benchmark command.
+"""
+from django.contrib.auth import get_user_model
+from django.test import TransactionTestCase
+
+from benchmarks.testing import BenchmarkCommandTestMixin
+
+
+class BenchmarkLoginCommandTests(
+    BenchmarkCommandTestMixin, TransactionTestCase
+):
+    # Logins run on worker threads, which only see committed data.
+
+    def test_benchmark_reports_hashers(self):
+        """Test logins succeed per hasher and the accounts are removed."""
+        report = self.call_benchmark(
+            'benchmark_login',
+            hashers=['scrypt'],
+            users=2,
+            requests=2,
+            concurrency=1,
+            warmup=0,
+        )
+
+        result = report['results']['scrypt']
+        self.assertEqual(result['algorithm'], 'scrypt')
+        self.assertEqual(result['status_codes'], {'200': 2})
+        self.assertGreater(result['throughput_rps'], 0)
+        self.assertFalse(get_user_model().objects.exists())
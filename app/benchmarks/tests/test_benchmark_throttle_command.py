@@ -0,0 +1,27 @@
+"""
+Tests for the throttle benchmark command.
+"""
+from django.test import TestCase
+
+from accounts import throttling
+from benchmarks.testing import BenchmarkCommandTestMixin
+
+
+class BenchmarkThrottleCommandTests(BenchmarkCommandTestMixin, TestCase):
+
+    def test_benchmark_reports_every_mode(self):
+        """Test every mode is timed and the buckets dropped."""
+        report = self.call_benchmark(
+            'benchmark_throttle', checks=50, clients=5, warmup=5
+        )
+
+        self.assertEqual(
+            set(report['results']),
+            {'unthrottled', 'front', 'shared', 'refused'},
+        )
+        self.assertEqual(report['results']['front']['allowed'], 1)
+        self.assertEqual(report['results']['refused']['allowed'], 0)
+        self.assertIn('p99', report['results']['shared']['latency_us'])
+        self.assertIsNone(
+            throttling.local_buckets.get('throttle:accounts:token:ip:10.0.0.0')
+        )
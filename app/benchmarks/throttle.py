@@ -0,0 +1,120 @@
+"""
+Cost of the throttle check.
+
+``BucketThrottle.allow_request`` is timed alone on requests built with
+the RequestFactory, in microseconds: without a configured rate, when
+spending from the in-process front bucket, when every check leases from
+the shared cache, and when refusing a client that ran out.
+"""
+import statistics
+import time
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.test import RequestFactory
+from django.test.utils import override_settings
+from django.urls import resolve, reverse
+from django.utils import timezone
+
+from accounts import throttling
+from benchmarks.runner import percentile
+
+
+class SharedThrottle(throttling.BucketThrottle):
+    """Lease one token at a time, so every check uses the shared cache."""
+    lease_fraction = 0
+
+
+# Throttle class and rate of the token endpoint per mode.
+MODES = {
+    'unthrottled': (throttling.BucketThrottle, None),
+    'front': (throttling.BucketThrottle, '1000000/s'),
+    'shared': (SharedThrottle, '1000000/s'),
+    'refused': (throttling.BucketThrottle, '1/d'),
+}
+
+
+def _us(seconds):
+    return round(seconds * 1000000, 3)
+
+
+def make_requests(clients):
+    """Return token requests from ``clients`` addresses."""
+    url = reverse('accounts:token')
+    match = resolve(url)
+    factory = RequestFactory()
+    requests = []
+    for i in range(clients):
+        request = factory.post(url, REMOTE_ADDR=f'10.0.{i // 256}.{i % 256}')
+        request.resolver_match = match
+        request.user = AnonymousUser()
+        requests.append(request)
+    return requests
+
+
+def measure(throttle_class, requests, checks, warmup=100):
+    """Return the latency of ``checks`` checks and the share allowed."""
+    for i in range(warmup):
+        throttle_class().allow_request(requests[i % len(requests)], None)
+
+    timings = []
+    allowed = 0
+    for i in range(checks):
+        request = requests[i % len(requests)]
+        throttle = throttle_class()
+        start = time.perf_counter()
+        allowed += throttle.allow_request(request, None)
+        timings.append(time.perf_counter() - start)
+    return {
+        'checks': checks,
+        'allowed': round(allowed / checks, 3),
+        'latency_us': {
+            'mean': _us(statistics.fmean(timings)),
+            'p50': _us(percentile(timings, 50)),
+            'p95': _us(percentile(timings, 95)),
+            'p99': _us(percentile(timings, 99)),
+        },
+    }
+
+
+def run(modes=None, checks=10000, clients=100, warmup=100, label=None):
+    """Measure the throttle check per mode and return a JSON dict."""
+    modes = modes or list(MODES)
+    alias = getattr(settings, 'THROTTLE_CACHE_ALIAS', 'default')
+    report = {
+        'meta': {
+            'label': label,
+            'timestamp': timezone.now().isoformat(),
+            'cache': settings.CACHES[alias]['BACKEND'],
+            'params': {
+                'checks': checks,
+                'clients': clients,
+            },
+        },
+        'results': {},
+    }
+
+    requests = make_requests(clients)
+    keys = set()
+    try:
+        for name in modes:
+            throttle_class, rate = MODES[name]
+            rates = {'accounts:token': rate} if rate else {}
+            with override_settings(THROTTLE_RATES=rates):
+                keys.update(
+                    throttle_class().get_bucket(request, request.user)[0]
+                    for request in requests
+                )
+                throttling.get_throttle_cache().delete_many(
+                    [key for key in keys if key]
+                )
+                report['results'][name] = measure(
+                    throttle_class, requests, checks, warmup=warmup
+                )
+    finally:
+        throttling.get_throttle_cache().delete_many(
+            [key for key in keys if key]
+        )
+        throttling.reset()
+
+    return report
@@ -0,0 +1,6 @@
+from django.contrib import admin
+from jobs import models
+
+# Register your models here.
+
+admin.site.register(models.Job)
@@ -0,0 +1,36 @@
+"""
+Serializers for the jobs API.
+"""
+from rest_framework import serializers
+
+from jobs.models import Job
+
+
+class JobSerializer(serializers.ModelSerializer):
+    """Serializer for the status of a job."""
+
+    class Meta:
+        model = Job
+        fields = [
+            'id',
+            'kind',
+            'status',
+            'priority',
+            'attempts',
+            'max_attempts',
+            'result',
+            'error',
+            'run_after',
+            'created_time',
+            'started_time',
+            'finished_time',
+        ]
+        read_only_fields = fields
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        request = self.context.get('request')
+        # Tracebacks are for staff; users only learn that it failed.
+        if request is None or not request.user.is_staff:
+            data.pop('error')
+        return data
@@ -0,0 +1,21 @@
+"""
+Url mappings for the jobs app.
+"""
+from django.urls import (
+    path,
+    include
+)
+
+from rest_framework.routers import SimpleRouter
+from jobs.api import views
+
+
+router = SimpleRouter()
+router.register('', views.JobViewSet)
+
+
+app_name = 'jobs'
+
+urlpatterns = [
+    path('', include(router.urls)),
+]
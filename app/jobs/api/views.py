@@ -0,0 +1,40 @@
+"""
+Views for the jobs API.
+"""
+from rest_framework import viewsets
+from rest_framework.pagination import LimitOffsetPagination
+from rest_framework.permissions import IsAuthenticated
+from accounts.authentication import CachedTokenAuthentication
+from jobs.api import serializers
+from jobs.models import Job
+
+
+class JobPagination(LimitOffsetPagination):
+    default_limit = 20
+    max_limit = 100
+
+
+class JobViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    View for the status of background jobs. Users see the jobs they
+    started and staff every job. ``status`` and ``kind`` filter the
+    list.
+    """
+    serializer_class = serializers.JobSerializer
+    queryset = Job.objects.all()
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [IsAuthenticated]
+    pagination_class = JobPagination
+
+    def get_queryset(self):
+        """Retrieve the jobs visible to the authenticated user."""
+        queryset = self.queryset
+        if not self.request.user.is_staff:
+            queryset = queryset.filter(user=self.request.user)
+        if self.action == 'list':
+            for name in ('status', 'kind'):
+                if name in self.request.query_params:
+                    queryset = queryset.filter(
+                        **{name: self.request.query_params[name]}
+                    )
+        return queryset
@@ -0,0 +1,95 @@
+"""
+Django command to run the queued background jobs.
+"""
+import signal
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, close_old_connections
+
+from jobs import queue
+from jobs.models import Job
+
+
+class Command(BaseCommand):
+    """Claim and run queued jobs until stopped."""
+    help = (
+        'Run queued background jobs, polling for new ones. Start several '
+        'workers to run jobs in parallel; SIGTERM and SIGINT stop a worker '
+        'once its current job is done. Jobs finished more than '
+        'JOB_RETENTION seconds ago are deleted along the way.'
+    )
+    # Seconds between deletions of the old finished jobs.
+    prune_interval = 60 * 60
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--kinds',
+            help='Comma separated kinds to run, all registered by default.',
+        )
+        parser.add_argument(
+            '--poll-interval', type=float,
+            default=getattr(settings, 'JOB_POLL_INTERVAL', 1),
+            help='Seconds to wait when no job is queued.',
+        )
+        parser.add_argument(
+            '--burst', action='store_true',
+            help='Exit once no job is left instead of polling.',
+        )
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        kinds = None
+        if options['kinds']:
+            kinds = options['kinds'].split(',')
+            unknown = [kind for kind in kinds if kind not in queue.tasks]
+            if unknown:
+                raise CommandError(
+                    f'Unknown job kinds: {", ".join(unknown)}.'
+                )
+        using = options['database']
+        worker = queue.get_worker_name()
+
+        self.stopping = False
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            signal.signal(signum, self.stop)
+
+        self.stdout.write(f'Worker {worker} started.')
+        count = 0
+        pruned_at = None
+        while not self.stopping:
+            close_old_connections()
+            queue.requeue_abandoned(using=using)
+            now = time.monotonic()
+            if pruned_at is None or now - pruned_at >= self.prune_interval:
+                queue.prune(using=using)
+                pruned_at = now
+            job = queue.claim(worker, kinds=kinds, using=using)
+            if job is None:
+                if options['burst']:
+                    break
+                time.sleep(options['poll_interval'])
+                continue
+            start = time.perf_counter()
+            job = queue.run(job, using=using)
+            count += 1
+            self.report(job, time.perf_counter() - start)
+
+        close_old_connections()
+        self.stdout.write(self.style.SUCCESS(
+            f'Worker {worker} stopped after {count} jobs.'
+        ))
+
+    def stop(self, signum, frame):
+        self.stopping = True
+
+    def report(self, job, elapsed):
+        line = f'{job} in {elapsed:.2f}s'
+        if job.status == Job.SUCCEEDED:
+            self.stdout.write(line)
+        else:
+            retry = ', retrying' if job.status == Job.QUEUED else ''
+            self.stderr.write(
+                f'{line}{retry}: {job.error.strip().splitlines()[-1]}'
+            )
@@ -0,0 +1,85 @@
+"""
+Models of the background job queue.
+"""
+from django.conf import settings
+from django.db import models
+from django.utils import timezone
+
+
+class Job(models.Model):
+    """
+    A call of a registered task, run by a ``run_jobs`` worker. Jobs with
+    a ``key`` are unique per kind while queued or running, so the same
+    work is not queued twice.
+    """
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    SUCCEEDED = 'succeeded'
+    FAILED = 'failed'
+    STATUS_CHOICES = [
+        (QUEUED, 'Queued'),
+        (RUNNING, 'Running'),
+        (SUCCEEDED, 'Succeeded'),
+        (FAILED, 'Failed'),
+    ]
+    ACTIVE = (QUEUED, RUNNING)
+
+    kind = models.CharField(max_length=100)
+    key = models.CharField(max_length=255, blank=True)
+    payload = models.JSONField(default=dict)
+    status = models.CharField(
+        max_length=10, choices=STATUS_CHOICES, default=QUEUED
+    )
+    # Higher runs first.
+    priority = models.SmallIntegerField(default=0)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=3)
+    run_after = models.DateTimeField(default=timezone.now)
+    # The worker running the job and until when, after which the job is
+    # considered abandoned.
+    locked_by = models.CharField(max_length=100, blank=True)
+    locked_until = models.DateTimeField(null=True, blank=True)
+    result = models.JSONField(null=True, blank=True)
+    error = models.TextField(blank=True)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        null=True,
+        blank=True,
+        related_name='jobs',
+        on_delete=models.CASCADE
+    )
+    created_time = models.DateTimeField(auto_now_add=True)
+    started_time = models.DateTimeField(null=True, blank=True)
+    finished_time = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ('-created_time', '-id')
+        constraints = [
+            models.UniqueConstraint(
+                fields=['kind', 'key'],
+                condition=(
+                    models.Q(status__in=['queued', 'running'])
+                    & ~models.Q(key='')
+                ),
+                name='job_unique_active_key',
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=['-priority', 'run_after', 'id'],
+                condition=models.Q(status='queued'),
+                name='job_queued_idx',
+            ),
+            models.Index(
+                fields=['kind', 'locked_until'],
+                condition=models.Q(status='running'),
+                name='job_running_idx',
+            ),
+            models.Index(
+                fields=['user', '-created_time'],
+                name='job_user_created_idx',
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.kind} #{self.pk} ({self.status})'
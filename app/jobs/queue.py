@@ -0,0 +1,278 @@
+"""
+A job queue kept in the database.
+
+Tasks are registered with ``@task`` and queued with ``enqueue``; the
+``run_jobs`` command claims and runs them outside of requests. Workers
+claim the next queued job by priority with ``SELECT ... FOR UPDATE SKIP
+LOCKED`` where the database supports it, so they do not wait for each
+other; elsewhere, such as on SQLite, a conditional update of the status
+makes sure a job is claimed once. Failed jobs are retried with an
+exponential delay, and a task may limit how many of its jobs run at
+once across all workers.
+"""
+import os
+import socket
+import traceback
+import zlib
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import (
+    DEFAULT_DB_ALIAS,
+    IntegrityError,
+    connections,
+    transaction,
+)
+from django.db.models import Count, F
+from django.utils import timezone
+
+from jobs.models import Job
+
+
+# Queued jobs read per claim, in case the first are already taken or
+# their task is at its concurrency limit.
+CLAIM_BATCH = 10
+
+# Times a keyed job is saved again when its active job finished between
+# the failed insert and the lookup.
+ENQUEUE_ATTEMPTS = 3
+
+# Finished jobs deleted per query by ``prune``.
+PRUNE_BATCH = 1000
+
+
+class Task:
+    """A function run by the workers, and how its jobs are run."""
+
+    def __init__(self, func, kind, priority=0, max_attempts=3,
+                 concurrency=None, timeout=300):
+        self.func = func
+        self.kind = kind
+        self.priority = priority
+        self.max_attempts = max_attempts
+        # Most jobs of this kind running at once, unlimited if None.
+        self.concurrency = concurrency
+        # Seconds after which a running job is considered abandoned.
+        self.timeout = timeout
+
+    def __call__(self, *args, **kwargs):
+        return self.func(*args, **kwargs)
+
+
+tasks = {}
+
+
+def task(kind, **options):
+    """
+    Register the decorated function as the task ``kind``. Jobs call it
+    with their payload as keyword arguments and store its return value,
+    which must be JSON serializable.
+    """
+    def decorator(func):
+        tasks[kind] = Task(func, kind, **options)
+        return tasks[kind]
+    return decorator
+
+
+def enqueue(kind, payload=None, key='', user=None, priority=None,
+            delay=0, using=DEFAULT_DB_ALIAS):
+    """
+    Queue a job of ``kind`` and return it. When ``key`` is given and a
+    job of the kind with that key is queued or running, return that job
+    instead.
+    """
+    task = tasks[kind]
+    job = Job(
+        kind=kind,
+        key=key,
+        payload=payload or {},
+        user=user,
+        priority=task.priority if priority is None else priority,
+        max_attempts=task.max_attempts,
+        run_after=timezone.now() + timedelta(seconds=delay),
+    )
+    if not key:
+        job.save(using=using)
+        return job
+    for attempt in range(ENQUEUE_ATTEMPTS):
+        try:
+            with transaction.atomic(using=using):
+                job.save(using=using)
+            return job
+        except IntegrityError:
+            existing = Job.objects.using(using).filter(
+                kind=kind, key=key, status__in=Job.ACTIVE
+            ).first()
+            if existing is not None:
+                return existing
+            # The active job finished in between, or the insert failed
+            # for another reason, such as a deleted user.
+            if attempt == ENQUEUE_ATTEMPTS - 1:
+                raise
+
+
+def get_worker_name():
+    return f'{socket.gethostname()}:{os.getpid()}'
+
+
+def requeue_abandoned(using=DEFAULT_DB_ALIAS):
+    """
+    Queue again the running jobs whose worker did not finish them in
+    time, or fail them when they have no attempts left.
+    """
+    now = timezone.now()
+    abandoned = Job.objects.using(using).filter(
+        status=Job.RUNNING, locked_until__lt=now
+    )
+    failed = abandoned.filter(attempts__gte=F('max_attempts')).update(
+        status=Job.FAILED,
+        error='The job did not finish in time.',
+        locked_until=None,
+        finished_time=now,
+    )
+    requeued = abandoned.update(
+        status=Job.QUEUED, locked_by='', locked_until=None, run_after=now
+    )
+    return failed + requeued
+
+
+def prune(older_than=None, using=DEFAULT_DB_ALIAS):
+    """
+    Delete the jobs that finished more than ``older_than`` seconds ago,
+    ``JOB_RETENTION`` by default, and return how many were deleted.
+    """
+    if older_than is None:
+        older_than = getattr(settings, 'JOB_RETENTION', 7 * 24 * 60 * 60)
+    finished = Job.objects.using(using).filter(
+        status__in=[Job.SUCCEEDED, Job.FAILED],
+        finished_time__lt=timezone.now() - timedelta(seconds=older_than),
+    )
+    count = 0
+    while True:
+        pks = list(finished.values_list('pk', flat=True)[:PRUNE_BATCH])
+        if not pks:
+            return count
+        count += Job.objects.using(using).filter(pk__in=pks).delete()[0]
+
+
+def _full_kinds(using):
+    """Return the kinds running as many jobs as their task allows."""
+    limited = {
+        kind: task.concurrency
+        for kind, task in tasks.items() if task.concurrency is not None
+    }
+    if not limited:
+        return []
+    running = Job.objects.using(using).filter(
+        status=Job.RUNNING, kind__in=limited
+    ).values('kind').annotate(count=Count('pk')).order_by()
+    return [
+        row['kind'] for row in running
+        if row['count'] >= limited[row['kind']]
+    ]
+
+
+def _has_slot(task, using):
+    """
+    Tell whether another job of ``task`` may run, serializing the
+    workers claiming jobs of the same kind on PostgreSQL until the
+    transaction ends.
+    """
+    connection = connections[using]
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT pg_advisory_xact_lock(%s)',
+                [zlib.crc32(task.kind.encode())],
+            )
+    running = Job.objects.using(using).filter(
+        status=Job.RUNNING, kind=task.kind
+    ).count()
+    return running < task.concurrency
+
+
+def claim(worker, kinds=None, using=DEFAULT_DB_ALIAS):
+    """
+    Mark the next runnable job as running by ``worker`` and return it,
+    or return None when there is none. ``kinds`` restricts the claimed
+    jobs, by default to every registered task.
+    """
+    now = timezone.now()
+    kinds = [kind for kind in (kinds or tasks) if kind in tasks]
+    full = _full_kinds(using)
+    jobs = Job.objects.using(using).filter(
+        status=Job.QUEUED, run_after__lte=now, kind__in=kinds
+    ).exclude(kind__in=full).order_by('-priority', 'run_after', 'id')
+
+    with transaction.atomic(using=using):
+        if connections[using].features.has_select_for_update_skip_locked:
+            jobs = jobs.select_for_update(skip_locked=True)
+        for job in jobs[:CLAIM_BATCH]:
+            task = tasks[job.kind]
+            if task.concurrency is not None and not _has_slot(task, using):
+                continue
+            changes = {
+                'status': Job.RUNNING,
+                'attempts': job.attempts + 1,
+                'locked_by': worker,
+                'locked_until': now + timedelta(seconds=task.timeout),
+                'started_time': now,
+            }
+            claimed = Job.objects.using(using).filter(
+                pk=job.pk, status=Job.QUEUED
+            ).update(**changes)
+            if claimed:
+                for name, value in changes.items():
+                    setattr(job, name, value)
+                return job
+    return None
+
+
+def run(job, using=DEFAULT_DB_ALIAS):
+    """
+    Run a claimed job and record its result, or its error and whether it
+    will be retried. Return the job.
+    """
+    try:
+        result = tasks[job.kind](**job.payload)
+    except Exception:
+        job.error = traceback.format_exc()
+        if job.attempts < job.max_attempts:
+            delay = getattr(settings, 'JOB_RETRY_DELAY', 10)
+            job.status = Job.QUEUED
+            job.run_after = timezone.now() + timedelta(
+                seconds=delay * 2 ** (job.attempts - 1)
+            )
+        else:
+            job.status = Job.FAILED
+            job.finished_time = timezone.now()
+    else:
+        job.status = Job.SUCCEEDED
+        job.result = result
+        job.error = ''
+        job.finished_time = timezone.now()
+    job.locked_until = None
+
+    # A worker that overran the timeout no longer owns the job.
+    Job.objects.using(using).filter(
+        pk=job.pk, status=Job.RUNNING, locked_by=job.locked_by
+    ).update(
+        status=job.status,
+        result=job.result,
+        error=job.error,
+        run_after=job.run_after,
+        locked_until=None,
+        finished_time=job.finished_time,
+    )
+    return job
+
+
+def run_pending(worker=None, kinds=None, using=DEFAULT_DB_ALIAS):
+    """Run the runnable jobs until none is left, returning them."""
+    worker = worker or get_worker_name()
+    done = []
+    while True:
+        job = claim(worker, kinds=kinds, using=using)
+        if job is None:
+            return done
+        done.append(run(job, using=using))
@@ -0,0 +1,76 @@
+"""
+Tests for the jobs API.
+"""
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+from jobs.models import Job
+
+
+JOBS_URL = reverse('jobs:job-list')
+
+
+def detail_url(job_id):
+    """Create and return a job detail URL."""
+    return reverse('jobs:job-detail', args=[job_id])
+
+
+def create_user(email='user@example.com', password='testpass123'):
+    """Create and return a user."""
+    return get_user_model().objects.create_user(email, password)
+
+
+class JobsApiTests(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = create_user()
+        self.client.force_authenticate(user=self.user)
+        self.job = Job.objects.create(
+            kind='resume.render',
+            user=self.user,
+            status=Job.FAILED,
+            error='Traceback ...',
+        )
+        self.other_job = Job.objects.create(
+            kind='resume.render', user=create_user(email='other@example.com')
+        )
+
+    def test_auth_required(self):
+        """Test authentication is required."""
+        res = APIClient().get(JOBS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_list_own_jobs(self):
+        """Test users only see their jobs, without tracebacks."""
+        res = self.client.get(JOBS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [job['id'] for job in res.data['results']], [self.job.pk]
+        )
+        self.assertEqual(res.data['results'][0]['status'], 'failed')
+        self.assertNotIn('error', res.data['results'][0])
+        res = self.client.get(detail_url(self.other_job.pk))
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_staff_see_all_jobs(self):
+        """Test staff see every job and can filter them."""
+        self.client.force_authenticate(
+            user=get_user_model().objects.create_superuser(
+                'admin@example.com', 'testpass123'
+            )
+        )
+
+        res = self.client.get(JOBS_URL, {'status': 'failed'})
+
+        self.assertEqual(
+            [job['id'] for job in res.data['results']], [self.job.pk]
+        )
+        self.assertEqual(res.data['results'][0]['error'], 'Traceback ...')
+        res = self.client.get(detail_url(self.other_job.pk))
+        self.assertEqual(res.data['status'], 'queued')
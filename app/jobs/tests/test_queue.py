@@ -0,0 +1,174 @@
+"""
+Tests for the background job queue.
+"""
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.db import IntegrityError
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+
+from jobs import queue
+from jobs.models import Job
+
+
+calls = []
+
+
+@queue.task('tests.record')
+def record(value=None):
+    calls.append(value)
+    return {'value': value}
+
+
+@queue.task('tests.fail', max_attempts=2)
+def fail():
+    raise ValueError('Nothing to do.')
+
+
+@queue.task('tests.limited', concurrency=1)
+def limited():
+    return None
+
+
+class QueueTests(TestCase):
+
+    def setUp(self):
+        calls.clear()
+
+    def test_run_by_priority(self):
+        """Test higher priorities run first, then the oldest."""
+        for value, priority in [(1, 0), (2, 5), (3, 0)]:
+            queue.enqueue('tests.record', {'value': value}, priority=priority)
+
+        jobs = queue.run_pending()
+
+        self.assertEqual(calls, [2, 1, 3])
+        self.assertEqual(
+            {job.status for job in jobs}, {Job.SUCCEEDED}
+        )
+        self.assertEqual(Job.objects.get(payload={'value': 2}).result, {
+            'value': 2
+        })
+
+    def test_key_deduplicates_active_jobs(self):
+        """Test a key is queued once until its job finished."""
+        first = queue.enqueue('tests.record', key='a')
+        second = queue.enqueue('tests.record', key='a')
+        self.assertEqual(first.pk, second.pk)
+
+        queue.run_pending()
+        third = queue.enqueue('tests.record', key='a')
+
+        self.assertNotEqual(third.pk, first.pk)
+
+    def test_failed_insert_raises(self):
+        """Test an insert failing for another reason than the key raises."""
+        with mock.patch.object(
+            Job, 'save', side_effect=IntegrityError('FOREIGN KEY failed')
+        ) as save:
+            with self.assertRaises(IntegrityError):
+                queue.enqueue('tests.record', key='a')
+
+        self.assertEqual(save.call_count, queue.ENQUEUE_ATTEMPTS)
+
+    def test_delayed_job_waits(self):
+        """Test jobs are not claimed before their time."""
+        queue.enqueue('tests.record', delay=60)
+
+        self.assertIsNone(queue.claim('worker'))
+
+    @override_settings(JOB_RETRY_DELAY=30)
+    def test_failed_job_retried_later(self):
+        """Test a failed job is queued again after a delay."""
+        queue.enqueue('tests.fail')
+
+        job = queue.run(queue.claim('worker'))
+
+        self.assertEqual(job.status, Job.QUEUED)
+        self.assertIn('ValueError: Nothing to do.', job.error)
+        self.assertIsNone(queue.claim('worker'))
+        job.refresh_from_db()
+        self.assertGreater(
+            job.run_after, timezone.now() + timedelta(seconds=20)
+        )
+
+    @override_settings(JOB_RETRY_DELAY=0)
+    def test_failed_after_max_attempts(self):
+        """Test a job failing every attempt ends failed."""
+        job = queue.enqueue('tests.fail')
+
+        queue.run_pending()
+
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), (Job.FAILED, 2))
+        self.assertIsNotNone(job.finished_time)
+
+    def test_concurrency_limit(self):
+        """Test no more jobs of a kind run at once than its limit."""
+        queue.enqueue('tests.limited')
+        queue.enqueue('tests.limited')
+        queue.enqueue('tests.record')
+
+        first = queue.claim('worker-1')
+        second = queue.claim('worker-2')
+
+        self.assertEqual(
+            (first.kind, second.kind), ('tests.limited', 'tests.record')
+        )
+        self.assertIsNone(queue.claim('worker-3'))
+        queue.run(first)
+        self.assertEqual(queue.claim('worker-3').kind, 'tests.limited')
+
+    def test_abandoned_job_requeued(self):
+        """Test a job whose worker died is queued again."""
+        job = queue.enqueue('tests.record')
+        queue.claim('worker-1')
+        Job.objects.filter(pk=job.pk).update(
+            locked_until=timezone.now() - timedelta(seconds=1)
+        )
+
+        self.assertEqual(queue.requeue_abandoned(), 1)
+
+        job = queue.claim('worker-2')
+        self.assertEqual((job.locked_by, job.attempts), ('worker-2', 2))
+
+    def test_prune_finished_jobs(self):
+        """Test finished jobs are deleted once older than the retention."""
+        old = queue.enqueue('tests.record')
+        recent = queue.enqueue('tests.record')
+        queued = queue.enqueue('tests.record', delay=60)
+        queue.run_pending()
+        Job.objects.filter(pk=old.pk).update(
+            finished_time=timezone.now() - timedelta(days=2)
+        )
+
+        self.assertEqual(queue.prune(older_than=24 * 60 * 60), 1)
+
+        self.assertEqual(
+            set(Job.objects.values_list('pk', flat=True)),
+            {recent.pk, queued.pk},
+        )
+
+
+class RunJobsCommandTests(TransactionTestCase):
+    """
+    The worker closes the old connections, which would roll back the
+    transaction a TestCase runs in.
+    """
+
+    def test_burst(self):
+        """Test the worker runs the queued jobs and exits."""
+        calls.clear()
+        queue.enqueue('tests.record', {'value': 1})
+        queue.enqueue('tests.record', {'value': 2})
+
+        out = StringIO()
+        call_command(
+            'run_jobs', burst=True, kinds='tests.record', stdout=out
+        )
+
+        self.assertEqual(calls, [1, 2])
+        self.assertIn('stopped after 2 jobs.', out.getvalue())
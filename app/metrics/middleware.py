@@ -0,0 +1,167 @@
+"""
+Middleware recording per-view request metrics.
+"""
+import logging
+import time
+from contextlib import ExitStack, contextmanager
+
+from asgiref.sync import (
+    iscoroutinefunction,
+    markcoroutinefunction,
+    sync_to_async,
+)
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+from metrics import registry
+from metrics.queries import (
+    DuplicateQueryError,
+    format_duplicates,
+    record_queries,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+class QueryTimer:
+    """Database execute wrapper counting and timing queries."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+
+
+@contextmanager
+def wrap_connections(wrapper):
+    """Install ``wrapper`` on every database connection of this thread."""
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(wrapper))
+        yield
+
+
+async def enter_in_sync_thread(stack, context_manager):
+    """
+    Enter ``context_manager`` in the thread that runs the database
+    queries of an async request, exiting it with ``stack``.
+    """
+    return await sync_to_async(stack.enter_context)(context_manager)
+
+
+class MetricsMiddleware:
+    """
+    Record wall time, database queries and query time, render time and
+    response size of every request, keyed by the resolved URL name.
+
+    The middleware removes itself from the chain unless
+    ``METRICS_ENABLED`` is set, so it costs nothing when disabled.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'METRICS_ENABLED', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        queries = QueryTimer()
+        start = time.perf_counter()
+        with wrap_connections(queries):
+            response = self.get_response(request)
+        self.record(request, response, queries, time.perf_counter() - start)
+        return response
+
+    async def __acall__(self, request):
+        queries = QueryTimer()
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            await enter_in_sync_thread(stack, wrap_connections(queries))
+            response = await self.get_response(request)
+        self.record(request, response, queries, time.perf_counter() - start)
+        return response
+
+    def record(self, request, response, queries, duration):
+        match = request.resolver_match
+        view = (match.url_name if match else None) or 'unresolved'
+        method = request.method
+        registry.requests_total.inc(view, method, response.status_code)
+        registry.request_duration.observe(duration, view, method)
+        registry.db_queries.observe(queries.count, view, method)
+        registry.db_duration.observe(queries.duration, view, method)
+        render = getattr(request, '_metrics_render_duration', None)
+        if render is not None:
+            registry.render_duration.observe(render, view, method)
+        if not response.streaming:
+            registry.response_size.observe(
+                len(response.content), view, method
+            )
+
+    def process_template_response(self, request, response):
+        start = time.perf_counter()
+
+        def rendered(response):
+            request._metrics_render_duration = time.perf_counter() - start
+
+        response.add_post_render_callback(rendered)
+        return response
+
+
+class DuplicateQueryMiddleware:
+    """
+    Report requests that run the same query shape repeatedly.
+
+    ``DUPLICATE_QUERY_DETECTION`` set to ``'warn'`` logs a warning and
+    ``'raise'`` raises DuplicateQueryError; otherwise the middleware
+    removes itself from the chain.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.mode = getattr(settings, 'DUPLICATE_QUERY_DETECTION', '')
+        if self.mode not in ('warn', 'raise'):
+            raise MiddlewareNotUsed
+        self.threshold = getattr(settings, 'DUPLICATE_QUERY_THRESHOLD', 2)
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with record_queries() as recorder:
+            response = self.get_response(request)
+        self.report(request, recorder)
+        return response
+
+    async def __acall__(self, request):
+        with ExitStack() as stack:
+            recorder = await enter_in_sync_thread(stack, record_queries())
+            response = await self.get_response(request)
+        self.report(request, recorder)
+        return response
+
+    def report(self, request, recorder):
+        duplicates = recorder.duplicates(self.threshold)
+        if duplicates:
+            message = f'{request.method} {request.path}: ' + (
+                format_duplicates(duplicates)
+            )
+            if self.mode == 'raise':
+                raise DuplicateQueryError(message)
+            logger.warning(message)
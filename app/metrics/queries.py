@@ -0,0 +1,86 @@
+"""
+Detection of repeated query shapes, the signature of N+1 queries.
+"""
+import re
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+
+from django.db import connections
+
+
+STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+NUMBER_LITERAL = re.compile(r'\b\d+(?:\.\d+)?\b')
+PLACEHOLDER_LIST = re.compile(r'\((?:\s*\?\s*,)*\s*\?\s*\)')
+PLACEHOLDER = re.compile(r'%s|\?')
+WHITESPACE = re.compile(r'\s+')
+
+
+def fingerprint(sql):
+    """
+    Reduce ``sql`` to its shape: literals and placeholders become ``?``
+    and ``IN`` lists of any length collapse to ``(?)``.
+    """
+    sql = STRING_LITERAL.sub('?', sql)
+    sql = NUMBER_LITERAL.sub('?', sql)
+    sql = PLACEHOLDER.sub('?', sql)
+    sql = PLACEHOLDER_LIST.sub('(?)', sql)
+    return WHITESPACE.sub(' ', sql).strip()
+
+
+class DuplicateQueryError(AssertionError):
+    """Raised when a query shape runs more often than allowed."""
+
+
+class QueryRecorder:
+    """Database execute wrapper counting queries by fingerprint."""
+
+    def __init__(self):
+        self.fingerprints = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        self.fingerprints[fingerprint(sql)] += 1
+        return execute(sql, params, many, context)
+
+    def duplicates(self, threshold=2):
+        """Return ``{fingerprint: count}`` for shapes run ``threshold``+."""
+        return {
+            shape: count
+            for shape, count in self.fingerprints.items()
+            if count >= threshold
+        }
+
+
+def format_duplicates(duplicates):
+    lines = [f'{len(duplicates)} query shape(s) executed repeatedly:']
+    for shape, count in sorted(duplicates.items(), key=lambda i: -i[1]):
+        lines.append(f'{count}x {shape}')
+    return '\n'.join(lines)
+
+
+@contextmanager
+def record_queries(using=None):
+    """
+    Record the queries run on ``using``, or on every connection, in the
+    block and yield the QueryRecorder.
+    """
+    recorder = QueryRecorder()
+    aliases = [using] if using else list(connections)
+    with ExitStack() as stack:
+        for alias in aliases:
+            stack.enter_context(
+                connections[alias].execute_wrapper(recorder)
+            )
+        yield recorder
+
+
+@contextmanager
+def detect_duplicate_queries(threshold=2, using=None):
+    """
+    Raise DuplicateQueryError if any query shape runs at least
+    ``threshold`` times in the block.
+    """
+    with record_queries(using) as recorder:
+        yield recorder
+    duplicates = recorder.duplicates(threshold)
+    if duplicates:
+        raise DuplicateQueryError(format_duplicates(duplicates))
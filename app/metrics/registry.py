@@ -0,0 +1,170 @@
+"""
+In-process metric registry rendered in the Prometheus text format.
+"""
+import bisect
+import threading
+from collections import defaultdict
+
+
+DURATION_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10,
+)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+
+class Histogram:
+    """A Prometheus style histogram with one series per label set."""
+
+    def __init__(self, name, documentation, buckets, labels):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = tuple(buckets)
+        self.labels = tuple(labels)
+        self._series = defaultdict(self._new_series)
+        self._lock = threading.Lock()
+
+    def _new_series(self):
+        # Per-bucket counts followed by the +Inf count, plus the sum.
+        return [[0] * (len(self.buckets) + 1), 0.0]
+
+    def observe(self, value, *label_values):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series[label_values]
+            series[0][index] += 1
+            series[1] += value
+
+    def clear(self):
+        with self._lock:
+            self._series.clear()
+
+    def render(self):
+        lines = [
+            f'# HELP {self.name} {self.documentation}',
+            f'# TYPE {self.name} histogram',
+        ]
+        with self._lock:
+            series = sorted(
+                (labels, list(counts), total)
+                for labels, (counts, total) in self._series.items()
+            )
+        for label_values, counts, total in series:
+            labels = ','.join(
+                f'{name}="{_escape(value)}"'
+                for name, value in zip(self.labels, label_values)
+            )
+            cumulative = 0
+            for bound, count in zip(self.buckets + ('+Inf',), counts):
+                cumulative += count
+                separator = ',' if labels else ''
+                lines.append(
+                    f'{self.name}_bucket{{{labels}{separator}le="{bound}"}} '
+                    f'{cumulative}'
+                )
+            lines.append(f'{self.name}_sum{{{labels}}} {total}')
+            lines.append(f'{self.name}_count{{{labels}}} {cumulative}')
+        return '\n'.join(lines)
+
+
+class Counter:
+    """A Prometheus style counter with one value per label set."""
+
+    def __init__(self, name, documentation, labels):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self._values = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values, amount=1):
+        with self._lock:
+            self._values[label_values] += amount
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+
+    def render(self):
+        lines = [
+            f'# HELP {self.name} {self.documentation}',
+            f'# TYPE {self.name} counter',
+        ]
+        with self._lock:
+            values = sorted(self._values.items())
+        for label_values, value in values:
+            labels = ','.join(
+                f'{name}="{_escape(value)}"'
+                for name, value in zip(self.labels, label_values)
+            )
+            lines.append(f'{self.name}{{{labels}}} {value}')
+        return '\n'.join(lines)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace(
+        '\n', '\\n'
+    )
+
+
+VIEW_LABELS = ('view', 'method')
+
+requests_total = Counter(
+    'http_requests_total',
+    'Requests by resolved URL name, method and status.',
+    ('view', 'method', 'status'),
+)
+request_duration = Histogram(
+    'http_request_duration_seconds',
+    'Wall time spent handling requests.',
+    DURATION_BUCKETS,
+    VIEW_LABELS,
+)
+db_queries = Histogram(
+    'http_request_db_queries',
+    'Database queries executed per request.',
+    QUERY_BUCKETS,
+    VIEW_LABELS,
+)
+db_duration = Histogram(
+    'http_request_db_duration_seconds',
+    'Time spent executing database queries per request.',
+    DURATION_BUCKETS,
+    VIEW_LABELS,
+)
+render_duration = Histogram(
+    'http_response_render_seconds',
+    'Time spent rendering response data to bytes.',
+    DURATION_BUCKETS,
+    VIEW_LABELS,
+)
+response_size = Histogram(
+    'http_response_size_bytes',
+    'Size of response bodies.',
+    SIZE_BUCKETS,
+    VIEW_LABELS,
+)
+
+METRICS = [
+    requests_total,
+    request_duration,
+    db_queries,
+    db_duration,
+    render_duration,
+    response_size,
+]
+
+# Callables returning extra exposition text, registered by other apps.
+collectors = []
+
+
+def render():
+    """Return every metric in the Prometheus text exposition format."""
+    parts = [metric.render() for metric in METRICS]
+    parts.extend(collector() for collector in collectors)
+    return '\n'.join(parts) + '\n'
+
+
+def clear():
+    for metric in METRICS:
+        metric.clear()
@@ -0,0 +1,15 @@
+"""
+Test helpers for query pattern assertions.
+"""
+from metrics.queries import detect_duplicate_queries
+
+
+class QueryPatternAssertionsMixin:
+    """TestCase mixin failing tests that repeat a query shape."""
+
+    def assertNoDuplicateQueries(self, threshold=2, using=None):
+        """
+        Context manager failing the test if any query shape runs at
+        least ``threshold`` times in the block.
+        """
+        return detect_duplicate_queries(threshold, using)
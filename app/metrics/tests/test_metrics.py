@@ -0,0 +1,180 @@
+"""
+Tests for the request metrics middleware and endpoint.
+"""
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+from metrics import registry
+from resume.models import Skill
+
+
+METRICS_URL = reverse('metrics')
+
+
+def create_user(email='user@example.com', password='testpass123'):
+    """Create and return a user."""
+    return get_user_model().objects.create_user(email, password)
+
+
+def sample(text, line):
+    """Return the value of the exposition line starting with ``line``."""
+    for row in text.splitlines():
+        if row.startswith(line + ' '):
+            return float(row.rsplit(' ', 1)[1])
+    raise AssertionError(f'{line} not found in metrics')
+
+
+@override_settings(METRICS_ENABLED=True, METRICS_TOKEN='scraper')
+class MetricsMiddlewareTests(TestCase):
+
+    def setUp(self):
+        registry.clear()
+        self.client = APIClient(HTTP_AUTHORIZATION='Bearer scraper')
+        self.user = create_user()
+        Skill.objects.create(user=self.user, title='Python')
+        self.client.force_authenticate(user=self.user)
+        token = Token.objects.create(user=self.user)
+        self.headers = {'Authorization': f'Token {token.key}'}
+
+    def test_records_per_view_metrics(self):
+        """Test requests are recorded under their resolved URL name."""
+        self.client.get(reverse('resume:skill-list'))
+        self.client.get(reverse('resume:skill-list'))
+
+        res = self.client.get(METRICS_URL)
+        text = res.content.decode()
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertTrue(res['Content-Type'].startswith('text/plain'))
+        labels = 'view="skill-list",method="GET"'
+        self.assertEqual(
+            sample(text, f'http_requests_total{{{labels},status="200"}}'), 2
+        )
+        self.assertEqual(
+            sample(text, f'http_request_duration_seconds_count{{{labels}}}'),
+            2,
+        )
+        self.assertEqual(
+            sample(text, f'http_response_render_seconds_count{{{labels}}}'),
+            2,
+        )
+        self.assertGreater(
+            sample(text, f'http_response_size_bytes_sum{{{labels}}}'), 0
+        )
+
+    def test_counts_database_queries(self):
+        """Test the query histogram matches the queries executed."""
+        with self.assertNumQueries(2):
+            self.client.get(reverse('resume:skill-list'))
+
+        text = self.client.get(METRICS_URL).content.decode()
+
+        labels = 'view="skill-list",method="GET"'
+        self.assertEqual(
+            sample(text, f'http_request_db_queries_sum{{{labels}}}'), 2
+        )
+        self.assertEqual(
+            sample(text, f'http_request_db_queries_bucket{{{labels},le="1"}}'),
+            0,
+        )
+        self.assertEqual(
+            sample(text, f'http_request_db_queries_bucket{{{labels},le="2"}}'),
+            1,
+        )
+
+    async def test_async_view_measured(self):
+        """Test async views are measured, their queries included."""
+        url = reverse('resume:async-section-list', args=['skills'])
+
+        res = await self.async_client.get(url, headers=self.headers)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        labels = 'view="async-section-list",method="GET"'
+        self.assertGreater(
+            sample(
+                registry.render(), f'http_request_db_queries_sum{{{labels}}}'
+            ),
+            0,
+        )
+
+    def test_unresolved_requests(self):
+        """Test requests without a URL match share one series."""
+        self.client.get('/does-not-exist/')
+
+        text = self.client.get(METRICS_URL).content.decode()
+
+        self.assertIn('view="unresolved",method="GET",status="404"', text)
+
+    def test_exposes_resume_cache_counters(self):
+        """Test the resume cache counters are part of the exposition."""
+        text = self.client.get(METRICS_URL).content.decode()
+
+        self.assertIn('resume_cache_requests_total{result="hits"}', text)
+
+
+@override_settings(METRICS_ENABLED=True, METRICS_TOKEN='scraper')
+class MetricsAccessTests(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_anonymous_rejected(self):
+        """Test the metrics are not served without credentials."""
+        res = self.client.get(METRICS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(res['WWW-Authenticate'], 'Bearer realm="metrics"')
+
+    def test_wrong_token_rejected(self):
+        """Test another bearer token is rejected."""
+        res = self.client.get(
+            METRICS_URL, HTTP_AUTHORIZATION='Bearer guess'
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    @override_settings(METRICS_TOKEN='')
+    def test_no_token_configured(self):
+        """Test an empty token setting accepts no bearer token."""
+        res = self.client.get(METRICS_URL, HTTP_AUTHORIZATION='Bearer ')
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_users_rejected(self):
+        """Test logged in users who are not staff are rejected."""
+        self.client.force_login(create_user())
+
+        res = self.client.get(METRICS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_staff_allowed(self):
+        """Test staff read the metrics from their session."""
+        user = create_user()
+        user.is_staff = True
+        user.save()
+        self.client.force_login(user)
+
+        res = self.client.get(METRICS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+
+class MetricsDisabledTests(TestCase):
+
+    def setUp(self):
+        registry.clear()
+        self.client = APIClient()
+
+    def test_nothing_recorded_when_disabled(self):
+        """Test the middleware is skipped and the endpoint is hidden."""
+        self.client.get(reverse('accounts:register'))
+
+        res = self.client.get(METRICS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertNotIn('view=', registry.render())
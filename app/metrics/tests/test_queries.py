@@ -0,0 +1,122 @@
+"""
+Tests for the duplicate query detector.
+"""
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+from metrics.queries import (
+    DuplicateQueryError,
+    detect_duplicate_queries,
+    fingerprint,
+)
+from metrics.testing import QueryPatternAssertionsMixin
+from resume.models import Skill
+
+
+def create_user(email='user@example.com', password='testpass123'):
+    """Create and return a user."""
+    return get_user_model().objects.create_user(email, password)
+
+
+class FingerprintTests(TestCase):
+
+    def test_literals_are_normalized(self):
+        """Test statements differing only in values share a fingerprint."""
+        self.assertEqual(
+            fingerprint("SELECT * FROM t WHERE id = 1 AND name = 'a''b'"),
+            fingerprint('SELECT *  FROM t\nWHERE id = 42 AND name = %s'),
+        )
+
+    def test_in_lists_are_collapsed(self):
+        """Test IN lists of different lengths share a fingerprint."""
+        self.assertEqual(
+            fingerprint('SELECT * FROM t WHERE id IN (%s, %s, %s)'),
+            fingerprint('SELECT * FROM t WHERE id IN (%s)'),
+        )
+
+    def test_identifiers_are_kept(self):
+        """Test digits inside identifiers are not treated as literals."""
+        self.assertIn('U0', fingerprint('SELECT U0."id" FROM t U0'))
+
+
+class DuplicateQueryDetectionTests(QueryPatternAssertionsMixin, TestCase):
+
+    def setUp(self):
+        self.user = create_user()
+        for title in ['Python', 'Django', 'SQL']:
+            Skill.objects.create(user=self.user, title=title)
+
+    def test_n_plus_one_fails(self):
+        """Test a query per row is reported with its count."""
+        with self.assertRaises(DuplicateQueryError) as cm:
+            with self.assertNoDuplicateQueries():
+                for skill in Skill.objects.all():
+                    skill.user.email
+
+        self.assertIn('3x SELECT', str(cm.exception))
+
+    def test_related_loading_passes(self):
+        """Test loading the relation up front is accepted."""
+        with self.assertNoDuplicateQueries():
+            for skill in Skill.objects.select_related('user'):
+                skill.user.email
+
+    def test_threshold(self):
+        """Test shapes below the threshold are accepted."""
+        with detect_duplicate_queries(threshold=4) as recorder:
+            for skill in Skill.objects.all():
+                skill.user.email
+
+        self.assertEqual(max(recorder.fingerprints.values()), 3)
+
+
+class DuplicateQueryMiddlewareTests(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        user = create_user()
+        self.client.force_authenticate(user=user)
+        token = Token.objects.create(user=user)
+        self.headers = {'Authorization': f'Token {token.key}'}
+
+    @override_settings(DUPLICATE_QUERY_DETECTION='raise')
+    def test_raise_mode_passes_clean_requests(self):
+        """Test requests without repeated queries are unaffected."""
+        res = self.client.get(reverse('resume:skill-list'))
+
+        self.assertEqual(res.status_code, 200)
+
+    @override_settings(
+        DUPLICATE_QUERY_DETECTION='warn', DUPLICATE_QUERY_THRESHOLD=1
+    )
+    def test_warn_mode_logs(self):
+        """Test repeated shapes are logged in warn mode."""
+        with self.assertLogs('metrics.middleware', 'WARNING') as logs:
+            res = self.client.get(reverse('resume:skill-list'))
+
+        self.assertEqual(res.status_code, 200)
+        self.assertIn('/resume/skills/', logs.output[0])
+
+    @override_settings(
+        DUPLICATE_QUERY_DETECTION='raise', DUPLICATE_QUERY_THRESHOLD=1
+    )
+    def test_raise_mode_raises(self):
+        """Test repeated shapes raise in raise mode."""
+        with self.assertRaises(DuplicateQueryError):
+            self.client.get(reverse('resume:skill-list'))
+
+    @override_settings(
+        DUPLICATE_QUERY_DETECTION='warn', DUPLICATE_QUERY_THRESHOLD=1
+    )
+    async def test_async_requests_checked(self):
+        """Test the queries of async views are recorded."""
+        url = reverse('resume:async-section-list', args=['skills'])
+
+        with self.assertLogs('metrics.middleware', 'WARNING') as logs:
+            res = await self.async_client.get(url, headers=self.headers)
+
+        self.assertEqual(res.status_code, 200)
+        self.assertIn('/resume/async/skills/', logs.output[0])
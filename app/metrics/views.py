@@ -0,0 +1,35 @@
+"""
+Views exposing the collected metrics.
+"""
+from django.conf import settings
+from django.http import Http404, HttpResponse
+from django.utils.crypto import constant_time_compare
+
+from metrics import registry
+
+
+def has_metrics_token(request):
+    """Whether the request sends ``METRICS_TOKEN`` as a bearer token."""
+    token = getattr(settings, 'METRICS_TOKEN', '')
+    scheme, _, value = request.headers.get('Authorization', '').partition(
+        ' '
+    )
+    return bool(token) and scheme.lower() == 'bearer' and (
+        constant_time_compare(value, token)
+    )
+
+
+def metrics_view(request):
+    """
+    Return the metrics in the Prometheus text format, to staff or to
+    scrapers sending the metrics token.
+    """
+    if not getattr(settings, 'METRICS_ENABLED', False):
+        raise Http404
+    if not (request.user.is_staff or has_metrics_token(request)):
+        response = HttpResponse(status=401)
+        response['WWW-Authenticate'] = 'Bearer realm="metrics"'
+        return response
+    return HttpResponse(
+        registry.render(), content_type='text/plain; version=0.0.4'
+    )
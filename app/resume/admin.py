@@ -4,6 +4,8 @@ from resume import models
 # Register your models here.
 
 admin.site.register(models.Skill)
+admin.site.register(models.CanonicalSkill)
+admin.site.register(models.SkillAlias)
 admin.site.register(models.Education)
 admin.site.register(models.Certificate)
 admin.site.register(models.Experience)
@@ -0,0 +1,120 @@
+"""
+Async views for the read-only resume APIs.
+
+These serve the same representations as the DRF views from native
+coroutines, so under an ASGI server a request waiting on the database
+does not hold a worker thread. DRF views are sync only, hence plain
+Django views built on the fast read path.
+"""
+import math
+from functools import wraps
+
+from django.http import HttpResponse, HttpResponseNotAllowed
+from rest_framework import exceptions
+from rest_framework.request import Request
+
+from accounts.authentication import CachedTokenAuthentication
+from accounts.throttling import BucketThrottle
+from resume.api import serializers
+from resume.api.fast import (
+    RESUME_SECTION_SERIALIZERS,
+    aresume_document,
+    get_row_serializer,
+)
+from resume.api.pagination import KeysetPagination
+from resume.api.renderers import FastJSONRenderer
+
+
+SECTIONS = ('skills', 'educations', 'certificates', 'experiences')
+
+
+def json_response(data, status=200, headers=None):
+    return HttpResponse(
+        FastJSONRenderer().render(data),
+        status=status,
+        headers=headers,
+        content_type='application/json',
+    )
+
+
+def error_response(exc):
+    headers = None
+    if isinstance(exc, exceptions.NotAuthenticated):
+        headers = {'WWW-Authenticate': CachedTokenAuthentication.keyword}
+    if isinstance(exc, exceptions.Throttled) and exc.wait is not None:
+        headers = {'Retry-After': str(math.ceil(exc.wait))}
+    detail = exc.detail
+    if not isinstance(detail, (dict, list)):
+        detail = {'detail': detail}
+    return json_response(detail, status=exc.status_code, headers=headers)
+
+
+def async_api_view(view):
+    """
+    Wrap an async GET view taking ``(request, user, ...)``: the request
+    is token authenticated and throttled, and API exceptions become JSON
+    responses.
+    """
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        if request.method != 'GET':
+            return HttpResponseNotAllowed(['GET'])
+        request = Request(request)
+        try:
+            credentials = await CachedTokenAuthentication().aauthenticate(
+                request
+            )
+            if credentials is None:
+                raise exceptions.NotAuthenticated()
+            throttle = BucketThrottle()
+            if not await throttle.aallow_request(request, credentials[0]):
+                raise exceptions.Throttled(throttle.wait())
+            return await view(request, credentials[0], *args, **kwargs)
+        except exceptions.APIException as exc:
+            return error_response(exc)
+    return wrapper
+
+
+def get_section(section):
+    if section not in SECTIONS:
+        raise exceptions.NotFound()
+    model, serializer_class = RESUME_SECTION_SERIALIZERS[section]
+    return model, get_row_serializer(serializer_class)
+
+
+@async_api_view
+async def resume_view(request, user):
+    """Return the authenticated user's resume, see ResumeAPIView."""
+    sections, section_fields = serializers.parse_resume_selection(
+        request.query_params
+    )
+    return json_response(
+        await aresume_document(user, sections, section_fields)
+    )
+
+
+@async_api_view
+async def section_list_view(request, user, section):
+    """List a resume section, optionally with keyset pagination."""
+    model, rows = get_section(section)
+    queryset = rows.values(model.objects.filter(user=user.pk))
+
+    paginator = KeysetPagination()
+    page = await paginator.apaginate_queryset(queryset, request)
+    if page is not None:
+        return json_response({
+            'next': paginator.get_next_link(),
+            'results': rows.many(page),
+        })
+    return json_response(rows.many([row async for row in queryset]))
+
+
+@async_api_view
+async def section_detail_view(request, user, section, pk):
+    """Return one row of a resume section."""
+    model, rows = get_section(section)
+    queryset = model.objects.filter(user=user.pk, pk=pk)
+    row = await rows.values(queryset).afirst()
+    if row is None:
+        raise exceptions.NotFound()
+    return json_response(rows.to_representation(row))
@@ -0,0 +1,175 @@
+"""
+Fast read path for the resume APIs.
+
+Rows are read with ``.values()`` and turned into the exact
+representation of the matching serializer without instantiating models
+or running DRF's per-field machinery.
+"""
+import asyncio
+from functools import lru_cache
+
+from rest_framework import serializers as drf_serializers
+from rest_framework.response import Response
+
+from accounts.models import Profile
+from resume.api import serializers
+from resume.models import (
+    Skill,
+    Education,
+    Certificate,
+    Experience
+)
+
+
+class RowSerializer:
+    """
+    Build a serializer's representation from ``.values()`` rows.
+
+    Only fields whose representation differs from the database value,
+    dates and datetimes, go through ``to_representation``.
+    """
+    converted_fields = (
+        drf_serializers.DateField,
+        drf_serializers.DateTimeField,
+    )
+
+    def __init__(self, serializer_class, fields=None):
+        self.columns = []
+        for name, field in serializer_class().fields.items():
+            if field.write_only or (fields is not None and name not in fields):
+                continue
+            convert = None
+            if isinstance(field, self.converted_fields):
+                convert = field.to_representation
+            lookup = field.source.replace('.', '__')
+            self.columns.append((name, lookup, convert))
+        self.lookups = [lookup for _, lookup, _ in self.columns]
+
+    def values(self, queryset):
+        return queryset.values(*self.lookups)
+
+    def to_representation(self, row):
+        data = {}
+        for name, lookup, convert in self.columns:
+            value = row[lookup]
+            if convert is not None and value is not None:
+                value = convert(value)
+            data[name] = value
+        return data
+
+    def many(self, rows):
+        return [self.to_representation(row) for row in rows]
+
+
+@lru_cache(maxsize=None)
+def get_row_serializer(serializer_class, fields=None):
+    """Return a cached RowSerializer, ``fields`` being a tuple or None."""
+    return RowSerializer(serializer_class, fields)
+
+
+RESUME_SECTION_SERIALIZERS = {
+    'profile': (Profile, serializers.ProfileSerializer),
+    'skills': (Skill, serializers.SkillSerializer),
+    'educations': (Education, serializers.EducationSerializer),
+    'certificates': (Certificate, serializers.CertificateSerializer),
+    'experiences': (Experience, serializers.ExperienceSerializer),
+}
+
+
+def resume_sections(sections=None, section_fields=None):
+    """
+    Yield ``(name, model, rows)`` for the requested resume sections in
+    ResumeSerializer field order, ``model`` and ``rows`` being None for
+    the email.
+    """
+    section_fields = section_fields or {}
+    for name in serializers.ResumeSerializer.Meta.fields:
+        if sections is not None and name not in sections:
+            continue
+        if name == 'email':
+            yield name, None, None
+            continue
+        model, serializer_class = RESUME_SECTION_SERIALIZERS[name]
+        fields = section_fields.get(name)
+        rows = get_row_serializer(
+            serializer_class, tuple(fields) if fields is not None else None
+        )
+        yield name, model, rows
+
+
+def resume_document(user, sections=None, section_fields=None):
+    """
+    Return the ResumeSerializer representation of a user's resume,
+    reading each requested section with one ``.values()`` query.
+    """
+    data = {}
+    for name, model, rows in resume_sections(sections, section_fields):
+        if model is None:
+            data[name] = user.email
+            continue
+        queryset = model.objects.filter(user=user.pk)
+        data[name] = rows.many(rows.values(queryset))
+    return data
+
+
+async def _section_rows(model, rows, user):
+    queryset = rows.values(model.objects.filter(user=user.pk))
+    return rows.many([row async for row in queryset])
+
+
+async def aresume_document(user, sections=None, section_fields=None):
+    """
+    Coroutine version of ``resume_document`` querying the sections
+    concurrently.
+    """
+    plan = list(resume_sections(sections, section_fields))
+    fetched = await asyncio.gather(*[
+        _section_rows(model, rows, user)
+        for _, model, rows in plan
+        if model is not None
+    ])
+    data = {}
+    results = iter(fetched)
+    for name, model, _ in plan:
+        data[name] = user.email if model is None else next(results)
+    return data
+
+
+class FastReadMixin:
+    """
+    Serve list and retrieve actions through the fast read path when
+    ``fast_read`` is set, producing the same output as the serializer.
+
+    Lists read ``.values()`` of ``get_queryset()``. Retrieves are only
+    fast when ``get_fast_object_data`` is overridden, as for the whole
+    resume; otherwise they, like every write, load the objects from
+    ``get_queryset()`` and go through the serializer.
+    """
+    fast_read = False
+
+    def get_row_serializer(self):
+        return get_row_serializer(self.get_serializer_class())
+
+    def get_fast_object_data(self):
+        """
+        Return the representation of the object being retrieved, or
+        None to fall back to the serializer.
+        """
+        return None
+
+    def list(self, request, *args, **kwargs):
+        if not self.fast_read:
+            return super().list(request, *args, **kwargs)
+
+        rows = self.get_row_serializer()
+        queryset = rows.values(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(rows.many(page))
+        return Response(rows.many(queryset))
+
+    def retrieve(self, request, *args, **kwargs):
+        data = self.get_fast_object_data() if self.fast_read else None
+        if data is None:
+            return super().retrieve(request, *args, **kwargs)
+        return Response(data)
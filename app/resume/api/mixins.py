@@ -0,0 +1,307 @@
+"""
+Mixins for the resume API views.
+"""
+import copy
+import hashlib
+
+from django.db import connections, transaction
+from django.http import HttpResponse
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
+from rest_framework import serializers, status
+from rest_framework.decorators import action
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+
+from app.routers import primary_reads
+from resume import cache
+from resume.signals import notify_resume_changed, sections_bulk_written
+
+
+class ConditionalGetMixin:
+    """
+    Answer conditional GET requests with 304 Not Modified.
+
+    Views implement ``get_condition_state()`` returning a tuple of values
+    that changes whenever their data does. It has to be much cheaper than
+    building the response, ideally a single aggregate query. Only an ETag
+    is sent: the last change of the remaining rows says nothing about
+    deleted ones, so a Last-Modified would turn stale after a delete.
+    """
+
+    def get_condition_state(self):
+        raise NotImplementedError(
+            '`get_condition_state()` must be implemented.'
+        )
+
+    def get_etag(self, state):
+        """Return an ETag for the state as seen through this request."""
+        request = self.request
+        source = repr((
+            request.user.pk,
+            request.get_full_path(),
+            request.accepted_media_type,
+            state,
+        ))
+        return hashlib.md5(source.encode()).hexdigest()
+
+    def conditional_response(self, handler, request, *args, **kwargs):
+        """Call handler unless the client's copy is still fresh."""
+        etag = quote_etag(self.get_etag(self.get_condition_state()))
+
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = handler(request, *args, **kwargs)
+
+        if response.status_code in (200, 304):
+            response['ETag'] = etag
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(
+            super().list, request, *args, **kwargs
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(
+            super().retrieve, request, *args, **kwargs
+        )
+
+
+class ResumeCacheMixin:
+    """
+    Serve the rendered JSON resume document from the resume cache,
+    rendering and storing it on a miss.
+
+    The validators set by ``ConditionalGetMixin`` are stored with the
+    document, so conditional requests that hit the cache need no query.
+    Documents are built from the primary: a lagging replica could return
+    a resume older than the version it would be cached under.
+    """
+    cached_headers = ('ETag',)
+
+    def get_cache_variant(self):
+        """Return a key part telling apart different renderings."""
+        return ''
+
+    def retrieve(self, request, *args, **kwargs):
+        renderer = request.accepted_renderer
+        if not (isinstance(renderer, JSONRenderer)
+                and request.accepted_media_type == renderer.media_type):
+            return super().retrieve(request, *args, **kwargs)
+
+        user_id = request.user.pk
+        variant = self.get_cache_variant()
+        version = cache.get_version(user_id)
+        document = cache.get_document(user_id, version, variant)
+        if document is not None:
+            content, headers = document
+            response = get_conditional_response(
+                request, etag=headers.get('ETag')
+            )
+            if response is None:
+                response = HttpResponse(
+                    content, content_type=renderer.media_type
+                )
+            for header, value in headers.items():
+                response[header] = value
+            response['X-Resume-Cache'] = 'HIT'
+            return response
+
+        def store(response):
+            headers = {
+                header: response[header]
+                for header in self.cached_headers if header in response
+            }
+            cache.set_document(
+                user_id, version, (response.content, headers), variant
+            )
+
+        with primary_reads():
+            response = super().retrieve(request, *args, **kwargs)
+        if response.status_code == 200:
+            response.add_post_render_callback(store)
+        response['X-Resume-Cache'] = 'MISS'
+        return response
+
+
+def delete_rows(model, pks, using):
+    """
+    Delete rows by primary key with a single DELETE, without the per-row
+    signals ``QuerySet.delete()`` sends while receivers are connected.
+    No model references the sections, so nothing cascades.
+    """
+    connection = connections[using]
+    quote = connection.ops.quote_name
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'DELETE FROM {quote(model._meta.db_table)} WHERE '
+            f'{quote(model._meta.pk.column)} IN '
+            f'({", ".join(["%s"] * len(pks))})',
+            list(pks),
+        )
+
+
+class BulkIdsSerializer(serializers.Serializer):
+    """Serializer for the primary keys of a batch delete."""
+    ids = serializers.ListField(
+        child=serializers.IntegerField(), allow_empty=False
+    )
+
+
+class BulkModelMixin:
+    """
+    Create, update and delete many of the user's rows in one request.
+
+    Items are validated with ``many=True`` serializers and written with
+    ``bulk_create``/``bulk_update``/a single delete in one transaction,
+    sending ``sections_bulk_written`` instead of the model signals.
+    Invalid items are reported by index while the valid ones are saved,
+    unless the client asks for ``?atomic=true``.
+    """
+    bulk_max_items = 1000
+
+    def is_atomic_batch(self):
+        return self.request.query_params.get('atomic') in ('1', 'true')
+
+    def get_bulk_serializer(self, data, instance=None):
+        return self.get_serializer(
+            instance,
+            data=data,
+            many=True,
+            partial=instance is not None,
+            max_length=self.bulk_max_items,
+        )
+
+    def validate_batch(self, data, instance=None):
+        """
+        Return the valid items as ``(index, validated_data)`` pairs
+        together with the errors of the invalid ones.
+        """
+        serializer = self.get_bulk_serializer(data, instance)
+        if serializer.is_valid():
+            return list(enumerate(serializer.validated_data)), []
+
+        if not isinstance(serializer.errors, list):
+            # The payload itself is malformed, not any single item.
+            raise serializers.ValidationError(serializer.errors)
+
+        errors = [
+            {'index': index, 'errors': item_errors}
+            for index, item_errors in enumerate(serializer.errors)
+            if item_errors
+        ]
+        indexes = [
+            index for index, item_errors in enumerate(serializer.errors)
+            if not item_errors
+        ]
+        if self.is_atomic_batch() or not indexes:
+            return [], errors
+
+        serializer = self.get_bulk_serializer(
+            [data[index] for index in indexes], instance
+        )
+        serializer.is_valid(raise_exception=True)
+        return list(zip(indexes, serializer.validated_data)), errors
+
+    def bulk_response(self, objs, errors, success_status):
+        if errors and (self.is_atomic_batch() or not objs):
+            return Response(
+                {'results': [], 'errors': errors},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        return Response(
+            {
+                'results': self.get_serializer(objs, many=True).data,
+                'errors': errors,
+            },
+            status=success_status,
+        )
+
+    @action(detail=False, methods=['post'], url_path='bulk', url_name='bulk')
+    def bulk_create(self, request, *args, **kwargs):
+        """Create a batch of rows for the authenticated user."""
+        valid, errors = self.validate_batch(request.data)
+        model = self.get_queryset().model
+
+        objs = [model(user=request.user, **attrs) for _, attrs in valid]
+        if objs:
+            with transaction.atomic():
+                objs = model.objects.bulk_create(objs)
+                sections_bulk_written.send(
+                    sender=model, objs=objs, previous=[]
+                )
+            notify_resume_changed(request.user.pk)
+
+        return self.bulk_response(objs, errors, status.HTTP_201_CREATED)
+
+    @bulk_create.mapping.patch
+    def bulk_update(self, request, *args, **kwargs):
+        """Partially update a batch of rows identified by ``id``."""
+        data = request.data
+        if not isinstance(data, list):
+            raise serializers.ValidationError(
+                {'non_field_errors': ['Expected a list of items.']}
+            )
+        ids = [item.get('id') for item in data if isinstance(item, dict)]
+        instances = self.get_queryset().in_bulk(
+            [pk for pk in ids if isinstance(pk, int)]
+        )
+        valid, errors = self.validate_batch(data, instances)
+
+        objs, previous = [], []
+        fields = {'updated_time'}
+        now = timezone.now()
+        for index, attrs in valid:
+            obj = instances[data[index]['id']]
+            previous.append(copy.copy(obj))
+            for field, value in attrs.items():
+                setattr(obj, field, value)
+            obj.updated_time = now
+            fields.update(attrs)
+            objs.append(obj)
+
+        if objs:
+            model = self.get_queryset().model
+            with transaction.atomic():
+                model.objects.bulk_update(objs, fields)
+                sections_bulk_written.send(
+                    sender=model, objs=objs, previous=previous
+                )
+            notify_resume_changed(request.user.pk)
+
+        return self.bulk_response(objs, errors, status.HTTP_200_OK)
+
+    @bulk_create.mapping.delete
+    def bulk_destroy(self, request, *args, **kwargs):
+        """Delete a batch of rows identified by their ids."""
+        serializer = BulkIdsSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        ids = serializer.validated_data['ids']
+
+        # The rows are locked so the signals report them as deleted.
+        queryset = self.get_queryset().filter(pk__in=ids).select_for_update()
+        model = queryset.model
+        with transaction.atomic(using=queryset.db):
+            previous = list(queryset)
+            found = {obj.pk for obj in previous}
+            errors = [
+                {'index': index, 'errors': {'id': ['Not found.']}}
+                for index, pk in enumerate(ids) if pk not in found
+            ]
+            if errors and self.is_atomic_batch():
+                return Response(
+                    {'deleted': 0, 'errors': errors},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            if previous:
+                delete_rows(model, found, queryset.db)
+                sections_bulk_written.send(
+                    sender=model, objs=[], previous=previous,
+                    using=queryset.db,
+                )
+        if previous:
+            notify_resume_changed(request.user.pk)
+
+        return Response({'deleted': len(found), 'errors': errors})
@@ -0,0 +1,179 @@
+"""
+Pagination for the resume APIs.
+"""
+import base64
+import binascii
+import datetime
+import json
+from functools import reduce
+from operator import or_
+
+from django.core.exceptions import ImproperlyConfigured, ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Forward cursor pagination keyed on the queryset ordering.
+
+    The ordering must end with a unique field such as ``id``. The cursor
+    holds the ordering values of the last row of a page, so fetching any
+    page is one range scan of the (user, ordering) index and page N costs
+    the same as page 1.
+
+    Pagination is opt-in to keep existing clients working: lists are only
+    paginated when the client sends ``page_size`` or ``cursor``. The page
+    size is capped at ``max_page_size``.
+    """
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    page_size = 50
+    max_page_size = 200
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        queryset = self.get_page_queryset(queryset, request)
+        if queryset is None:
+            return None
+        return self.set_page(list(queryset))
+
+    async def apaginate_queryset(self, queryset, request):
+        """Coroutine version of ``paginate_queryset`` for async views."""
+        queryset = self.get_page_queryset(queryset, request)
+        if queryset is None:
+            return None
+        return self.set_page([row async for row in queryset])
+
+    def get_page_queryset(self, queryset, request):
+        """
+        Return the unevaluated queryset of the requested page plus one
+        row, or None when the client did not ask for pagination.
+        """
+        params = request.query_params
+        if (self.cursor_query_param not in params
+                and self.page_size_query_param not in params):
+            return None
+
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.ordering = self.get_ordering(queryset)
+
+        position = self.decode_cursor(request, queryset.model)
+        if position is not None:
+            queryset = queryset.filter(self.after(position))
+        return queryset.order_by(*self.ordering)[:self.page_size + 1]
+
+    def set_page(self, rows):
+        self.has_next = len(rows) > self.page_size
+        self.page = rows[:self.page_size]
+        return self.page
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def get_ordering(self, queryset):
+        ordering = list(
+            queryset.query.order_by or queryset.model._meta.ordering
+        )
+        last = queryset.model._meta.get_field(ordering[-1].lstrip('-'))
+        if not (last.primary_key or last.unique):
+            raise ImproperlyConfigured(
+                f'{self.__class__.__name__} requires the ordering of '
+                f'{queryset.model.__name__} to end with a unique field.'
+            )
+        return ordering
+
+    def after(self, position):
+        """
+        Return the filter for rows that sort after ``position``, i.e.
+        the first differing ordering field is past the cursor.
+        """
+        clauses = []
+        for index, field in enumerate(self.ordering):
+            name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            equal = {
+                previous.lstrip('-'): position[i]
+                for i, previous in enumerate(self.ordering[:index])
+            }
+            clauses.append(
+                Q(**equal, **{f'{name}__{lookup}': position[index]})
+            )
+        # The redundant bound on the leading field lets the database
+        # start the index scan at the cursor.
+        leading = self.ordering[0]
+        lookup = 'lte' if leading.startswith('-') else 'gte'
+        bound = Q(**{f"{leading.lstrip('-')}__{lookup}": position[0]})
+        return bound & reduce(or_, clauses)
+
+    def encode_cursor(self, row):
+        values = []
+        for field in self.ordering:
+            name = field.lstrip('-')
+            value = row[name] if isinstance(row, dict) else getattr(row, name)
+            if isinstance(value, (datetime.date, datetime.datetime)):
+                value = value.isoformat()
+            values.append(value)
+        data = json.dumps(values, separators=(',', ':')).encode()
+        return base64.urlsafe_b64encode(data).decode()
+
+    def decode_cursor(self, request, model):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+        try:
+            values = json.loads(base64.urlsafe_b64decode(encoded.encode()))
+            if (not isinstance(values, list)
+                    or len(values) != len(self.ordering)):
+                raise ValueError
+            position = [
+                model._meta.get_field(field.lstrip('-')).to_python(value)
+                for field, value in zip(self.ordering, values)
+            ]
+            # The ordering fields are not nullable.
+            if None in position:
+                raise ValueError
+            return position
+        except (TypeError, ValueError, binascii.Error, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        url = replace_query_param(
+            url, self.page_size_query_param, self.page_size
+        )
+        return replace_query_param(
+            url, self.cursor_query_param, self.encode_cursor(self.page[-1])
+        )
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {
+                    'type': 'string',
+                    'nullable': True,
+                    'format': 'uri',
+                },
+                'results': schema,
+            },
+        }
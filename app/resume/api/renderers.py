@@ -0,0 +1,38 @@
+"""
+Renderers for the resume APIs.
+"""
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils import encoders
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSON renderer producing the same bytes as ``JSONRenderer`` with
+    orjson when it is installed.
+
+    Pretty printing, ASCII-only output and the non-compact style are
+    left to the standard renderer.
+    """
+    _default = encoders.JSONEncoder().default
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        if (orjson is None or data is None or indent is not None
+                or self.ensure_ascii or not self.compact):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Validation errors of list fields are keyed by index.
+        ret = orjson.dumps(
+            data, default=self._default, option=orjson.OPT_NON_STR_KEYS
+        )
+        # Match JSONRenderer, which escapes these to stay a JS subset.
+        return ret.replace(
+            b'\xe2\x80\xa8', b'\\u2028'
+        ).replace(
+            b'\xe2\x80\xa9', b'\\u2029'
+        )
@@ -1,6 +1,9 @@
 """
 Serializers for resume APIs.
 """
+import re
+from collections import Counter
+
 from django.contrib.auth import get_user_model
 from rest_framework import serializers
 from resume.models import (
@@ -12,6 +15,57 @@ from resume.models import (
 from accounts.api.serializers import ProfileSerializer
 
 
+class BulkListSerializer(serializers.ListSerializer):
+    """
+    List serializer for batch writes.
+
+    For updates ``instance`` is a mapping of primary key to object and
+    every item is validated against the object named by its ``id``,
+    which may appear once per batch.
+    """
+
+    def to_internal_value(self, data):
+        if isinstance(self.instance, dict) and isinstance(data, list):
+            ids = Counter(
+                item['id'] for item in data
+                if isinstance(item, dict) and isinstance(item.get('id'), int)
+            )
+            duplicates = sorted(pk for pk, count in ids.items() if count > 1)
+            if duplicates:
+                raise serializers.ValidationError({
+                    'non_field_errors': [
+                        'Duplicate ids: '
+                        f'{", ".join(str(pk) for pk in duplicates)}.'
+                    ]
+                })
+        return super().to_internal_value(data)
+
+    def run_child_validation(self, data):
+        if isinstance(self.instance, dict):
+            pk = data.get('id') if isinstance(data, dict) else None
+            instance = self.instance.get(pk)
+            if instance is None:
+                raise serializers.ValidationError({'id': ['Not found.']})
+            self.child.instance = instance
+            self.child.initial_data = data
+        return super().run_child_validation(data)
+
+
+def validate_date_range(serializer, data):
+    """
+    Validate the start date is before the end date, falling back to
+    the instance's dates on partial updates.
+    """
+    instance = serializer.instance
+    start_date = data.get('start_date', getattr(instance, 'start_date', None))
+    end_date = data.get('end_date', getattr(instance, 'end_date', None))
+
+    if start_date and end_date and start_date > end_date:
+        raise serializers.ValidationError(
+            "Start date must be before the end date."
+        )
+
+
 class SkillSerializer(serializers.ModelSerializer):
     """Serializer for skills."""
 
@@ -19,6 +73,15 @@ class SkillSerializer(serializers.ModelSerializer):
         model = Skill
         fields = ['id', 'user', 'title']
         read_only_fields = ['id', 'user']
+        list_serializer_class = BulkListSerializer
+
+
+class SkillAutocompleteSerializer(serializers.Serializer):
+    """Validate the query parameters of the skill autocomplete."""
+    q = serializers.CharField(max_length=255)
+    limit = serializers.IntegerField(
+        min_value=1, max_value=20, required=False, default=10
+    )
 
 
 class EducationSerializer(serializers.ModelSerializer):
@@ -35,19 +98,13 @@ class EducationSerializer(serializers.ModelSerializer):
             'end_date'
         ]
         read_only_fields = ['id', 'user']
+        list_serializer_class = BulkListSerializer
 
     def validate(self, data):
         """
         Validate end date
         """
-        start_date = data.get('start_date')
-        end_date = data.get('end_date')
-
-        if end_date and start_date > end_date:
-            raise serializers.ValidationError(
-                "Start date must be before the end date."
-            )
-
+        validate_date_range(self, data)
         return data
 
 
@@ -64,6 +121,7 @@ class CertificateSerializer(serializers.ModelSerializer):
             'issue_date'
         ]
         read_only_fields = ['id', 'user']
+        list_serializer_class = BulkListSerializer
 
 
 class ExperienceSerializer(serializers.ModelSerializer):
@@ -80,19 +138,13 @@ class ExperienceSerializer(serializers.ModelSerializer):
             'end_date'
         ]
         read_only_fields = ['id', 'user']
+        list_serializer_class = BulkListSerializer
 
     def validate(self, data):
         """
         Validate end date
         """
-        start_date = data.get('start_date')
-        end_date = data.get('end_date')
-
-        if end_date and start_date > end_date:
-            raise serializers.ValidationError(
-                "Start date must be before the end date."
-            )
-
+        validate_date_range(self, data)
         return data
 
 
@@ -115,3 +167,65 @@ class ResumeSerializer(serializers.ModelSerializer):
             'certificates',
             'experiences'
         ]
+
+    def __init__(self, *args, sections=None, section_fields=None, **kwargs):
+        """
+        Optionally keep only the given ``sections`` and, per section,
+        only the fields named in ``section_fields``.
+        """
+        super().__init__(*args, **kwargs)
+        if sections is not None:
+            for name in set(self.fields) - set(sections):
+                self.fields.pop(name)
+        for name, fields in (section_fields or {}).items():
+            if name not in self.fields:
+                continue
+            child = self.fields[name].child
+            for field in set(child.fields) - set(fields):
+                child.fields.pop(field)
+
+
+SECTION_FIELDS_PARAM = re.compile(r'^fields\[(\w+)\]$')
+
+
+def _split(value):
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+
+def parse_resume_selection(query_params):
+    """
+    Parse ``?sections=`` and ``?fields[<section>]=`` into the
+    ``sections`` and ``section_fields`` arguments of ResumeSerializer.
+    """
+    available = {
+        name: getattr(field, 'child', None)
+        for name, field in ResumeSerializer().fields.items()
+    }
+    errors = {}
+
+    sections = None
+    if 'sections' in query_params:
+        sections = _split(query_params['sections'])
+        unknown = [name for name in sections if name not in available]
+        if unknown:
+            errors['sections'] = [f'Unknown sections: {", ".join(unknown)}.']
+
+    section_fields = {}
+    for param in query_params:
+        match = SECTION_FIELDS_PARAM.match(param)
+        if not match:
+            continue
+        name = match.group(1)
+        if available.get(name) is None:
+            errors[param] = [f'Unknown section: {name}.']
+            continue
+        fields = _split(query_params[param])
+        unknown = [f for f in fields if f not in available[name].fields]
+        if unknown:
+            errors[param] = [f'Unknown fields: {", ".join(unknown)}.']
+            continue
+        section_fields[name] = fields
+
+    if errors:
+        raise serializers.ValidationError(errors)
+    return sections, section_fields
@@ -7,7 +7,7 @@ from django.urls import (
 )
 
 from rest_framework.routers import DefaultRouter
-from resume.api import views
+from resume.api import async_views, views
 
 
 router = DefaultRouter()
@@ -22,4 +22,30 @@ app_name = 'resume'
 urlpatterns = [
     path('', include(router.urls)),
     path('all', views.ResumeAPIView.as_view(), name='resume-retrieve'),
+    path('export', views.ResumeExportView.as_view(), name='resume-export'),
+    path(
+        'export/<int:job_id>',
+        views.ResumeExportView.as_view(),
+        name='resume-export-file',
+    ),
+    path(
+        'render.<str:file_format>',
+        views.ResumeRenderView.as_view(),
+        name='resume-render',
+    ),
+    path(
+        'async/all',
+        async_views.resume_view,
+        name='async-resume-retrieve',
+    ),
+    path(
+        'async/<str:section>/',
+        async_views.section_list_view,
+        name='async-section-list',
+    ),
+    path(
+        'async/<str:section>/<int:pk>/',
+        async_views.section_detail_view,
+        name='async-section-detail',
+    ),
 ]
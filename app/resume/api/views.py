@@ -1,13 +1,48 @@
 """
 Views for the resume APIs.
 """
+import hashlib
+import uuid
+
+from django.contrib.auth import get_user_model
+from django.core.files.storage import default_storage
+from django.db import router
+from django.db.models import (
+    Count,
+    Max,
+    OuterRef,
+    Prefetch,
+    Subquery,
+)
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils.cache import get_conditional_response
 from rest_framework import (
+    exceptions,
     viewsets,
     generics,
+    status,
 )
-from rest_framework.authentication import TokenAuthentication
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.decorators import action
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from accounts.authentication import CachedTokenAuthentication
+from accounts.models import Profile
+from jobs import queue
+from jobs.api.serializers import JobSerializer
+from jobs.models import Job
 from resume.api import serializers
+from resume.api.fast import FastReadMixin, resume_document
+from resume.api.mixins import (
+    BulkModelMixin,
+    ConditionalGetMixin,
+    ResumeCacheMixin,
+)
+from resume.api.pagination import KeysetPagination
+from resume import autocomplete, rendering
+from resume.export import export_lines
 from resume.models import (
     Skill,
     Education,
@@ -16,13 +51,47 @@ from resume.models import (
 )
 
 
-class SkillViewSet(viewsets.ModelViewSet):
+RESUME_SECTIONS = (
+    ('skills', Skill),
+    ('educations', Education),
+    ('certificates', Certificate),
+    ('experiences', Experience),
+)
+
+
+def section_state(queryset):
+    """Return the row count and last change of a section queryset."""
+    state = queryset.order_by().aggregate(
+        count=Count('pk'),
+        last_modified=Max('updated_time'),
+    )
+    return state['count'], state['last_modified']
+
+
+def _related_summary(model, modified_field):
+    """Subqueries counting a user's rows and their last change."""
+    rows = model.objects.filter(user=OuterRef('pk')).order_by()
+    rows = rows.values('user')
+    return (
+        Subquery(rows.annotate(count=Count('pk')).values('count')),
+        Subquery(rows.annotate(last=Max(modified_field)).values('last')),
+    )
+
+
+class SkillViewSet(
+    BulkModelMixin,
+    ConditionalGetMixin,
+    FastReadMixin,
+    viewsets.ModelViewSet,
+):
     """view for manage skill APIs."""
 
     serializer_class = serializers.SkillSerializer
     queryset = Skill.objects.all()
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
+    fast_read = True
 
     def get_queryset(self):
         """Retrieve the skills for the authenticated user"""
@@ -31,14 +100,40 @@ class SkillViewSet(viewsets.ModelViewSet):
     def perform_create(self, serializer):
         return serializer.save(user=self.request.user)
 
+    def get_condition_state(self):
+        return section_state(self.get_queryset())
 
-class EducationViewSet(viewsets.ModelViewSet):
+    @action(
+        detail=False,
+        methods=['get'],
+        url_path='autocomplete',
+        url_name='autocomplete',
+    )
+    def autocomplete(self, request, *args, **kwargs):
+        """Suggest canonical skill names starting with ``q``."""
+        params = serializers.SkillAutocompleteSerializer(
+            data=request.query_params
+        )
+        params.is_valid(raise_exception=True)
+        return Response(autocomplete.suggest(
+            params.validated_data['q'], params.validated_data['limit']
+        ))
+
+
+class EducationViewSet(
+    BulkModelMixin,
+    ConditionalGetMixin,
+    FastReadMixin,
+    viewsets.ModelViewSet,
+):
     """view for manage education APIs."""
 
     serializer_class = serializers.EducationSerializer
     queryset = Education.objects.all()
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
+    fast_read = True
 
     def get_queryset(self):
         """Retrieve the educations for the authenticated user"""
@@ -47,14 +142,24 @@ class EducationViewSet(viewsets.ModelViewSet):
     def perform_create(self, serializer):
         return serializer.save(user=self.request.user)
 
+    def get_condition_state(self):
+        return section_state(self.get_queryset())
+
 
-class CertificateViewSet(viewsets.ModelViewSet):
+class CertificateViewSet(
+    BulkModelMixin,
+    ConditionalGetMixin,
+    FastReadMixin,
+    viewsets.ModelViewSet,
+):
     """view for manage certificate APIs."""
 
     serializer_class = serializers.CertificateSerializer
     queryset = Certificate.objects.all()
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
+    fast_read = True
 
     def get_queryset(self):
         """Retrieve the certificates for the authenticated user"""
@@ -63,14 +168,24 @@ class CertificateViewSet(viewsets.ModelViewSet):
     def perform_create(self, serializer):
         return serializer.save(user=self.request.user)
 
+    def get_condition_state(self):
+        return section_state(self.get_queryset())
 
-class ExperienceViewSet(viewsets.ModelViewSet):
+
+class ExperienceViewSet(
+    BulkModelMixin,
+    ConditionalGetMixin,
+    FastReadMixin,
+    viewsets.ModelViewSet,
+):
     """view for manage experience APIs."""
 
     serializer_class = serializers.ExperienceSerializer
     queryset = Experience.objects.all()
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
+    fast_read = True
 
     def get_queryset(self):
         """Retrieve the experiences for the authenticated user"""
@@ -79,14 +194,194 @@ class ExperienceViewSet(viewsets.ModelViewSet):
     def perform_create(self, serializer):
         return serializer.save(user=self.request.user)
 
+    def get_condition_state(self):
+        return section_state(self.get_queryset())
+
 
-class ResumeAPIView(generics.RetrieveAPIView):
+class ResumeAPIView(
+    ResumeCacheMixin,
+    ConditionalGetMixin,
+    FastReadMixin,
+    generics.RetrieveAPIView,
+):
     """
     API view to retrieving all resume-related data for the authenticated user.
     """
     serializer_class = serializers.ResumeSerializer
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
+    fast_read = True
+
+    def get_selection(self):
+        """Return the sections and fields requested by the client."""
+        if not hasattr(self, '_selection'):
+            self._selection = serializers.parse_resume_selection(
+                self.request.query_params
+            )
+        return self._selection
+
+    def get_serializer(self, *args, **kwargs):
+        sections, section_fields = self.get_selection()
+        kwargs.setdefault('sections', sections)
+        kwargs.setdefault('section_fields', section_fields)
+        return super().get_serializer(*args, **kwargs)
+
+    def get_cache_variant(self):
+        sections, section_fields = self.get_selection()
+        if sections is None and not section_fields:
+            return ''
+        selection = repr((sections, sorted(section_fields.items())))
+        return hashlib.md5(selection.encode()).hexdigest()
+
+    def get_queryset(self):
+        """
+        Fetch the user with the requested resume sections prefetched,
+        one query per relation instead of one per row. Sections that
+        were not requested are not queried, and requested fields limit
+        the loaded columns.
+
+        Requests only use it with ``fast_read`` off, as
+        ``get_fast_object_data`` reads the resume without models; it is
+        the serializer path the fast one is checked against.
+        """
+        sections, section_fields = self.get_selection()
+        lookups = []
+        for relation, model in (('profile', Profile),) + RESUME_SECTIONS:
+            if sections is not None and relation not in sections:
+                continue
+            queryset = model.objects.order_by(*model._meta.ordering)
+            if relation in section_fields:
+                columns = [
+                    field.name for field in model._meta.concrete_fields
+                    if field.name in section_fields[relation]
+                ]
+                queryset = queryset.only('user', *columns)
+            lookups.append(Prefetch(relation, queryset=queryset))
+        # Prefetching the reverse relation also caches ``profile.user``,
+        # so ``ProfileSerializer.email`` needs no extra lookup.
+        return get_user_model().objects.only('email').prefetch_related(
+            *lookups
+        )
 
     def get_object(self):
-        return self.request.user
+        return get_object_or_404(self.get_queryset(), pk=self.request.user.pk)
+
+    def get_fast_object_data(self):
+        sections, section_fields = self.get_selection()
+        return resume_document(self.request.user, sections, section_fields)
+
+    def get_condition_state(self):
+        """
+        Summarize every resume table for the user in a single query.
+        """
+        summaries = {'profile': _related_summary(Profile, 'updated_date')}
+        for relation, model in RESUME_SECTIONS:
+            summaries[relation] = _related_summary(model, 'updated_time')
+
+        annotations = {}
+        for relation, (count, last) in summaries.items():
+            annotations[f'{relation}_count'] = count
+            annotations[f'{relation}_last'] = last
+        row = get_user_model().objects.filter(
+            pk=self.request.user.pk
+        ).values('email').annotate(**annotations).get()
+        return tuple(sorted(row.items()))
+
+
+class ResumeExportView(APIView):
+    """
+    API view streaming every user's resume as NDJSON, one line per
+    user, for staff. Accepts the same ``sections`` and ``fields[...]``
+    parameters as ResumeAPIView.
+
+    POST runs the export in a background job instead and answers with
+    the job; once it succeeded the file is served at ``export/<job id>``.
+    """
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [IsAdminUser]
+    chunk_size = 2000
+
+    def get(self, request, job_id=None, *args, **kwargs):
+        if job_id is not None:
+            job = get_object_or_404(
+                Job, pk=job_id, kind='resume.export', status=Job.SUCCEEDED
+            )
+            return FileResponse(
+                default_storage.open(job.result['file']),
+                as_attachment=True,
+                filename='resumes.ndjson',
+                content_type='application/x-ndjson',
+            )
+        sections, section_fields = serializers.parse_resume_selection(
+            request.query_params
+        )
+        # The lines are read while the response streams, after the
+        # request's replica pinning was reset, so pick the database now.
+        return StreamingHttpResponse(
+            export_lines(
+                sections,
+                section_fields,
+                using=router.db_for_read(Profile),
+                chunk_size=self.chunk_size,
+            ),
+            content_type='application/x-ndjson',
+            headers={
+                'Content-Disposition': 'attachment; filename="resumes.ndjson"',
+            },
+        )
+
+    def post(self, request, *args, **kwargs):
+        sections, section_fields = serializers.parse_resume_selection(
+            request.query_params
+        )
+        job = queue.enqueue('resume.export', {
+            'name': f'exports/resumes-{uuid.uuid4().hex}.ndjson',
+            'sections': sections,
+            'section_fields': section_fields,
+        }, user=request.user)
+        return Response(
+            JobSerializer(job, context={'request': request}).data,
+            status=status.HTTP_202_ACCEPTED,
+            headers={'Location': reverse('jobs:job-detail', args=[job.pk])},
+        )
+
+
+class ResumeRenderView(APIView):
+    """
+    API view rendering the authenticated user's resume as HTML or PDF.
+
+    Artifacts are cached by the hash of the resume data. A large resume
+    that is not cached yet is rendered in the background and answered
+    with 202 and ``Retry-After`` until it is ready.
+    """
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [IsAuthenticated]
+    retry_after = 2
+
+    def get(self, request, file_format, *args, **kwargs):
+        if file_format not in rendering.available_formats():
+            raise exceptions.NotFound()
+
+        document = resume_document(request.user)
+        digest = rendering.content_hash(document)
+        etag = f'"{rendering.LAYOUT_VERSION}-{digest}"'
+        response = get_conditional_response(request, etag=etag)
+        if response is not None:
+            return response
+
+        content = rendering.get_artifact(
+            document, file_format, request.user, digest=digest
+        )
+        if content is None:
+            return Response(
+                {'detail': 'The resume is being rendered, retry shortly.'},
+                status=status.HTTP_202_ACCEPTED,
+                headers={'Retry-After': str(self.retry_after)},
+            )
+        response = HttpResponse(
+            content, content_type=rendering.CONTENT_TYPES[file_format]
+        )
+        response['ETag'] = etag
+        if file_format == 'pdf':
+            response['Content-Disposition'] = 'inline; filename="resume.pdf"'
+        return response
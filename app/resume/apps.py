@@ -4,3 +4,9 @@ from django.apps import AppConfig
 class ResumeConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'resume'
+
+    def ready(self):
+        from resume import autocomplete, signals, cache, tasks  # noqa: F401
+        from metrics import registry
+
+        registry.collectors.append(cache.collect_metrics)
@@ -0,0 +1,206 @@
+"""
+Autocomplete over the canonical skills.
+
+Suggestions come from an in-memory trie of the most used canonical
+skills and their aliases. Every node keeps its best suggestions, so a
+lookup costs the length of the prefix whatever the number of skills.
+Usage is read from the ``skills`` rollup of the analytics app rather
+than counted over every skill row. The trie is rebuilt in the
+background every ``SKILL_AUTOCOMPLETE_TTL`` seconds, and in the request
+when skills are edited in this process. When the table holds more than
+``SKILL_AUTOCOMPLETE_CACHE_SIZE`` skills, prefixes with too few
+suggestions in the trie are completed from the database through the
+index on ``CanonicalSkill.key``.
+"""
+import threading
+import time
+
+from django.conf import settings
+from django.db import connections
+from django.db.models.signals import post_delete, post_save
+
+from resume.models import (
+    CanonicalSkill,
+    SkillAlias,
+    canonical_skills_created,
+    normalize_skill,
+)
+
+
+MAX_SUGGESTIONS = 20
+
+
+class _Node:
+    __slots__ = ('children', 'suggestions')
+
+    def __init__(self):
+        self.children = {}
+        self.suggestions = []
+
+
+class SkillTrie:
+    """
+    Prefix tree of skill keys, every node holding up to ``size``
+    ``(id, name)`` suggestions in the order the entries were added.
+    """
+
+    def __init__(self, entries, complete, size=MAX_SUGGESTIONS):
+        """
+        ``entries`` are ``(key, id, name)`` best first, and ``complete``
+        tells whether they cover every canonical skill.
+        """
+        self.root = _Node()
+        self.complete = complete
+        self.size = size
+        for key, skill_id, name in entries:
+            self.add(key, skill_id, name)
+
+    def _offer(self, node, suggestion):
+        if (len(node.suggestions) < self.size
+                and suggestion not in node.suggestions):
+            node.suggestions.append(suggestion)
+
+    def add(self, key, skill_id, name):
+        node = self.root
+        self._offer(node, (skill_id, name))
+        for char in key:
+            node = node.children.setdefault(char, _Node())
+            self._offer(node, (skill_id, name))
+
+    def lookup(self, prefix):
+        node = self.root
+        for char in prefix:
+            node = node.children.get(char)
+            if node is None:
+                return []
+        return node.suggestions
+
+
+def build_trie():
+    """
+    Build the trie from the most used canonical skills, as counted by
+    the ``skills`` rollup, completed with the unused ones by name.
+    """
+    # The analytics app depends on this one, not the other way round.
+    from analytics.models import Rollup
+
+    size = getattr(settings, 'SKILL_AUTOCOMPLETE_CACHE_SIZE', 50000)
+    used = [int(key) for key in Rollup.objects.filter(
+        metric='skills', year=0, count__gt=0
+    ).order_by('-count', 'key').values_list('key', flat=True)[:size]]
+    names = CanonicalSkill.objects.in_bulk(used)
+    skills = [
+        (skill_id, names[skill_id].key, names[skill_id].name)
+        for skill_id in used if skill_id in names
+    ]
+    if len(skills) < size:
+        seen = set(names)
+        skills.extend([
+            row for row in CanonicalSkill.objects.order_by(
+                'name'
+            ).values_list('pk', 'key', 'name')[:size]
+            if row[0] not in seen
+        ][:size - len(skills)])
+
+    aliases = {}
+    for key, skill_id in SkillAlias.objects.order_by().values_list(
+        'key', 'skill'
+    ):
+        aliases.setdefault(skill_id, []).append(key)
+
+    entries = []
+    for skill_id, key, name in skills:
+        entries.append((key, skill_id, name))
+        entries.extend(
+            (alias, skill_id, name) for alias in aliases.get(skill_id, [])
+        )
+    return SkillTrie(entries, complete=len(skills) < size)
+
+
+_lock = threading.Lock()
+# Held by the request building a missing trie, so others wait for it.
+_build_lock = threading.Lock()
+_trie = None
+_built_at = 0
+# Bumped on every invalidation, so a build that started before it is
+# not kept.
+_generation = 0
+_rebuilding = False
+
+
+def _rebuild(generation):
+    """Build a trie, keep it unless invalidated meanwhile, and return it."""
+    global _trie, _built_at
+    trie = build_trie()
+    with _lock:
+        if _generation == generation:
+            _trie, _built_at = trie, time.monotonic()
+    return trie
+
+
+def _rebuild_in_background(generation):
+    global _rebuilding
+    try:
+        _rebuild(generation)
+    finally:
+        with _lock:
+            _rebuilding = False
+        # The connections this thread opened.
+        connections.close_all()
+
+
+def get_trie():
+    """
+    Return the cached trie. Once older than the TTL it is rebuilt in a
+    background thread while the old one is still served; only a missing
+    trie is built in the request.
+    """
+    global _rebuilding
+    ttl = getattr(settings, 'SKILL_AUTOCOMPLETE_TTL', 300)
+    with _lock:
+        if _trie is not None:
+            if time.monotonic() - _built_at > ttl and not _rebuilding:
+                _rebuilding = True
+                threading.Thread(
+                    target=_rebuild_in_background,
+                    args=(_generation,),
+                    name='skill-trie',
+                    daemon=True,
+                ).start()
+            return _trie
+    with _build_lock:
+        with _lock:
+            if _trie is not None:
+                return _trie
+            generation = _generation
+        return _rebuild(generation)
+
+
+def invalidate(**kwargs):
+    global _trie, _generation
+    with _lock:
+        _trie = None
+        _generation += 1
+
+
+for model in (CanonicalSkill, SkillAlias):
+    post_save.connect(invalidate, sender=model)
+    post_delete.connect(invalidate, sender=model)
+canonical_skills_created.connect(invalidate)
+
+
+def suggest(query, limit=10):
+    """Return up to ``limit`` canonical skills starting with ``query``."""
+    prefix = normalize_skill(query)
+    trie = get_trie()
+    suggestions = trie.lookup(prefix)[:limit]
+    if len(suggestions) < limit and not trie.complete:
+        seen = [skill_id for skill_id, _ in suggestions]
+        suggestions = suggestions + list(CanonicalSkill.objects.filter(
+            key__startswith=prefix
+        ).exclude(pk__in=seen).order_by('key').values_list(
+            'pk', 'name'
+        )[:limit - len(suggestions)])
+    return [
+        {'id': skill_id, 'name': name} for skill_id, name in suggestions
+    ]
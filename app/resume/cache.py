@@ -0,0 +1,108 @@
+"""
+Versioned cache for the rendered resume document.
+
+Every user has a version number that is bumped whenever their resume
+changes. Rendered documents are stored under the version they were built
+from, so a stale document is never looked up again and simply expires.
+"""
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.dispatch import receiver
+
+from resume.signals import resume_changed
+
+
+VERSION_KEY = 'resume:version:{user_id}'
+DOCUMENT_KEY = 'resume:document:{user_id}:{version}:{variant}'
+
+_stats = {'hits': 0, 'misses': 0}
+_stats_lock = threading.Lock()
+
+
+def get_cache():
+    """Return the cache backend configured for resumes."""
+    return caches[getattr(settings, 'RESUME_CACHE_ALIAS', 'default')]
+
+
+def _new_version():
+    # Seeded from the clock so a version key that was evicted never comes
+    # back with a number an older document was stored under.
+    return time.time_ns()
+
+
+def get_version(user_id):
+    """Return the current resume version of a user."""
+    cache = get_cache()
+    key = VERSION_KEY.format(user_id=user_id)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, _new_version(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def bump_version(user_id):
+    """Invalidate every cached document of a user."""
+    cache = get_cache()
+    key = VERSION_KEY.format(user_id=user_id)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, _new_version(), timeout=None)
+
+
+def _record(stat):
+    with _stats_lock:
+        _stats[stat] += 1
+
+
+def get_document(user_id, version, variant=''):
+    """Return the cached document, or None on a miss."""
+    key = DOCUMENT_KEY.format(
+        user_id=user_id, version=version, variant=variant
+    )
+    document = get_cache().get(key)
+    _record('misses' if document is None else 'hits')
+    return document
+
+
+def set_document(user_id, version, document, variant=''):
+    """Store a rendered document for a resume version."""
+    key = DOCUMENT_KEY.format(
+        user_id=user_id, version=version, variant=variant
+    )
+    timeout = getattr(settings, 'RESUME_CACHE_TIMEOUT', 60 * 60)
+    get_cache().set(key, document, timeout=timeout)
+
+
+def stats():
+    """Return the hit and miss counters of this process."""
+    with _stats_lock:
+        return dict(_stats)
+
+
+def collect_metrics():
+    """Render the hit and miss counters in the Prometheus text format."""
+    lines = [
+        '# HELP resume_cache_requests_total Resume document cache lookups.',
+        '# TYPE resume_cache_requests_total counter',
+    ]
+    for result, value in sorted(stats().items()):
+        lines.append(
+            f'resume_cache_requests_total{{result="{result}"}} {value}'
+        )
+    return '\n'.join(lines)
+
+
+def reset_stats():
+    with _stats_lock:
+        for stat in _stats:
+            _stats[stat] = 0
+
+
+@receiver(resume_changed)
+def invalidate_resume(sender, user_id, **kwargs):
+    bump_version(user_id)
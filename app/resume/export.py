@@ -0,0 +1,88 @@
+"""
+Streaming export of every user's resume.
+
+Each section is read with one query over all users, ordered by user and
+then by the section's own ordering, and the section streams are merged
+with the user stream on the user id. The export therefore runs one query
+per section whatever the number of users, and holds at most
+``chunk_size`` rows per stream plus one user's resume in memory. On
+PostgreSQL ``.iterator()`` reads through server-side cursors unless
+``DISABLE_SERVER_SIDE_CURSORS`` is set.
+"""
+import itertools
+from operator import itemgetter
+
+from django.contrib.auth import get_user_model
+from django.db import router
+from django.db.models import F
+
+from accounts.models import Profile
+from resume.api.fast import resume_sections
+from resume.api.renderers import FastJSONRenderer
+
+
+# Alias of the user id in section rows, unlikely to clash with a field.
+USER_KEY = 'export_user_id'
+
+
+class SectionStream:
+    """The rows of one section for all users, consumed in user order."""
+
+    def __init__(self, queryset):
+        self.groups = itertools.groupby(queryset, key=itemgetter(USER_KEY))
+        self.current = next(self.groups, None)
+
+    def take(self, user_id):
+        """Return the rows of ``user_id``, skipping those of earlier ids."""
+        while self.current is not None and self.current[0] < user_id:
+            self.current = next(self.groups, None)
+        if self.current is None or self.current[0] != user_id:
+            return []
+        rows = list(self.current[1])
+        self.current = next(self.groups, None)
+        return rows
+
+
+def export_resumes(sections=None, section_fields=None, using=None,
+                   chunk_size=2000):
+    """
+    Yield the ResumeSerializer representation of every user's resume in
+    user id order. All queries use the same database, by default the
+    one the router picks for profile reads.
+    """
+    if using is None:
+        using = router.db_for_read(Profile)
+
+    streams = []
+    for name, model, rows in resume_sections(sections, section_fields):
+        if model is None:
+            streams.append((name, None, None))
+            continue
+        queryset = model.objects.using(using).order_by(
+            'user', *model._meta.ordering
+        )
+        queryset = rows.values(queryset).annotate(**{USER_KEY: F('user')})
+        streams.append((
+            name,
+            rows,
+            SectionStream(queryset.iterator(chunk_size=chunk_size)),
+        ))
+
+    users = get_user_model().objects.using(using).order_by('pk')
+    for user_id, email in users.values_list('pk', 'email').iterator(
+        chunk_size=chunk_size
+    ):
+        document = {}
+        for name, rows, stream in streams:
+            if stream is None:
+                document[name] = email
+            else:
+                document[name] = rows.many(stream.take(user_id))
+        yield document
+
+
+def export_lines(*args, **kwargs):
+    """Yield the resumes of ``export_resumes`` as NDJSON lines."""
+    renderer = FastJSONRenderer()
+    for document in export_resumes(*args, **kwargs):
+        yield renderer.render(document) + b'\n'
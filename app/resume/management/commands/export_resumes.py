@@ -0,0 +1,61 @@
+"""
+Django command to export every user's resume as NDJSON.
+"""
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from rest_framework.exceptions import ValidationError
+
+from resume.api import serializers
+from resume.export import export_lines
+
+
+class Command(BaseCommand):
+    """Stream all resumes, one JSON document per line."""
+    help = (
+        'Export the resume of every user as NDJSON with one query per '
+        'section, holding a bounded number of rows in memory.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--output', help='Write to this file instead of stdout.',
+        )
+        parser.add_argument(
+            '--sections',
+            help='Comma separated sections to export, default all.',
+        )
+        parser.add_argument('--chunk-size', type=int, default=2000)
+        parser.add_argument(
+            '--database',
+            help='Database to read from, default the one used for reads.',
+        )
+
+    def handle(self, *args, **options):
+        if options['chunk_size'] < 1:
+            raise CommandError('--chunk-size must be positive.')
+        if options['database'] and options['database'] not in connections:
+            raise CommandError(f"Unknown database {options['database']}.")
+        params = {}
+        if options['sections']:
+            params['sections'] = options['sections']
+        try:
+            sections, _ = serializers.parse_resume_selection(params)
+        except ValidationError as exc:
+            raise CommandError(exc.detail['sections'][0])
+
+        lines = export_lines(
+            sections,
+            using=options['database'],
+            chunk_size=options['chunk_size'],
+        )
+        count = 0
+        if options['output']:
+            with open(options['output'], 'wb') as f:
+                for line in lines:
+                    f.write(line)
+                    count += 1
+        else:
+            for line in lines:
+                self.stdout.write(line.decode(), ending='')
+                count += 1
+        self.stderr.write(f'Exported {count} resumes.')
@@ -0,0 +1,45 @@
+# Generated by Django 4.2.30 on 2026-10-18 10:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resume', '0005_experience'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='certificate',
+            options={'ordering': ('-issue_date', '-id')},
+        ),
+        migrations.AlterModelOptions(
+            name='education',
+            options={'ordering': ('start_date', 'id')},
+        ),
+        migrations.AlterModelOptions(
+            name='experience',
+            options={'ordering': ('-start_date', '-id')},
+        ),
+        migrations.AlterModelOptions(
+            name='skill',
+            options={'ordering': ('id',)},
+        ),
+        migrations.AddIndex(
+            model_name='certificate',
+            index=models.Index(fields=['user', '-issue_date', '-id'], name='certificate_user_issue_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='education',
+            index=models.Index(fields=['user', 'start_date', 'id'], name='education_user_start_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='experience',
+            index=models.Index(fields=['user', '-start_date', '-id'], name='experience_user_start_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='skill',
+            index=models.Index(fields=['user', 'id'], name='skill_user_id_idx'),
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 4.2.30 on 2026-10-18 11:21
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resume', '0006_section_user_ordering_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CanonicalSkill',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255)),
+                ('key', models.CharField(max_length=255, unique=True)),
+                ('created_time', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ('name',),
+            },
+        ),
+        migrations.CreateModel(
+            name='SkillAlias',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255)),
+                ('key', models.CharField(max_length=255, unique=True)),
+                ('skill', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='aliases', to='resume.canonicalskill')),
+            ],
+            options={
+                'verbose_name_plural': 'skill aliases',
+                'ordering': ('name',),
+            },
+        ),
+        migrations.AddField(
+            model_name='skill',
+            name='canonical',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.PROTECT, related_name='skills', to='resume.canonicalskill'),
+        ),
+    ]
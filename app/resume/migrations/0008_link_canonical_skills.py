@@ -0,0 +1,56 @@
+# Generated by Django 4.2.30 on 2026-10-18 11:22
+
+from django.db import migrations
+
+
+BATCH_SIZE = 2000
+
+
+def normalize(title):
+    return ' '.join(title.split()).casefold()
+
+
+def link_canonical_skills(apps, schema_editor):
+    """
+    Create a canonical skill per distinct normalized title and link the
+    skills to it, in batches of skills so memory stays bounded.
+    """
+    Skill = apps.get_model('resume', 'Skill')
+    CanonicalSkill = apps.get_model('resume', 'CanonicalSkill')
+    db = schema_editor.connection.alias
+
+    last = 0
+    while True:
+        skills = list(Skill.objects.using(db).filter(
+            pk__gt=last
+        ).order_by('pk').only('pk', 'title')[:BATCH_SIZE])
+        if not skills:
+            break
+        last = skills[-1].pk
+
+        names = {}
+        for skill in skills:
+            names.setdefault(
+                normalize(skill.title), ' '.join(skill.title.split())
+            )
+        CanonicalSkill.objects.using(db).bulk_create(
+            [CanonicalSkill(name=name, key=key) for key, name in names.items()],
+            ignore_conflicts=True,
+        )
+        ids = dict(CanonicalSkill.objects.using(db).filter(
+            key__in=names
+        ).values_list('key', 'pk'))
+        for skill in skills:
+            skill.canonical_id = ids[normalize(skill.title)]
+        Skill.objects.using(db).bulk_update(skills, ['canonical'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resume', '0007_canonical_skill'),
+    ]
+
+    operations = [
+        migrations.RunPython(link_canonical_skills, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 4.2.30 on 2026-10-18 11:22
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resume', '0008_link_canonical_skills'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='skill',
+            name='canonical',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='skills', to='resume.canonicalskill'),
+        ),
+    ]
@@ -1,6 +1,7 @@
-from django.db import models
+from django.db import models, router
 from django.conf import settings
 from django.core.exceptions import ValidationError
+from django.dispatch import Signal
 
 
 class BaseModel(models.Model):
@@ -12,13 +13,157 @@ class BaseModel(models.Model):
     created_time = models.DateTimeField(auto_now_add=True)
     updated_time = models.DateTimeField(auto_now=True)
 
+    # Replaced, never changed in place, once the row is loaded or saved.
+    _loaded_values = {}
+
     class Meta:
         abstract = True
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # The field values as loaded, telling a save what it changes
+        # without reading the row again.
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        update_fields = kwargs.get('update_fields')
+        saved = {
+            field.attname: self.__dict__[field.attname]
+            for field in self._meta.concrete_fields
+            if field.attname in self.__dict__ and (
+                update_fields is None or field.name in update_fields
+            )
+        }
+        self._loaded_values = {**self._loaded_values, **saved}
+
+
+def normalize_skill(title):
+    """Return the lookup key of a skill title: case folded, single spaces."""
+    return ' '.join(title.split()).casefold()
+
+
+# Sent by ``CanonicalSkillManager.resolve`` with the ``keys`` of the
+# canonical skills it created in bulk, which sends no post_save.
+canonical_skills_created = Signal()
+
+
+class CanonicalSkillManager(models.Manager):
+
+    def resolve(self, titles):
+        """
+        Return ``{key: canonical skill id}`` for the normalized keys of
+        ``titles``, following aliases and creating the missing skills
+        under the first title seen for their key.
+        """
+        names = {}
+        for title in titles:
+            names.setdefault(normalize_skill(title), ' '.join(title.split()))
+        ids = dict(SkillAlias.objects.using(self.db).filter(
+            key__in=names
+        ).order_by().values_list('key', 'skill'))
+        ids.update(self.filter(
+            key__in=names.keys() - ids.keys()
+        ).order_by().values_list('key', 'pk'))
+        missing = names.keys() - ids.keys()
+        if missing:
+            self.bulk_create(
+                [self.model(name=names[key], key=key) for key in missing],
+                ignore_conflicts=True,
+            )
+            canonical_skills_created.send(sender=self.model, keys=missing)
+            ids.update(self.filter(
+                key__in=missing
+            ).order_by().values_list('key', 'pk'))
+        return ids
+
+
+class CanonicalSkill(models.Model):
+    """
+    A skill shared by every user listing it, stored once under the
+    first spelling seen and looked up by its normalized ``key``.
+    """
+    name = models.CharField(max_length=255)
+    key = models.CharField(max_length=255, unique=True)
+    created_time = models.DateTimeField(auto_now_add=True)
+
+    objects = CanonicalSkillManager()
+
+    class Meta:
+        ordering = ('name',)
+
+    def save(self, *args, **kwargs):
+        self.key = normalize_skill(self.name)
+        super().save(*args, **kwargs)
+
+    def __str__(self):
+        return self.name
+
+
+class SkillAlias(models.Model):
+    """Another spelling of a canonical skill, such as Python3 for Python."""
+    name = models.CharField(max_length=255)
+    key = models.CharField(max_length=255, unique=True)
+    skill = models.ForeignKey(
+        CanonicalSkill,
+        related_name='aliases',
+        on_delete=models.CASCADE
+    )
+
+    class Meta:
+        ordering = ('name',)
+        verbose_name_plural = 'skill aliases'
+
+    def save(self, *args, **kwargs):
+        self.key = normalize_skill(self.name)
+        super().save(*args, **kwargs)
+
+    def __str__(self):
+        return f'{self.name} -> {self.skill}'
+
+
+class SkillManager(models.Manager):
+    """Link skills to their canonical skill on every write."""
+
+    def link_canonical(self, skills, force=False):
+        """
+        Point ``skills`` at the canonical skills of their titles, only
+        those not linked yet unless ``force`` is set.
+        """
+        skills = [
+            skill for skill in skills
+            if force or skill.canonical_id is None
+        ]
+        if not skills:
+            return
+        db = self._db or router.db_for_write(self.model)
+        ids = CanonicalSkill.objects.db_manager(db).resolve(
+            skill.title for skill in skills
+        )
+        for skill in skills:
+            skill.canonical_id = ids[normalize_skill(skill.title)]
+
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = list(objs)
+        self.link_canonical(objs)
+        return super().bulk_create(objs, *args, **kwargs)
+
+    def bulk_update(self, objs, fields, *args, **kwargs):
+        objs = list(objs)
+        if 'title' in fields:
+            self.link_canonical(objs, force=True)
+            fields = [*fields, 'canonical']
+        return super().bulk_update(objs, fields, *args, **kwargs)
+
 
 class Skill(BaseModel):
     """
     A model representing a user's skill.
+
+    ``title`` keeps the user's spelling while ``canonical`` groups the
+    same skill across users.
     """
     user = models.ForeignKey(
         settings.AUTH_USER_MODEL,
@@ -26,6 +171,36 @@ class Skill(BaseModel):
         on_delete=models.CASCADE
     )
     title = models.CharField(max_length=255)
+    canonical = models.ForeignKey(
+        CanonicalSkill,
+        related_name='skills',
+        on_delete=models.PROTECT
+    )
+
+    objects = SkillManager()
+
+    class Meta:
+        ordering = ('id',)
+        indexes = [
+            models.Index(fields=['user', 'id'], name='skill_user_id_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None:
+            relink = (
+                self.canonical_id is None
+                or self.title != self._loaded_values.get('title')
+            )
+        else:
+            relink = 'title' in update_fields
+        if relink:
+            Skill.objects.db_manager(kwargs.get('using')).link_canonical(
+                [self], force=True
+            )
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'canonical'}
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return f'{self.user} - {self.title}'
@@ -46,7 +221,13 @@ class Education(BaseModel):
     end_date = models.DateField(null=True, blank=True)
 
     class Meta:
-        ordering = ('start_date',)
+        ordering = ('start_date', 'id')
+        indexes = [
+            models.Index(
+                fields=['user', 'start_date', 'id'],
+                name='education_user_start_idx',
+            ),
+        ]
 
     def __str__(self):
         return f"{self.degree} - {self.institution}"
@@ -70,7 +251,13 @@ class Certificate(BaseModel):
     issue_date = models.DateField()
 
     class Meta:
-        ordering = ('-issue_date',)
+        ordering = ('-issue_date', '-id')
+        indexes = [
+            models.Index(
+                fields=['user', '-issue_date', '-id'],
+                name='certificate_user_issue_idx',
+            ),
+        ]
 
     def __str__(self):
         return f'{self.user} - {self.title}'
@@ -92,7 +279,13 @@ class Experience(BaseModel):
     end_date = models.DateField(null=True, blank=True)
 
     class Meta:
-        ordering = ('-start_date',)
+        ordering = ('-start_date', '-id')
+        indexes = [
+            models.Index(
+                fields=['user', '-start_date', '-id'],
+                name='experience_user_start_idx',
+            ),
+        ]
 
     def __str__(self):
         return f"{self.user} - {self.company}"
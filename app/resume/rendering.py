@@ -0,0 +1,235 @@
+"""
+Server side rendering of resumes to HTML and PDF.
+
+Rendered artifacts are cached under a hash of the resume data, so an
+unchanged resume is served from the cache and equal resumes share an
+artifact. Small resumes are rendered in the request; larger ones are
+rendered by a background job while the client is asked to retry, so
+slow renders do not hold request threads. The job runs in a worker
+process that may not share the cache of the web processes, so it
+stores its artifacts in the default storage, like the exports.
+"""
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.template.loader import render_to_string
+
+from jobs import queue
+from resume.cache import get_cache
+
+try:
+    import fpdf
+except ImportError:  # pragma: no cover
+    fpdf = None
+
+
+# Bump when the template or PDF layout change to drop old artifacts.
+LAYOUT_VERSION = 1
+
+ARTIFACT_KEY = 'resume:artifact:{format}:{version}:{digest}'
+
+ARTIFACT_FILE = 'renders/{version}/{digest}.{format}'
+
+CONTENT_TYPES = {
+    'html': 'text/html; charset=utf-8',
+    'pdf': 'application/pdf',
+}
+
+
+def _period(row, start, end=None):
+    if not row.get(start):
+        return ''
+    if end is None:
+        return row[start]
+    return f"{row[start]} - {row.get(end) or 'present'}"
+
+
+# Title of each section and how a row is laid out as a heading, a period
+# and details.
+SECTIONS = (
+    ('experiences', 'Experience', lambda row: (
+        f"{row['position']}, {row['company']}",
+        _period(row, 'start_date', 'end_date'),
+        row.get('description'),
+    )),
+    ('educations', 'Education', lambda row: (
+        f"{row['degree']}, {row['institution']}",
+        _period(row, 'start_date', 'end_date'),
+        None,
+    )),
+    ('certificates', 'Certificates', lambda row: (
+        f"{row['title']}, {row['issuing_organization']}",
+        _period(row, 'issue_date'),
+        None,
+    )),
+)
+
+
+def available_formats():
+    """Return the formats that can be rendered with the installed libs."""
+    return [
+        format for format in CONTENT_TYPES
+        if format != 'pdf' or fpdf is not None
+    ]
+
+
+def content_hash(document):
+    """Return a stable hash of a resume document."""
+    data = json.dumps(document, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(data.encode()).hexdigest()
+
+
+def document_size(document):
+    """Return the number of section rows of a resume document."""
+    return sum(
+        len(value) for value in document.values() if isinstance(value, list)
+    )
+
+
+def get_context(document):
+    """Lay a resume document out for the HTML template and the PDF."""
+    profile = (document.get('profile') or [{}])[0]
+    name = ' '.join(
+        filter(None, [profile.get('first_name'), profile.get('last_name')])
+    )
+    sections = []
+    for key, title, layout in SECTIONS:
+        entries = [
+            dict(zip(('heading', 'period', 'details'), layout(row)))
+            for row in document.get(key) or []
+        ]
+        if entries:
+            sections.append({'title': title, 'entries': entries})
+    return {
+        'name': name,
+        'email': document.get('email', ''),
+        'phone': profile.get('phone'),
+        'about_me': profile.get('about_me'),
+        'sections': sections,
+        'skills': [row['title'] for row in document.get('skills') or []],
+    }
+
+
+def render_html(document):
+    return render_to_string('resume/resume.html', get_context(document))
+
+
+def _latin1(value):
+    # The core PDF fonts only cover Latin-1.
+    return str(value).encode('latin-1', 'replace').decode('latin-1')
+
+
+def render_pdf(document):
+    context = get_context(document)
+    pdf = fpdf.FPDF()
+    pdf.set_auto_page_break(auto=True, margin=15)
+    pdf.add_page()
+
+    def text(value, size=10, style='', height=5):
+        pdf.set_font('Helvetica', style=style, size=size)
+        pdf.multi_cell(0, height, _latin1(value), new_x='LMARGIN')
+
+    text(context['name'] or context['email'], size=18, style='B', height=9)
+    text(' | '.join(filter(None, [context['email'], context['phone']])))
+    if context['about_me']:
+        pdf.ln(2)
+        text(context['about_me'])
+
+    for section in context['sections']:
+        pdf.ln(4)
+        text(section['title'], size=13, style='B', height=7)
+        for entry in section['entries']:
+            text(entry['heading'], style='B')
+            if entry['period']:
+                text(entry['period'], size=9)
+            if entry['details']:
+                text(entry['details'])
+            pdf.ln(1)
+    if context['skills']:
+        pdf.ln(4)
+        text('Skills', size=13, style='B', height=7)
+        text(', '.join(context['skills']))
+    return bytes(pdf.output())
+
+
+RENDERERS = {
+    'html': lambda document: render_html(document).encode(),
+    'pdf': render_pdf,
+}
+
+
+def artifact_key(digest, format):
+    return ARTIFACT_KEY.format(
+        format=format, version=LAYOUT_VERSION, digest=digest
+    )
+
+
+def artifact_file(digest, format):
+    return ARTIFACT_FILE.format(
+        format=format, version=LAYOUT_VERSION, digest=digest
+    )
+
+
+def render_artifact(key, document, format):
+    """Render ``document`` in ``format`` and cache it under ``key``."""
+    content = RENDERERS[format](document)
+    timeout = getattr(settings, 'RESUME_CACHE_TIMEOUT', 60 * 60)
+    get_cache().set(key, content, timeout=timeout)
+    return content
+
+
+def store_artifact(digest, document, format):
+    """
+    Render ``document`` in ``format`` into the default storage, unless
+    an equal resume was already stored, and return the file name.
+    """
+    name = artifact_file(digest, format)
+    if not default_storage.exists(name):
+        content = RENDERERS[format](document)
+        name = default_storage.save(name, ContentFile(content))
+    return name
+
+
+def load_artifact(key, digest, format):
+    """
+    Return the artifact stored by a job and cache it under ``key``, or
+    None when there is none yet.
+    """
+    name = artifact_file(digest, format)
+    if not default_storage.exists(name):
+        return None
+    with default_storage.open(name) as f:
+        content = f.read()
+    timeout = getattr(settings, 'RESUME_CACHE_TIMEOUT', 60 * 60)
+    get_cache().set(key, content, timeout=timeout)
+    return content
+
+
+def get_artifact(document, format, user, digest=None):
+    """
+    Return ``user``'s rendered ``document`` in ``format``, or None when
+    a job was queued to render it and it should be requested again.
+    ``digest`` is the content hash of ``document`` if already known.
+    """
+    digest = digest or content_hash(document)
+    key = artifact_key(digest, format)
+    content = get_cache().get(key)
+    if content is not None:
+        return content
+
+    inline_rows = getattr(settings, 'RESUME_RENDER_INLINE_ROWS', 200)
+    if document_size(document) <= inline_rows:
+        return render_artifact(key, document, format)
+
+    content = load_artifact(key, digest, format)
+    if content is not None:
+        return content
+    # Requests polling for the same artifact share the queued job.
+    queue.enqueue(
+        'resume.render', {'user_id': user.pk, 'format': format},
+        key=key, user=user,
+    )
+    return None
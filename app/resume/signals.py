@@ -0,0 +1,65 @@
+"""
+Signals for the resume app.
+"""
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import Signal
+
+from accounts.models import Profile
+from resume.models import (
+    Skill,
+    Education,
+    Certificate,
+    Experience
+)
+
+
+# Sent with ``user_id`` whenever anything rendered in a user's resume
+# changes. Code that writes without model signals (``bulk_create``,
+# ``bulk_update``) must send it itself.
+resume_changed = Signal()
+
+# Sent with ``user_ids`` after users and their resumes were created in
+# bulk without model signals. Resumes of new users are not cached, so
+# only listeners that index resumes need it.
+resumes_created = Signal()
+
+# Sent by code writing section rows with ``bulk_create``,
+# ``bulk_update`` or a single DELETE, which send no model signals.
+# ``sender`` is the model, ``objs`` the rows written, empty for deletes,
+# and ``previous`` copies of the updated or deleted rows as they were
+# loaded, empty for inserts. ``using`` is the database when it is not
+# the default one.
+sections_bulk_written = Signal()
+
+RESUME_MODELS = (Profile, Skill, Education, Certificate, Experience)
+
+
+def notify_resume_changed(user_id):
+    """Tell every listener that the user's resume has changed."""
+    resume_changed.send(sender=None, user_id=user_id)
+
+
+def notify_resumes_created(user_ids):
+    """Tell listeners that the resumes of ``user_ids`` were created."""
+    resumes_created.send(sender=None, user_ids=list(user_ids))
+
+
+def section_changed(sender, instance, **kwargs):
+    notify_resume_changed(instance.user_id)
+
+
+def user_changed(sender, instance, update_fields=None, **kwargs):
+    # The email is the only user field in a resume, so saves such as the
+    # last_login update of a login leave it unchanged.
+    if update_fields is not None and 'email' not in update_fields:
+        return
+    notify_resume_changed(instance.pk)
+
+
+for model in RESUME_MODELS:
+    post_save.connect(section_changed, sender=model)
+    post_delete.connect(section_changed, sender=model)
+
+post_save.connect(user_changed, sender=get_user_model())
+post_delete.connect(user_changed, sender=get_user_model())
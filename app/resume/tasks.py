@@ -0,0 +1,47 @@
+"""
+Background jobs of the resume app.
+"""
+import tempfile
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.files import File
+from django.core.files.storage import default_storage
+
+from app.routers import primary_reads
+from jobs.queue import task
+from resume import rendering
+from resume.api.fast import resume_document
+from resume.export import export_lines
+
+
+@task(
+    'resume.render',
+    priority=10,
+    concurrency=getattr(settings, 'RESUME_RENDER_WORKERS', 2),
+    timeout=120,
+)
+def render_resume(user_id, format):
+    """Render the current resume of a user into the default storage."""
+    user = get_user_model().objects.filter(pk=user_id).first()
+    if user is None:
+        return None
+    # The client waits for the artifact of the resume it just read.
+    with primary_reads():
+        document = resume_document(user)
+    digest = rendering.content_hash(document)
+    name = rendering.store_artifact(digest, document, format)
+    return {'digest': digest, 'file': name}
+
+
+@task('resume.export', concurrency=1, timeout=60 * 60)
+def export_resumes(name, sections=None, section_fields=None):
+    """Export every resume as NDJSON to ``name`` in the default storage."""
+    count = 0
+    with tempfile.TemporaryFile() as f:
+        for line in export_lines(sections, section_fields):
+            f.write(line)
+            count += 1
+        f.seek(0)
+        name = default_storage.save(name, File(f))
+    return {'file': name, 'resumes': count}
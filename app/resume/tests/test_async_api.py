@@ -0,0 +1,164 @@
+"""
+Tests for the async resume APIs.
+"""
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+from accounts.authentication import local_tokens
+from resume import cache
+from resume.models import (
+    Skill,
+    Education,
+    Experience,
+)
+
+
+ASYNC_RESUME_URL = reverse('resume:async-resume-retrieve')
+
+
+def section_url(section):
+    return reverse('resume:async-section-list', args=[section])
+
+
+def detail_url(section, pk):
+    return reverse('resume:async-section-detail', args=[section, pk])
+
+
+def create_user(email='user@example.com', password='testpass123'):
+    """Create and return a user."""
+    return get_user_model().objects.create_user(email, password)
+
+
+class AsyncResumeAPITests(TestCase):
+
+    def setUp(self):
+        cache.get_cache().clear()
+        local_tokens.clear()
+        self.user = create_user()
+        self.token = Token.objects.create(user=self.user)
+        self.headers = {'Authorization': f'Token {self.token.key}'}
+        for i in range(3):
+            Skill.objects.create(user=self.user, title=f'Skill {i}')
+            Education.objects.create(
+                user=self.user,
+                institution=f'Uni {i}',
+                degree='Bachelor',
+                start_date=f'{2000 + i}-01-01',
+            )
+            Experience.objects.create(
+                user=self.user,
+                company=f'Company {i}',
+                position='Developer',
+                description='Worked on developing applications.',
+                start_date=f'{2000 + i}-04-12',
+                end_date=f'{2001 + i}-04-12',
+            )
+        other = create_user(email='other@example.com')
+        self.other_skill = Skill.objects.create(user=other, title='Other')
+
+    async def test_auth_required(self):
+        """Test a token is required."""
+        res = await self.async_client.get(ASYNC_RESUME_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(res['WWW-Authenticate'], 'Token')
+
+    async def test_invalid_token(self):
+        """Test an unknown token is rejected."""
+        res = await self.async_client.get(
+            ASYNC_RESUME_URL, headers={'Authorization': 'Token invalid'}
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(res.json(), {'detail': 'Invalid token.'})
+
+    async def test_retrieve_resume(self):
+        """Test the async resume has every section of the user."""
+        res = await self.async_client.get(
+            ASYNC_RESUME_URL, headers=self.headers
+        )
+
+        data = res.json()
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(data['email'], self.user.email)
+        self.assertEqual(len(data['skills']), 3)
+        self.assertEqual(len(data['experiences']), 3)
+        self.assertEqual(data['certificates'], [])
+
+    async def test_section_detail_not_found_for_other_user(self):
+        """Test rows of other users are not returned."""
+        res = await self.async_client.get(
+            detail_url('skills', self.other_skill.pk), headers=self.headers
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    async def test_unknown_section(self):
+        """Test unknown sections return 404."""
+        res = await self.async_client.get(
+            section_url('hobbies'), headers=self.headers
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_responses_match_sync_views(self):
+        """Test the async views return the sync views' documents."""
+        client = APIClient()
+        client.force_authenticate(user=self.user)
+        skill = Skill.objects.filter(user=self.user).first()
+        for sync_url, async_url, params in [
+            (reverse('resume:resume-retrieve'), ASYNC_RESUME_URL, {}),
+            (
+                reverse('resume:resume-retrieve'),
+                ASYNC_RESUME_URL,
+                {'sections': 'email,skills', 'fields[skills]': 'title'},
+            ),
+            (
+                reverse('resume:experience-list'),
+                section_url('experiences'),
+                {},
+            ),
+            (
+                reverse('resume:skill-detail', args=[skill.pk]),
+                detail_url('skills', skill.pk),
+                {},
+            ),
+        ]:
+            expected = client.get(sync_url, params)
+            res = self.client.get(async_url, params, headers=self.headers)
+
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            self.assertEqual(res.content, expected.content)
+
+    def test_pagination_matches_sync_views(self):
+        """Test the async list follows the same cursors."""
+        client = APIClient()
+        client.force_authenticate(user=self.user)
+
+        expected = client.get(
+            reverse('resume:education-list'), {'page_size': 2}
+        ).json()
+        res = self.client.get(
+            section_url('educations'), {'page_size': 2}, headers=self.headers
+        ).json()
+
+        self.assertEqual(res['results'], expected['results'])
+        self.assertEqual(
+            res['next'].split('?')[1], expected['next'].split('?')[1]
+        )
+        res = self.client.get(res['next'], headers=self.headers).json()
+        self.assertEqual(len(res['results']), 1)
+        self.assertIsNone(res['next'])
+
+    def test_unknown_selection(self):
+        """Test invalid selections are rejected like the sync view."""
+        res = self.client.get(
+            ASYNC_RESUME_URL, {'sections': 'hobbies'}, headers=self.headers
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('sections', res.json())
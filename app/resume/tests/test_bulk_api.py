@@ -0,0 +1,210 @@
+"""
+Test for the batch resume section APIs.
+"""
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+from analytics.models import Rollup
+from resume import cache
+from resume.models import Skill, Education, Experience
+
+
+def create_user(email='user@example.com', password='testpass123'):
+    """Create and return a user."""
+    return get_user_model().objects.create_user(email, password)
+
+
+class BulkAPITests(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = create_user()
+        self.client.force_authenticate(user=self.user)
+        self.skill_url = reverse('resume:skill-bulk')
+        self.education_url = reverse('resume:education-bulk')
+
+    def test_bulk_create_skills(self):
+        """Test creating many skills with a single insert."""
+        payload = [{'title': f'Skill {i}'} for i in range(20)]
+
+        # Savepoint, alias and canonical skill lookups, canonical skill
+        # insert and read back, skill insert, rollup upsert, release.
+        with self.assertNumQueries(8):
+            res = self.client.post(self.skill_url, payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(res.data['results']), 20)
+        self.assertEqual(res.data['errors'], [])
+        skills = Skill.objects.filter(user=self.user)
+        self.assertEqual(skills.count(), 20)
+        self.assertEqual(
+            {skill['id'] for skill in res.data['results']},
+            set(skills.values_list('id', flat=True)),
+        )
+
+    def test_bulk_create_reports_item_errors(self):
+        """Test invalid items are reported while valid ones are saved."""
+        payload = [
+            {
+                'institution': 'Tech Uni',
+                'degree': 'Bachelor',
+                'start_date': '2020-01-01',
+                'end_date': '2023-01-01',
+            },
+            {
+                'institution': 'Tech Uni',
+                'degree': 'Master',
+                'start_date': '2024-01-01',
+                'end_date': '2023-01-01',
+            },
+            {'institution': 'Tech Uni'},
+        ]
+
+        res = self.client.post(self.education_url, payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(res.data['results']), 1)
+        self.assertEqual(
+            [error['index'] for error in res.data['errors']], [1, 2]
+        )
+        self.assertEqual(Education.objects.filter(user=self.user).count(), 1)
+
+    def test_bulk_create_atomic_aborts_batch(self):
+        """Test an atomic batch saves nothing when any item is invalid."""
+        payload = [{'title': 'Python'}, {'title': ''}]
+
+        res = self.client.post(
+            f'{self.skill_url}?atomic=true', payload, format='json'
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(res.data['errors'][0]['index'], 1)
+        self.assertFalse(Skill.objects.filter(user=self.user).exists())
+
+    def test_bulk_create_requires_list(self):
+        """Test a payload that is not a list is rejected."""
+        res = self.client.post(
+            self.skill_url, {'title': 'Python'}, format='json'
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_bulk_update(self):
+        """Test updating many rows validates against stored dates."""
+        education = Education.objects.create(
+            user=self.user,
+            institution='Tech Uni',
+            degree='Bachelor',
+            start_date='2020-01-01',
+            end_date='2023-01-01'
+        )
+        other = Education.objects.create(
+            user=create_user(email='other@example.com'),
+            institution='Other Uni',
+            degree='Bachelor',
+            start_date='2020-01-01',
+        )
+        ended = Education.objects.create(
+            user=self.user,
+            institution='Old Uni',
+            degree='Bachelor',
+            start_date='2020-01-01',
+            end_date='2023-01-01'
+        )
+        payload = [
+            {'id': education.id, 'degree': 'Master'},
+            {'id': ended.id, 'end_date': '2019-01-01'},
+            {'id': other.id, 'degree': 'PhD'},
+        ]
+
+        res = self.client.patch(self.education_url, payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [error['index'] for error in res.data['errors']], [1, 2]
+        )
+        education.refresh_from_db()
+        ended.refresh_from_db()
+        other.refresh_from_db()
+        self.assertEqual(education.degree, 'Master')
+        self.assertEqual(str(ended.end_date), '2023-01-01')
+        self.assertEqual(other.degree, 'Bachelor')
+
+    def test_bulk_update_rejects_duplicate_ids(self):
+        """Test a row cannot be updated twice in one batch."""
+        skill = Skill.objects.create(user=self.user, title='Python')
+        payload = [
+            {'id': skill.id, 'title': 'Django'},
+            {'id': skill.id, 'title': 'Flask'},
+        ]
+
+        res = self.client.patch(self.skill_url, payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn(str(skill.id), res.data['non_field_errors'][0])
+        skill.refresh_from_db()
+        self.assertEqual(skill.title, 'Python')
+        self.assertEqual(
+            Rollup.objects.get(
+                metric='skills', key=str(skill.canonical_id)
+            ).count,
+            1,
+        )
+
+    def test_bulk_delete(self):
+        """Test deleting many rows limited to the authenticated user."""
+        skills = [
+            Skill.objects.create(user=self.user, title=f'Skill {i}')
+            for i in range(3)
+        ]
+        other = Skill.objects.create(
+            user=create_user(email='other@example.com'), title='Java'
+        )
+        payload = {'ids': [skills[0].id, skills[1].id, other.id]}
+        version = cache.get_version(self.user.pk)
+
+        # Savepoint, rows locked, delete, rollup upsert, release.
+        with self.assertNumQueries(5):
+            res = self.client.delete(self.skill_url, payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['deleted'], 2)
+        self.assertEqual(res.data['errors'][0]['index'], 2)
+        self.assertEqual(
+            list(Skill.objects.filter(user=self.user)), [skills[2]]
+        )
+        self.assertTrue(Skill.objects.filter(id=other.id).exists())
+        self.assertNotEqual(cache.get_version(self.user.pk), version)
+        self.assertEqual(
+            Rollup.objects.get(
+                metric='skills', key=str(skills[0].canonical_id)
+            ).count,
+            0,
+        )
+
+    def test_bulk_delete_invalid_ids(self):
+        """Test errors keyed by list index are rendered."""
+        res = self.client.delete(self.skill_url, {'ids': ['a']}, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('0', res.json()['ids'])
+
+    def test_bulk_write_invalidates_resume_cache(self):
+        """Test batch writes bump the cached resume version."""
+        version = cache.get_version(self.user.pk)
+        payload = [{
+            'company': 'Tech Group',
+            'position': 'Software Engineer',
+            'description': 'Worked on developing applications.',
+            'start_date': '2022-04-12',
+        }]
+
+        self.client.post(
+            reverse('resume:experience-bulk'), payload, format='json'
+        )
+
+        self.assertEqual(Experience.objects.count(), 1)
+        self.assertNotEqual(cache.get_version(self.user.pk), version)
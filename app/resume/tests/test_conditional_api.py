@@ -0,0 +1,137 @@
+"""
+Test for conditional GET on the resume APIs.
+"""
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+from accounts.models import Profile
+from resume import cache
+from resume.models import Skill, Certificate
+
+
+def create_user(email='user@example.com', password='testpass123'):
+    """Create and return a user."""
+    return get_user_model().objects.create_user(email, password)
+
+
+class SectionConditionalGetTests(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.url = reverse('resume:skill-list')
+        self.user = create_user()
+        self.skill = Skill.objects.create(user=self.user, title='Python')
+        self.client.force_authenticate(user=self.user)
+
+    def test_list_sets_etag(self):
+        """Test list responses carry an ETag and no Last-Modified."""
+        res = self.client.get(self.url)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertIn('ETag', res)
+        self.assertNotIn('Last-Modified', res)
+
+    def test_if_none_match_not_modified(self):
+        """Test a matching ETag answers 304 with a single query."""
+        etag = self.client.get(self.url)['ETag']
+
+        with self.assertNumQueries(1):
+            res = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(res['ETag'], etag)
+        self.assertEqual(res.content, b'')
+
+    def test_update_changes_etag(self):
+        """Test editing a row changes the ETag."""
+        etag = self.client.get(self.url)['ETag']
+        self.skill.title = 'Django'
+        self.skill.save()
+
+        res = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data[0]['title'], 'Django')
+
+    def test_delete_changes_etag(self):
+        """Test removing a row changes the ETag."""
+        Skill.objects.create(user=self.user, title='Django')
+        etag = self.client.get(self.url)['ETag']
+        self.skill.delete()
+
+        res = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(res['ETag'], etag)
+        self.assertEqual(len(res.data), 1)
+
+    def test_etag_is_per_user(self):
+        """Test another user's ETag never matches."""
+        etag = self.client.get(self.url)['ETag']
+        other_user = create_user(email='other@example.com')
+        Skill.objects.create(user=other_user, title='Java')
+        self.client.force_authenticate(user=other_user)
+
+        res = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+
+class ResumeConditionalGetTests(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        cache.get_cache().clear()
+        self.url = reverse('resume:resume-retrieve')
+        self.user = create_user()
+        Skill.objects.create(user=self.user, title='Python')
+        self.client.force_authenticate(user=self.user)
+
+    def test_if_none_match_not_modified(self):
+        """Test a matching ETag answers 304 with a single query."""
+        etag = self.client.get(self.url)['ETag']
+        cache.get_cache().clear()
+
+        with self.assertNumQueries(1):
+            res = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_section_change_modifies_resume(self):
+        """Test writing any section changes the resume ETag."""
+        etag = self.client.get(self.url)['ETag']
+        Certificate.objects.create(
+            user=self.user,
+            title='Django Developer',
+            issuing_organization='Django Institute',
+            issue_date='2023-06-01'
+        )
+
+        res = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.json()['certificates']), 1)
+
+    def test_profile_change_modifies_resume(self):
+        """Test updating the profile changes the resume ETag."""
+        etag = self.client.get(self.url)['ETag']
+        profile = Profile.objects.get(user=self.user)
+        profile.first_name = 'Ada'
+        profile.save()
+
+        res = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_cached_not_modified_skips_database(self):
+        """Test a cached resume answers 304 without any query."""
+        etag = self.client.get(self.url)['ETag']
+
+        with self.assertNumQueries(0):
+            res = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(res['X-Resume-Cache'], 'HIT')
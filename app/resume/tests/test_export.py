@@ -0,0 +1,203 @@
+"""
+Tests for the streaming resume export.
+"""
+import json
+import os
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+from jobs import queue
+from resume import export
+from resume.export import export_resumes
+from resume.models import (
+    Skill,
+    Education,
+    Certificate,
+    Experience,
+)
+
+
+EXPORT_URL = reverse('resume:resume-export')
+
+
+def create_user(email='user@example.com', password='testpass123'):
+    """Create and return a user."""
+    return get_user_model().objects.create_user(email, password)
+
+
+def create_resume(user, size):
+    """Give ``user`` ``size`` rows in every section."""
+    for i in range(size):
+        Skill.objects.create(user=user, title=f'Skill {i}')
+        Education.objects.create(
+            user=user,
+            institution=f'Uni {i}',
+            degree='Bachelor',
+            start_date=f'{2000 + i}-01-01',
+        )
+        Certificate.objects.create(
+            user=user,
+            title=f'Certificate {i}',
+            issuing_organization='Issuer',
+            issue_date=f'{2010 + i}-05-01',
+        )
+        Experience.objects.create(
+            user=user,
+            company=f'Company {i}',
+            position='Developer',
+            description='Worked on developing applications.',
+            start_date=f'{2000 + i}-04-12',
+        )
+
+
+class ExportTests(TestCase):
+
+    def setUp(self):
+        self.users = [
+            create_user(email=f'user{i}@example.com') for i in range(4)
+        ]
+        # Sections of users are created interleaved, and one user has none.
+        for size, user in zip([2, 0, 3, 1], self.users):
+            create_resume(user, size)
+
+    def expected(self, user, params=None):
+        client = APIClient()
+        client.force_authenticate(user=user)
+        return client.get(reverse('resume:resume-retrieve'), params).json()
+
+    def test_export_matches_resume_api(self):
+        """Test every user's document is their resume API response."""
+        documents = list(export_resumes(chunk_size=1))
+
+        self.assertEqual(
+            documents, [self.expected(user) for user in self.users]
+        )
+
+    def test_export_query_count_is_constant(self):
+        """Test the export runs one query per section for any user count."""
+        with self.assertNumQueries(6):
+            list(export_resumes())
+
+        for i in range(5):
+            create_resume(create_user(email=f'more{i}@example.com'), 2)
+
+        with self.assertNumQueries(6):
+            self.assertEqual(len(list(export_resumes())), 9)
+
+    def test_export_sections(self):
+        """Test the export limits the sections and fields."""
+        documents = list(export_resumes(
+            ['email', 'skills'], {'skills': ['title']}
+        ))
+
+        self.assertEqual(documents[0], {
+            'email': 'user0@example.com',
+            'skills': [{'title': 'Skill 0'}, {'title': 'Skill 1'}],
+        })
+
+
+class ExportAPITests(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = create_user()
+        create_resume(self.user, 2)
+
+    def test_export_requires_staff(self):
+        """Test regular users cannot export."""
+        self.client.force_authenticate(user=self.user)
+
+        res = self.client.get(EXPORT_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_export_streams_ndjson(self):
+        """Test staff get one JSON document per user."""
+        admin = get_user_model().objects.create_superuser(
+            'admin@example.com', 'testpass123'
+        )
+        self.client.force_authenticate(user=admin)
+
+        with mock.patch(
+            'resume.api.views.export_lines', wraps=export.export_lines
+        ) as export_lines:
+            res = self.client.get(EXPORT_URL, {'sections': 'email,skills'})
+
+        # The database is picked in the request, not while streaming.
+        self.assertEqual(export_lines.call_args.kwargs['using'], 'default')
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertTrue(res.streaming)
+        self.assertEqual(res['Content-Type'], 'application/x-ndjson')
+        lines = b''.join(res.streaming_content).decode().splitlines()
+        self.assertEqual(
+            [json.loads(line)['email'] for line in lines],
+            ['user@example.com', 'admin@example.com'],
+        )
+        self.assertEqual(len(json.loads(lines[0])['skills']), 2)
+
+    def test_export_in_background(self):
+        """Test a queued export is downloaded once its job ran."""
+        admin = get_user_model().objects.create_superuser(
+            'admin@example.com', 'testpass123'
+        )
+        self.client.force_authenticate(user=admin)
+
+        res = self.client.post(EXPORT_URL + '?sections=email')
+
+        self.assertEqual(res.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(res.data['status'], 'queued')
+        file_url = reverse('resume:resume-export-file', args=[res.data['id']])
+        self.assertEqual(
+            self.client.get(file_url).status_code, status.HTTP_404_NOT_FOUND
+        )
+
+        with tempfile.TemporaryDirectory() as tmp:
+            with self.settings(MEDIA_ROOT=tmp):
+                queue.run_pending()
+                job = self.client.get(res['Location']).data
+                res = self.client.get(file_url)
+                content = b''.join(res.streaming_content).decode()
+
+        self.assertEqual(job['status'], 'succeeded')
+        self.assertEqual(job['result']['resumes'], 2)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [json.loads(line) for line in content.splitlines()],
+            [{'email': 'user@example.com'}, {'email': 'admin@example.com'}],
+        )
+
+
+class ExportCommandTests(TestCase):
+
+    def test_export_to_file(self):
+        """Test the command writes one line per user."""
+        create_resume(create_user(), 1)
+        create_user(email='other@example.com')
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'resumes.ndjson')
+            stderr = StringIO()
+            call_command(
+                'export_resumes', output=path, chunk_size=1, stderr=stderr
+            )
+            with open(path) as f:
+                documents = [json.loads(line) for line in f]
+
+        self.assertEqual(len(documents), 2)
+        self.assertEqual(len(documents[0]['experiences']), 1)
+        self.assertEqual(documents[1]['skills'], [])
+        self.assertIn('Exported 2 resumes.', stderr.getvalue())
+
+    def test_unknown_section(self):
+        """Test unknown sections are rejected."""
+        with self.assertRaises(CommandError):
+            call_command('export_resumes', sections='hobbies')
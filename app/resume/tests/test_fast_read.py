@@ -0,0 +1,213 @@
+"""
+Parity tests for the fast read path.
+"""
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from accounts.models import Profile
+from resume import cache
+from resume.api import serializers, views
+from resume.api.fast import get_row_serializer, resume_document
+from resume.api.renderers import FastJSONRenderer
+from resume.models import (
+    Skill,
+    Education,
+    Certificate,
+    Experience,
+)
+
+
+def create_user(email='user@example.com', password='testpass123'):
+    """Create and return a user."""
+    return get_user_model().objects.create_user(email, password)
+
+
+def create_resume(user, size=2):
+    """Fill every section of a user's resume with ``size`` rows."""
+    Profile.objects.filter(user=user).update(
+        first_name='Zoë', about_me='Line\u2028separator and “quotes”'
+    )
+    for i in range(size):
+        Skill.objects.create(user=user, title=f'Skill {i} – ünïcode')
+        Education.objects.create(
+            user=user,
+            institution=f'Uni {i}',
+            degree='Bachelor',
+            start_date=f'{2000 + i}-01-01',
+            end_date=None if i % 2 else f'{2000 + i}-06-01',
+        )
+        Certificate.objects.create(
+            user=user,
+            title=f'Certificate {i}',
+            issuing_organization='Django Institute',
+            issue_date=f'{2000 + i}-06-01'
+        )
+        Experience.objects.create(
+            user=user,
+            company=f'Company {i}',
+            position='Developer',
+            description='Worked on developing applications.\n' * 3,
+            start_date=f'{2000 + i}-04-12',
+            end_date=None if i % 2 else f'{2000 + i}-05-06',
+        )
+
+
+class FastReadParityTests(TestCase):
+
+    def setUp(self):
+        self.user = create_user()
+        create_resume(self.user)
+        create_resume(create_user(email='other@example.com'))
+
+    def serializer_document(self, **kwargs):
+        view = views.ResumeAPIView()
+        view.request = mock.Mock(query_params={})
+        user = view.get_queryset().get(pk=self.user.pk)
+        return serializers.ResumeSerializer(user, **kwargs).data
+
+    def test_resume_document_matches_serializer(self):
+        expected = self.serializer_document()
+
+        data = resume_document(self.user)
+
+        self.assertEqual(data, expected)
+        self.assertEqual(list(data), list(expected))
+        self.assertEqual(
+            FastJSONRenderer().render(data), JSONRenderer().render(expected)
+        )
+
+    def test_selection_matches_serializer(self):
+        selection = {
+            'sections': ['profile', 'experiences'],
+            'section_fields': {
+                'profile': ['email', 'about_me'],
+                'experiences': ['end_date', 'company'],
+            },
+        }
+        expected = self.serializer_document(**selection)
+
+        data = resume_document(self.user, **selection)
+
+        self.assertEqual(
+            FastJSONRenderer().render(data), JSONRenderer().render(expected)
+        )
+
+    def test_section_rows_match_serializers(self):
+        for model, serializer_class in [
+            (Skill, serializers.SkillSerializer),
+            (Education, serializers.EducationSerializer),
+            (Certificate, serializers.CertificateSerializer),
+            (Experience, serializers.ExperienceSerializer),
+        ]:
+            queryset = model.objects.filter(user=self.user)
+            rows = get_row_serializer(serializer_class)
+
+            data = rows.many(rows.values(queryset))
+
+            expected = serializer_class(queryset, many=True).data
+            self.assertEqual(
+                FastJSONRenderer().render(data),
+                JSONRenderer().render(expected),
+            )
+
+    def test_non_string_keys(self):
+        data = {'ids': {0: ['A valid integer is required.']}}
+
+        self.assertEqual(
+            FastJSONRenderer().render(data), JSONRenderer().render(data)
+        )
+
+    def test_api_responses_match(self):
+        client = APIClient()
+        client.force_authenticate(user=self.user)
+        for url, view in [
+            (reverse('resume:resume-retrieve'), views.ResumeAPIView),
+            (reverse('resume:experience-list'), views.ExperienceViewSet),
+            (reverse('resume:education-list'), views.EducationViewSet),
+        ]:
+            fast = client.get(url)
+            cache.get_cache().clear()
+            with mock.patch.object(view, 'fast_read', False):
+                slow = client.get(url)
+
+            self.assertEqual(fast.content, slow.content)
+
+
+class FastReadQueryTests(TestCase):
+    """
+    Both read paths run a fixed number of queries whatever the resume
+    size.
+    """
+
+    def test_query_count(self):
+        user = create_user()
+        create_resume(user, size=50)
+        view = views.ResumeAPIView()
+        view.request = mock.Mock(query_params={})
+
+        # The user, then one query per prefetched section.
+        with self.assertNumQueries(6):
+            instance = view.get_queryset().get(pk=user.pk)
+            expected = serializers.ResumeSerializer(instance).data
+        # One query per section.
+        with self.assertNumQueries(5):
+            data = resume_document(user)
+
+        self.assertEqual(
+            FastJSONRenderer().render(data), JSONRenderer().render(expected)
+        )
+
+
+class ReadPathTests(TestCase):
+    """Which requests the fast path serves, and which the serializers."""
+
+    def setUp(self):
+        self.user = create_user()
+        create_resume(self.user)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def test_resume_read_without_models(self):
+        url = reverse('resume:resume-retrieve')
+        with mock.patch.object(
+            views.ResumeAPIView, 'get_queryset'
+        ) as get_queryset:
+            res = self.client.get(url)
+
+        self.assertEqual(res.status_code, 200)
+        get_queryset.assert_not_called()
+
+        cache.get_cache().clear()
+        with mock.patch.object(views.ResumeAPIView, 'fast_read', False):
+            with mock.patch.object(
+                views.ResumeAPIView,
+                'get_queryset',
+                autospec=True,
+                side_effect=views.ResumeAPIView.get_queryset,
+            ) as get_queryset:
+                self.client.get(url)
+
+        get_queryset.assert_called()
+
+    def test_sections_serialized_outside_lists(self):
+        skill = Skill.objects.filter(user=self.user).first()
+        detail = reverse('resume:skill-detail', args=[skill.pk])
+        with mock.patch.object(
+            serializers.SkillSerializer,
+            'to_representation',
+            autospec=True,
+            side_effect=serializers.SkillSerializer.to_representation,
+        ) as to_representation:
+            self.client.get(reverse('resume:skill-list'))
+            self.assertEqual(to_representation.call_count, 0)
+
+            self.client.get(detail)
+            self.assertEqual(to_representation.call_count, 1)
+
+            self.client.patch(detail, {'title': 'Go'}, format='json')
+            self.assertEqual(to_representation.call_count, 2)
@@ -0,0 +1,62 @@
+"""
+Tests that section list queries are served by the composite indexes.
+"""
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from resume.models import (
+    Skill,
+    Education,
+    Certificate,
+    Experience,
+)
+
+
+def create_user(email='user@example.com', password='testpass123'):
+    """Create and return a user."""
+    return get_user_model().objects.create_user(email, password)
+
+
+class SectionIndexTests(TestCase):
+
+    def setUp(self):
+        self.user = create_user()
+        if connection.vendor == 'postgresql':
+            # Tiny test tables would otherwise always be scanned.
+            with connection.cursor() as cursor:
+                cursor.execute('SET enable_seqscan = off')
+
+    def tearDown(self):
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute('RESET enable_seqscan')
+
+    def assertIndexOrdered(self, queryset):
+        """Assert the plan reads an index in order without sorting."""
+        if connection.vendor not in ('postgresql', 'sqlite'):
+            self.skipTest('Query plans are only checked on Postgres/SQLite.')
+
+        plan = queryset.explain()
+
+        if connection.vendor == 'postgresql':
+            self.assertIn('Index', plan)
+            self.assertNotIn('Sort', plan)
+        else:
+            self.assertIn('USING INDEX', plan)
+            self.assertNotIn('TEMP B-TREE', plan)
+
+    def test_skill_list_uses_index(self):
+        queryset = Skill.objects.filter(user=self.user)
+        self.assertIndexOrdered(queryset)
+
+    def test_education_list_uses_index(self):
+        queryset = Education.objects.filter(user=self.user)
+        self.assertIndexOrdered(queryset)
+
+    def test_certificate_list_uses_index(self):
+        queryset = Certificate.objects.filter(user=self.user)
+        self.assertIndexOrdered(queryset)
+
+    def test_experience_list_uses_index(self):
+        queryset = Experience.objects.filter(user=self.user)
+        self.assertIndexOrdered(queryset)
@@ -0,0 +1,123 @@
+"""
+Test for keyset pagination of the section list APIs.
+"""
+import base64
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+from resume.models import Skill, Education
+
+
+def create_user(email='user@example.com', password='testpass123'):
+    """Create and return a user."""
+    return get_user_model().objects.create_user(email, password)
+
+
+class KeysetPaginationTests(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = create_user()
+        self.client.force_authenticate(user=self.user)
+        self.skill_url = reverse('resume:skill-list')
+        self.education_url = reverse('resume:education-list')
+
+    def collect_pages(self, url):
+        """Follow next links and return the ids of every page."""
+        pages = []
+        while url:
+            res = self.client.get(url)
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            pages.append([item['id'] for item in res.data['results']])
+            url = res.data['next']
+        return pages
+
+    def test_list_unpaginated_by_default(self):
+        """Test lists keep returning a plain list without parameters."""
+        Skill.objects.create(user=self.user, title='Python')
+
+        res = self.client.get(self.skill_url)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertIsInstance(res.data, list)
+
+    def test_pages_cover_all_rows_in_order(self):
+        """Test following the cursor yields each row exactly once."""
+        skills = [
+            Skill.objects.create(user=self.user, title=f'Skill {i}')
+            for i in range(5)
+        ]
+
+        pages = self.collect_pages(f'{self.skill_url}?page_size=2')
+
+        self.assertEqual(
+            pages,
+            [
+                [skills[0].id, skills[1].id],
+                [skills[2].id, skills[3].id],
+                [skills[4].id],
+            ],
+        )
+
+    def test_ties_on_ordering_field_broken_by_id(self):
+        """Test rows sharing an ordering value are split across pages."""
+        educations = [
+            Education.objects.create(
+                user=self.user,
+                institution=f'Uni {i}',
+                degree='Bachelor',
+                start_date='2020-01-01' if i < 3 else '2019-01-01',
+            )
+            for i in range(5)
+        ]
+
+        pages = self.collect_pages(f'{self.education_url}?page_size=2')
+
+        expected = [
+            education.id
+            for education in sorted(
+                educations, key=lambda e: (str(e.start_date), e.id)
+            )
+        ]
+        self.assertEqual(sum(pages, []), expected)
+
+    def test_deep_page_costs_same_as_first(self):
+        """Test a later page runs the same queries as the first."""
+        for i in range(10):
+            Skill.objects.create(user=self.user, title=f'Skill {i}')
+        res = self.client.get(f'{self.skill_url}?page_size=3')
+        for _ in range(2):
+            res = self.client.get(res.data['next'])
+
+        with self.assertNumQueries(2):
+            self.client.get(res.data['next'])
+
+    def test_page_size_capped(self):
+        """Test the page size can not exceed the server maximum."""
+        Skill.objects.bulk_create([
+            Skill(user=self.user, title=f'Skill {i}') for i in range(210)
+        ])
+
+        res = self.client.get(f'{self.skill_url}?page_size=1000')
+
+        self.assertEqual(len(res.data['results']), 200)
+        self.assertIsNotNone(res.data['next'])
+
+    def test_invalid_cursor(self):
+        """Test a malformed cursor is rejected."""
+        res = self.client.get(f'{self.skill_url}?cursor=invalid')
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_cursor_values_validated(self):
+        """Test a cursor of null or missing values is rejected."""
+        for values in ['[null]', '[]', '["a","b"]', '{"id":1}']:
+            cursor = base64.urlsafe_b64encode(values.encode()).decode()
+
+            res = self.client.get(self.skill_url, {'cursor': cursor})
+
+            self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
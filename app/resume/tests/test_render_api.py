@@ -0,0 +1,141 @@
+"""
+Tests for rendering resumes to HTML and PDF.
+"""
+import tempfile
+from unittest import mock, skipIf
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+from accounts.models import Profile
+from jobs import queue
+from jobs.models import Job
+from resume import cache, rendering
+from resume.models import (
+    Skill,
+    Experience,
+)
+
+
+def render_url(file_format):
+    return reverse('resume:resume-render', args=[file_format])
+
+
+def create_user(email='user@example.com', password='testpass123'):
+    """Create and return a user."""
+    return get_user_model().objects.create_user(email, password)
+
+
+class RenderAPITests(TestCase):
+
+    def setUp(self):
+        cache.get_cache().clear()
+        self.client = APIClient()
+        self.user = create_user()
+        Profile.objects.filter(user=self.user).update(
+            first_name='Jane', last_name='Doe', phone='123456'
+        )
+        Skill.objects.create(user=self.user, title='Python')
+        Skill.objects.create(user=self.user, title='Django')
+        Experience.objects.create(
+            user=self.user,
+            company='Acme',
+            position='Developer',
+            description='Built <b>APIs</b>.',
+            start_date='2020-01-01',
+        )
+        self.client.force_authenticate(user=self.user)
+
+    def test_auth_required(self):
+        """Test authentication is required."""
+        res = APIClient().get(render_url('html'))
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_unknown_format(self):
+        """Test unknown formats return 404."""
+        res = self.client.get(render_url('docx'))
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_render_html(self):
+        """Test the HTML resume has every section, escaped."""
+        res = self.client.get(render_url('html'))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res['Content-Type'], 'text/html; charset=utf-8')
+        html = res.content.decode()
+        self.assertIn('<h1>Jane Doe</h1>', html)
+        self.assertIn('Developer, Acme', html)
+        self.assertIn('2020-01-01 - present', html)
+        self.assertIn('Built &lt;b&gt;APIs&lt;/b&gt;.', html)
+        self.assertIn('Python, Django', html)
+
+    @skipIf(rendering.fpdf is None, 'fpdf2 is not installed')
+    def test_render_pdf(self):
+        """Test the PDF resume is a PDF document."""
+        res = self.client.get(render_url('pdf'))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res['Content-Type'], 'application/pdf')
+        self.assertTrue(res.content.startswith(b'%PDF'))
+
+    def test_unchanged_resume_served_from_cache(self):
+        """Test an unchanged resume is not rendered again."""
+        first = self.client.get(render_url('html'))
+
+        with mock.patch.dict(rendering.RENDERERS, {'html': mock.Mock()}):
+            second = self.client.get(render_url('html'))
+            rendering.RENDERERS['html'].assert_not_called()
+
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(second['ETag'], first['ETag'])
+
+    def test_changed_resume_rendered_again(self):
+        """Test a change of the resume data gives a new artifact."""
+        first = self.client.get(render_url('html'))
+
+        Skill.objects.create(user=self.user, title='Go')
+        second = self.client.get(render_url('html'))
+
+        self.assertNotEqual(second['ETag'], first['ETag'])
+        self.assertIn('Python, Django, Go', second.content.decode())
+
+    def test_not_modified(self):
+        """Test a matching If-None-Match returns 304."""
+        etag = self.client.get(render_url('html'))['ETag']
+
+        res = self.client.get(render_url('html'), HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    @override_settings(RESUME_RENDER_INLINE_ROWS=1)
+    def test_large_resume_rendered_in_background(self):
+        """Test a large resume is accepted, then served once rendered."""
+        res = self.client.get(render_url('html'))
+
+        self.assertEqual(res.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(res['Retry-After'], '2')
+
+        # Polling again shares the queued job.
+        self.client.get(render_url('html'))
+        self.assertEqual(
+            Job.objects.filter(kind='resume.render', user=self.user).count(),
+            1,
+        )
+
+        with tempfile.TemporaryDirectory() as tmp:
+            with self.settings(MEDIA_ROOT=tmp):
+                queue.run_pending()
+                # The worker does not share the web process cache.
+                cache.get_cache().clear()
+                res = self.client.get(render_url('html'))
+
+                self.assertEqual(res.status_code, status.HTTP_200_OK)
+                self.assertIn('<h1>Jane Doe</h1>', res.content.decode())
+                self.assertEqual(
+                    Job.objects.filter(kind='resume.render').count(), 1
+                )
@@ -0,0 +1,183 @@
+"""
+Tests for routing resume reads to read replicas.
+"""
+import contextvars
+from contextlib import ExitStack
+from unittest import mock, skipUnless
+
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connections
+from django.test import (
+    RequestFactory,
+    SimpleTestCase,
+    TransactionTestCase,
+    override_settings,
+)
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+from accounts.authentication import local_tokens
+from accounts.models import Profile
+from app import routers
+from resume.models import Skill
+
+
+REPLICAS = settings.REPLICA_DATABASES
+
+
+def isolated(test):
+    """Run ``test`` in an empty context so pins do not leak."""
+    def wrapper(self):
+        return contextvars.Context().run(test, self)
+    return wrapper
+
+
+@override_settings(REPLICA_DATABASES=['replica'])
+class ReplicaRouterTests(SimpleTestCase):
+
+    def setUp(self):
+        self.router = routers.ReplicaRouter()
+
+    @isolated
+    def test_reads_go_to_replicas(self):
+        """Test resume model reads use a replica, others default."""
+        self.assertEqual(self.router.db_for_read(Skill), 'replica')
+        self.assertEqual(self.router.db_for_read(Profile), 'replica')
+        self.assertIsNone(self.router.db_for_read(get_user_model()))
+
+    @isolated
+    @override_settings(REPLICA_DATABASES=['replica', 'replica_2'])
+    def test_one_replica_per_request(self):
+        """Test the reads of a context stay on the replica picked first."""
+        with mock.patch.object(
+            routers.random, 'choice', return_value='replica_2'
+        ) as choice:
+            aliases = {self.router.db_for_read(Skill) for _ in range(3)}
+
+        self.assertEqual(aliases, {'replica_2'})
+        choice.assert_called_once()
+
+    @isolated
+    def test_write_pins_reads_to_default(self):
+        """Test reads after a write in the same context use default."""
+        self.assertEqual(self.router.db_for_write(Skill), 'default')
+
+        self.assertIsNone(self.router.db_for_read(Skill))
+
+    @isolated
+    def test_primary_reads(self):
+        """Test reads in the block use default without pinning."""
+        with routers.primary_reads():
+            self.assertIsNone(self.router.db_for_read(Skill))
+
+        self.assertEqual(self.router.db_for_read(Skill), 'replica')
+
+    @isolated
+    @override_settings(REPLICA_DATABASES=[])
+    def test_no_replicas(self):
+        """Test nothing is routed without replicas."""
+        self.assertIsNone(self.router.db_for_read(Skill))
+        self.assertEqual(self.router.db_for_write(Skill), 'default')
+        self.assertFalse(routers.is_pinned())
+
+    @isolated
+    def test_middleware_restores_pin_async(self):
+        """Test the middleware runs natively around async views."""
+        async def get_response(request):
+            return routers.is_pinned(), routers._replica.get()
+
+        middleware = routers.ReplicaPinningMiddleware(get_response)
+        request = RequestFactory().get('/', HTTP_AUTHORIZATION='Token a')
+        key = routers.PIN_KEY.format(client=routers.client_key(request))
+        cache.set(key, True)
+        self.addCleanup(cache.delete, key)
+
+        self.assertTrue(iscoroutinefunction(middleware))
+        self.assertEqual(async_to_sync(middleware)(request), (True, None))
+        self.assertFalse(routers.is_pinned())
+
+    def test_client_key(self):
+        """Test clients are told apart by their credentials."""
+        factory = RequestFactory()
+        first = factory.get('/', HTTP_AUTHORIZATION='Token a')
+        second = factory.get('/', HTTP_AUTHORIZATION='Token b')
+
+        self.assertIsNone(routers.client_key(factory.get('/')))
+        self.assertNotEqual(
+            routers.client_key(first), routers.client_key(second)
+        )
+        self.assertNotIn('Token', routers.client_key(first))
+
+
+@skipUnless(
+    REPLICAS,
+    'Needs a replica alias: set DB_REPLICA_HOSTS, e.g. to the default host.',
+)
+@override_settings(REPLICA_PIN_SECONDS=60)
+class ReplicaRoutingAPITests(TransactionTestCase):
+    """
+    Test replicas mirror the default database, so reads are told apart
+    by the connection that ran them.
+    """
+    databases = {'default', *REPLICAS}
+
+    def setUp(self):
+        cache.clear()
+        local_tokens.clear()
+        self.user = get_user_model().objects.create_user(
+            'user@example.com', 'testpass123'
+        )
+        token = Token.objects.create(user=self.user)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+        self.url = reverse('resume:skill-list')
+
+    def get(self, client, url):
+        """Return the response and the queries run on the replicas."""
+        with ExitStack() as stack:
+            captured = [
+                stack.enter_context(CaptureQueriesContext(connections[alias]))
+                for alias in REPLICAS
+            ]
+            res = client.get(url)
+        return res, sum(len(queries) for queries in captured)
+
+    def test_reads_hit_replica(self):
+        Skill.objects.create(user=self.user, title='Python')
+
+        res, replica_queries = self.get(self.client, self.url)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual([s['title'] for s in res.data], ['Python'])
+        self.assertGreater(replica_queries, 0)
+
+    def test_read_your_writes(self):
+        """Test a client reads from default after its own write."""
+        res = self.client.post(self.url, {'title': 'Python'})
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+
+        self.assertEqual(self.get(self.client, self.url)[1], 0)
+
+        other = APIClient()
+        other.force_authenticate(user=self.user)
+        self.assertGreater(self.get(other, self.url)[1], 0)
+
+        cache.clear()
+        self.assertGreater(self.get(self.client, self.url)[1], 0)
+
+    def test_cached_resume_built_from_default(self):
+        """Test the cached resume document is not read from the replica."""
+        Skill.objects.create(user=self.user, title='Python')
+
+        res, replica_queries = self.get(
+            self.client, reverse('resume:resume-retrieve')
+        )
+
+        self.assertEqual(res['X-Resume-Cache'], 'MISS')
+        self.assertEqual(replica_queries, 0)
@@ -1,13 +1,19 @@
 """
 Test for Resume API.
 """
+from unittest import mock
+
 from django.contrib.auth import get_user_model
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
 from rest_framework import status
 from rest_framework.test import APIClient
 from accounts.models import Profile
+from metrics.testing import QueryPatternAssertionsMixin
+from resume.api import views
 from resume.models import (
     Skill,
     Education,
@@ -21,7 +27,7 @@ def create_user(email='user@example.com', password='testpass123'):
     return get_user_model().objects.create_user(email, password)
 
 
-class ResumeAPITests(TestCase):
+class ResumeAPITests(QueryPatternAssertionsMixin, TestCase):
 
     def setUp(self):
         self.client = APIClient()
@@ -71,3 +77,145 @@ class ResumeAPITests(TestCase):
         self.assertEqual(len(res.data['certificates']), 1)
         self.assertEqual(len(res.data['experiences']), 1)
         self.assertEqual(len(res.data['profile']), 1)
+
+    def test_retrieve_resume_query_count_is_constant(self):
+        """Test the number of queries does not grow with section sizes."""
+        self.client.force_authenticate(user=self.user)
+        # One query for the ETag validators and one per section.
+        with self.assertNumQueries(6):
+            self.client.get(self.url)
+
+        for i in range(5):
+            Skill.objects.create(user=self.user, title=f'Skill {i}')
+            Education.objects.create(
+                user=self.user,
+                institution=f'Uni {i}',
+                degree='Master',
+                start_date=f'201{i}-01-01',
+            )
+            Certificate.objects.create(
+                user=self.user,
+                title=f'Certificate {i}',
+                issuing_organization='Django Institute',
+                issue_date=f'201{i}-06-01'
+            )
+            Experience.objects.create(
+                user=self.user,
+                company=f'Company {i}',
+                position='Developer',
+                description='Worked on developing applications.',
+                start_date=f'201{i}-04-12',
+            )
+
+        with self.assertNumQueries(6):
+            res = self.client.get(self.url)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data['skills']), 6)
+        self.assertEqual(len(res.data['experiences']), 6)
+
+    def test_retrieve_resume_has_no_duplicate_queries(self):
+        """Test no query shape repeats on the fast or serializer path."""
+        self.client.force_authenticate(user=self.user)
+        Skill.objects.create(user=self.user, title='Django')
+        Experience.objects.create(
+            user=self.user,
+            company='Other Group',
+            position='Developer',
+            description='Worked on developing applications.',
+            start_date='2021-01-01',
+        )
+
+        with self.assertNoDuplicateQueries():
+            self.client.get(self.url)
+        with mock.patch.object(views.ResumeAPIView, 'fast_read', False):
+            with self.assertNoDuplicateQueries():
+                self.client.get(self.url, {'sections': 'profile,skills'})
+
+    def test_retrieve_resume_sections_ordered(self):
+        """Test prefetched sections keep each model's ordering."""
+        Education.objects.create(
+            user=self.user,
+            institution='Old Uni',
+            degree='Diploma',
+            start_date='2015-01-01',
+        )
+        Certificate.objects.create(
+            user=self.user,
+            title='Newer Certificate',
+            issuing_organization='Django Institute',
+            issue_date='2024-01-01'
+        )
+
+        self.client.force_authenticate(user=self.user)
+        res = self.client.get(self.url)
+
+        self.assertEqual(
+            [e['start_date'] for e in res.data['educations']],
+            ['2015-01-01', '2020-01-01'],
+        )
+        self.assertEqual(
+            [c['issue_date'] for c in res.data['certificates']],
+            ['2024-01-01', '2023-06-01'],
+        )
+
+    def test_retrieve_selected_sections(self):
+        """Test only requested sections are returned and queried."""
+        self.client.force_authenticate(user=self.user)
+
+        # One query for the ETag validators and one for the skills.
+        with self.assertNumQueries(2):
+            res = self.client.get(self.url, {'sections': 'email,skills'})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(set(res.data), {'email', 'skills'})
+        self.assertEqual(res.data['skills'][0]['title'], 'Python')
+
+    def test_retrieve_selected_fields(self):
+        """Test requested fields prune sections and loaded columns."""
+        self.client.force_authenticate(user=self.user)
+
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.get(self.url, {
+                'sections': 'profile,experiences',
+                'fields[profile]': 'email,first_name',
+                'fields[experiences]': 'company',
+            })
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            res.data['profile'],
+            [{'email': self.user.email, 'first_name': None}],
+        )
+        self.assertEqual(
+            res.data['experiences'], [{'company': 'Tech Group'}]
+        )
+        experience_sql = [
+            query['sql'] for query in queries.captured_queries
+            if 'FROM "resume_experience"' in query['sql']
+            and 'COUNT' not in query['sql']
+        ]
+        self.assertEqual(len(experience_sql), 1)
+        self.assertNotIn('description', experience_sql[0])
+
+    def test_retrieve_unknown_selection(self):
+        """Test unknown sections and fields are rejected."""
+        self.client.force_authenticate(user=self.user)
+
+        res = self.client.get(self.url, {
+            'sections': 'skills,hobbies',
+            'fields[skills]': 'level',
+        })
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('sections', res.data)
+        self.assertIn('fields[skills]', res.data)
+
+    def test_selections_cached_separately(self):
+        """Test different selections never share a cached document."""
+        self.client.force_authenticate(user=self.user)
+        self.client.get(self.url, {'sections': 'skills'})
+
+        res = self.client.get(self.url)
+
+        self.assertEqual(len(res.json()), 6)
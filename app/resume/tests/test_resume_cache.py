@@ -0,0 +1,82 @@
+"""
+Test for the resume document cache.
+"""
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+from accounts.models import Profile
+from resume import cache
+from resume.models import Skill
+
+
+def create_user(email='user@example.com', password='testpass123'):
+    """Create and return a user."""
+    return get_user_model().objects.create_user(email, password)
+
+
+class ResumeCacheTests(TestCase):
+
+    def setUp(self):
+        cache.get_cache().clear()
+        cache.reset_stats()
+        self.client = APIClient()
+        self.url = reverse('resume:resume-retrieve')
+        self.user = create_user()
+        Skill.objects.create(user=self.user, title='Python')
+        self.client.force_authenticate(user=self.user)
+
+    def test_cache_hit_skips_database(self):
+        """Test a second request is served without touching the database."""
+        first = self.client.get(self.url)
+
+        with self.assertNumQueries(0):
+            second = self.client.get(self.url)
+
+        self.assertEqual(first['X-Resume-Cache'], 'MISS')
+        self.assertEqual(second['X-Resume-Cache'], 'HIT')
+        self.assertEqual(second.status_code, status.HTTP_200_OK)
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(cache.stats(), {'hits': 1, 'misses': 1})
+
+    def test_section_change_invalidates_cache(self):
+        """Test saving or deleting a section invalidates the document."""
+        self.client.get(self.url)
+        skill = Skill.objects.create(user=self.user, title='Django')
+
+        res = self.client.get(self.url)
+
+        self.assertEqual(res['X-Resume-Cache'], 'MISS')
+        self.assertEqual(len(res.json()['skills']), 2)
+
+        skill.delete()
+        res = self.client.get(self.url)
+
+        self.assertEqual(res['X-Resume-Cache'], 'MISS')
+        self.assertEqual(len(res.json()['skills']), 1)
+
+    def test_profile_change_invalidates_cache(self):
+        """Test updating the profile invalidates the document."""
+        self.client.get(self.url)
+        profile = Profile.objects.get(user=self.user)
+        profile.first_name = 'Ada'
+        profile.save()
+
+        res = self.client.get(self.url)
+
+        self.assertEqual(res['X-Resume-Cache'], 'MISS')
+        self.assertEqual(res.json()['profile'][0]['first_name'], 'Ada')
+
+    def test_cache_is_per_user(self):
+        """Test users never receive each other's cached document."""
+        self.client.get(self.url)
+        other_user = create_user(email='other@example.com')
+        self.client.force_authenticate(user=other_user)
+
+        res = self.client.get(self.url)
+
+        self.assertEqual(res['X-Resume-Cache'], 'MISS')
+        self.assertEqual(res.json()['email'], other_user.email)
+        self.assertEqual(res.json()['skills'], [])
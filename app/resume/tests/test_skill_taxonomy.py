@@ -0,0 +1,221 @@
+"""
+Tests for canonical skills and the skill autocomplete.
+"""
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+from analytics.models import Rollup
+from resume import autocomplete
+from resume.models import (
+    CanonicalSkill,
+    CanonicalSkillManager,
+    Skill,
+    SkillAlias,
+)
+
+
+AUTOCOMPLETE_URL = reverse('resume:skill-autocomplete')
+
+
+def create_user(email='user@example.com', password='testpass123'):
+    """Create and return a user."""
+    return get_user_model().objects.create_user(email, password)
+
+
+class CanonicalSkillTests(TestCase):
+
+    def setUp(self):
+        self.user = create_user()
+
+    def test_titles_share_canonical_skill(self):
+        """Test spellings differing in case and spaces are one skill."""
+        other = create_user(email='other@example.com')
+        skills = [
+            Skill.objects.create(user=self.user, title='Python'),
+            Skill.objects.create(user=other, title='python '),
+            Skill.objects.create(user=other, title='  PYTHON'),
+        ]
+
+        self.assertEqual(CanonicalSkill.objects.count(), 1)
+        canonical = CanonicalSkill.objects.get()
+        self.assertEqual((canonical.name, canonical.key), ('Python', 'python'))
+        self.assertEqual({skill.canonical_id for skill in skills}, {
+            canonical.pk
+        })
+        self.assertEqual(skills[1].title, 'python ')
+
+    def test_alias_links_to_canonical_skill(self):
+        """Test titles matching an alias use the aliased skill."""
+        python = Skill.objects.create(user=self.user, title='Python')
+        SkillAlias.objects.create(name='Python3', skill=python.canonical)
+
+        skill = Skill.objects.create(user=self.user, title='python3')
+
+        self.assertEqual(skill.canonical_id, python.canonical_id)
+
+    def test_title_change_relinks(self):
+        """Test updating a title through the API relinks the skill."""
+        client = APIClient()
+        client.force_authenticate(user=self.user)
+        skill = Skill.objects.create(user=self.user, title='Python')
+
+        res = client.patch(
+            reverse('resume:skill-detail', args=[skill.pk]), {'title': 'Go'}
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        skill.refresh_from_db()
+        self.assertEqual(skill.canonical.name, 'Go')
+
+    def test_unchanged_title_not_relinked(self):
+        """Test saving a skill without a new title skips the lookup."""
+        skill = Skill.objects.create(user=self.user, title='Python')
+
+        with mock.patch.object(
+            CanonicalSkillManager, 'resolve',
+            autospec=True, side_effect=CanonicalSkillManager.resolve,
+        ) as resolve:
+            skill.save()
+            Skill.objects.get(pk=skill.pk).save()
+            self.assertFalse(resolve.called)
+
+            skill.title = 'Go'
+            skill.save()
+            self.assertTrue(resolve.called)
+        self.assertEqual(skill.canonical.name, 'Go')
+
+    def test_bulk_writes_link_canonical_skills(self):
+        """Test bulk_create and bulk_update link the skills."""
+        skills = Skill.objects.bulk_create([
+            Skill(user=self.user, title='Django'),
+            Skill(user=self.user, title='DJANGO'),
+        ])
+        self.assertEqual(skills[0].canonical_id, skills[1].canonical_id)
+
+        skills[1].title = 'Flask'
+        Skill.objects.bulk_update(skills, ['title'])
+
+        self.assertEqual(
+            sorted(Skill.objects.values_list('canonical__name', flat=True)),
+            ['Django', 'Flask'],
+        )
+
+
+class SkillAutocompleteTests(TestCase):
+
+    def setUp(self):
+        autocomplete.invalidate()
+        self.client = APIClient()
+        self.user = create_user()
+        self.client.force_authenticate(user=self.user)
+        others = [create_user(email=f'u{i}@example.com') for i in range(3)]
+        for user in others:
+            Skill.objects.create(user=user, title='PostgreSQL')
+        for user in others[:2]:
+            Skill.objects.create(user=user, title='Python')
+        Skill.objects.create(user=self.user, title='Pytest')
+        Skill.objects.create(user=self.user, title='Go')
+
+    def tearDown(self):
+        autocomplete.invalidate()
+
+    def names(self, params):
+        res = self.client.get(AUTOCOMPLETE_URL, params)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return [row['name'] for row in res.data]
+
+    def test_auth_required(self):
+        """Test authentication is required."""
+        res = APIClient().get(AUTOCOMPLETE_URL, {'q': 'py'})
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_most_used_first(self):
+        """Test suggestions match the prefix, most used first."""
+        self.assertEqual(
+            self.names({'q': 'P'}), ['PostgreSQL', 'Python', 'Pytest']
+        )
+        self.assertEqual(self.names({'q': ' py'}), ['Python', 'Pytest'])
+        self.assertEqual(self.names({'q': 'py', 'limit': 1}), ['Python'])
+        self.assertEqual(self.names({'q': 'rust'}), [])
+
+    def test_new_skill_suggested(self):
+        """Test canonical skills created for new titles are suggested."""
+        self.assertEqual(self.names({'q': 'pyr'}), [])
+
+        Skill.objects.create(user=self.user, title='Pyramid')
+
+        self.assertEqual(self.names({'q': 'pyr'}), ['Pyramid'])
+
+    def test_aliases_suggest_canonical_skill(self):
+        """Test an alias prefix suggests its canonical skill once."""
+        SkillAlias.objects.create(
+            name='Postgres', skill=CanonicalSkill.objects.get(key='postgresql')
+        )
+
+        self.assertEqual(self.names({'q': 'postgres'}), ['PostgreSQL'])
+
+    def test_suggestions_served_from_trie(self):
+        """Test lookups after the first one run no query."""
+        autocomplete.suggest('py')
+
+        with self.assertNumQueries(0):
+            suggestions = autocomplete.suggest('pyt')
+
+        self.assertEqual(
+            [row['name'] for row in suggestions], ['Python', 'Pytest']
+        )
+
+    def test_usage_read_from_rollup(self):
+        """Test the trie ranks skills by the skills rollup."""
+        Rollup.objects.filter(
+            metric='skills',
+            key=str(CanonicalSkill.objects.get(key='pytest').pk),
+        ).update(count=10)
+
+        self.assertEqual(
+            self.names({'q': 'p'}), ['Pytest', 'PostgreSQL', 'Python']
+        )
+
+    @override_settings(SKILL_AUTOCOMPLETE_TTL=0)
+    def test_expired_trie_rebuilt_in_background(self):
+        """Test an expired trie is still served while a thread rebuilds."""
+        trie = autocomplete.get_trie()
+        Rollup.objects.filter(
+            metric='skills',
+            key=str(CanonicalSkill.objects.get(key='pytest').pk),
+        ).update(count=10)
+        self.addCleanup(setattr, autocomplete, '_rebuilding', False)
+
+        with mock.patch.object(autocomplete.threading, 'Thread') as thread:
+            with self.assertNumQueries(0):
+                self.assertIs(autocomplete.get_trie(), trie)
+            # A single rebuild at a time.
+            autocomplete.get_trie()
+
+        thread.assert_called_once()
+        thread.return_value.start.assert_called_once_with()
+        autocomplete._rebuild(*thread.call_args.kwargs['args'])
+        self.assertEqual(
+            [name for _, name in autocomplete.get_trie().lookup('py')],
+            ['Pytest', 'Python'],
+        )
+
+    @override_settings(SKILL_AUTOCOMPLETE_CACHE_SIZE=1)
+    def test_completed_from_database(self):
+        """Test skills beyond the trie size are read from the database."""
+        self.assertEqual(
+            self.names({'q': 'p'}), ['PostgreSQL', 'Pytest', 'Python']
+        )
+
+    def test_invalid_parameters(self):
+        """Test a query is required and the limit bounded."""
+        res = self.client.get(AUTOCOMPLETE_URL, {'limit': 50})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(set(res.data), {'q', 'limit'})
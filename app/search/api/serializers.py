@@ -0,0 +1,23 @@
+"""
+Serializers for the search API.
+"""
+from rest_framework import serializers
+
+
+class SearchQuerySerializer(serializers.Serializer):
+    """Validate the query parameters of a search."""
+    q = serializers.CharField(
+        max_length=200, required=False, allow_blank=True, default=''
+    )
+    facet_limit = serializers.IntegerField(
+        min_value=0, max_value=100, required=False, default=10
+    )
+
+
+class SearchResultSerializer(serializers.Serializer):
+    """A user matching a search, from ``.values()`` rows."""
+    id = serializers.IntegerField(source='pk')
+    email = serializers.EmailField(source='user__email')
+    first_name = serializers.CharField(source='user__profile__first_name')
+    last_name = serializers.CharField(source='user__profile__last_name')
+    rank = serializers.FloatField()
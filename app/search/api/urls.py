@@ -0,0 +1,13 @@
+"""
+Url mappings for the search app.
+"""
+from django.urls import path
+
+from search.api import views
+
+
+app_name = 'search'
+
+urlpatterns = [
+    path('', views.SearchAPIView.as_view(), name='search'),
+]
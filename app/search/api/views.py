@@ -0,0 +1,58 @@
+"""
+Views for the search API.
+"""
+from rest_framework import generics
+from rest_framework.pagination import LimitOffsetPagination
+from rest_framework.permissions import IsAdminUser
+from accounts.authentication import CachedTokenAuthentication
+from search import index
+from search.api import serializers
+from search.backends import tokenize
+
+
+class SearchPagination(LimitOffsetPagination):
+    default_limit = 20
+    max_limit = 100
+
+
+class SearchAPIView(generics.GenericAPIView):
+    """
+    API view searching the resumes of all users, for staff.
+
+    ``q`` matches every word against the skills, experiences, educations
+    and certificates. Facet parameters such as ``skills=Python`` or
+    ``companies=Acme`` keep users with that exact value and may be
+    repeated. The response counts the values of every facet among all
+    matching users.
+    """
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [IsAdminUser]
+    serializer_class = serializers.SearchQuerySerializer
+    pagination_class = SearchPagination
+
+    def get(self, request, *args, **kwargs):
+        params = self.get_serializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        filters = {
+            facet: request.query_params.getlist(facet)
+            for facet in index.FACETS
+            if facet in request.query_params
+        }
+        documents = index.search(
+            tokenize(params.validated_data['q']), filters
+        )
+
+        page = self.paginate_queryset(documents.values(
+            'pk',
+            'rank',
+            'user__email',
+            'user__profile__first_name',
+            'user__profile__last_name',
+        ))
+        response = self.get_paginated_response(
+            serializers.SearchResultSerializer(page, many=True).data
+        )
+        response.data['facets'] = index.facet_counts(
+            documents, limit=params.validated_data['facet_limit']
+        )
+        return response
@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+
+class SearchConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'search'
+
+    def ready(self):
+        from search import index, tasks  # noqa: F401
@@ -0,0 +1,216 @@
+"""
+Full text matching of search documents.
+
+PostgreSQL matches the ``tsvector`` column through its GIN index. Other
+databases, SQLite in development and tests, use an inverted index kept
+in process memory; its matches are ranked in Python and only the rows
+of a page are read, so the query size does not grow with the number of
+matching users.
+"""
+import re
+import threading
+from collections import Counter, defaultdict
+
+from django.contrib.postgres.search import (
+    SearchQuery,
+    SearchRank,
+    SearchVector,
+)
+from django.db import connections
+from django.db.models import Count, F, Max
+
+from search.models import SearchDocument, SearchFacet
+
+
+# No stemming, so both backends match the same words.
+SEARCH_CONFIG = 'simple'
+
+TOKEN = re.compile(r'\w+')
+
+# Users per query when reading the facets of documents ranked in Python,
+# well below SQLite's limit of query parameters.
+USER_BATCH = 500
+
+
+def tokenize(text):
+    return TOKEN.findall(text.lower())
+
+
+class PostgresBackend:
+    """Match documents with PostgreSQL full text search."""
+
+    def update(self, texts, using):
+        """Refresh the vectors of the ``{user_id: text}`` documents."""
+        SearchDocument.objects.using(using).filter(
+            pk__in=[pk for pk, text in texts.items() if text is not None]
+        ).update(vector=SearchVector('text', config=SEARCH_CONFIG))
+
+    def match(self, queryset, terms, using):
+        """
+        Filter ``queryset`` by ``terms`` and annotate a ``rank``, best
+        matches first.
+        """
+        query = SearchQuery(' '.join(terms), config=SEARCH_CONFIG)
+        return queryset.filter(vector=query).annotate(
+            rank=SearchRank(F('vector'), query)
+        ).order_by('-rank', 'pk')
+
+
+class RankedDocuments:
+    """
+    Search documents ranked in Python, best matches first, standing in
+    for the queryset of ``PostgresBackend.match``: it can be counted,
+    sliced into ``.values()`` rows with their ``rank`` and have its
+    facets counted, every query bounded by a page or ``USER_BATCH``.
+    """
+
+    def __init__(self, queryset, ranked, fields=('pk',)):
+        # The unfiltered documents and the ``(pk, rank)`` of the matches.
+        self.queryset = queryset
+        self.ranked = ranked
+        self.fields = fields
+
+    def values(self, *fields):
+        return RankedDocuments(self.queryset, self.ranked, fields)
+
+    def count(self):
+        return len(self.ranked)
+
+    __len__ = count
+
+    def exists(self):
+        return bool(self.ranked)
+
+    def __getitem__(self, index):
+        if not isinstance(index, slice):
+            return self[index:index + 1][0]
+        ranked = self.ranked[index]
+        fields = [field for field in self.fields if field != 'rank']
+        rows = {
+            row['pk']: row
+            for row in self.queryset.filter(
+                pk__in=[pk for pk, _ in ranked]
+            ).values('pk', *fields)
+        }
+        return [
+            {**rows[pk], 'rank': rank} for pk, rank in ranked if pk in rows
+        ]
+
+    def __iter__(self):
+        return iter(self[:])
+
+    def count_facets(self):
+        """Return ``{facet: Counter(value: users)}`` of the documents."""
+        counts = defaultdict(Counter)
+        facets = SearchFacet.objects.using(self.queryset.db)
+        for start in range(0, len(self.ranked), USER_BATCH):
+            users = [pk for pk, _ in self.ranked[start:start + USER_BATCH]]
+            for row in facets.filter(user__in=users).values(
+                'facet', 'value'
+            ).annotate(count=Count('user')).order_by():
+                counts[row['facet']][row['value']] += row['count']
+        return counts
+
+
+class InvertedIndex:
+    """
+    Match documents with an in-process inverted index.
+
+    The index is loaded from the documents table on first use and
+    updated in place when documents of this process change. It is
+    rebuilt when the table was changed by another process, detected by
+    its row count and last update.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        # token -> {user_id: occurrences}
+        self.postings = defaultdict(dict)
+        self.tokens = {}
+        self.state = None
+
+    def get_state(self, using):
+        return SearchDocument.objects.using(using).aggregate(
+            count=Count('pk'), last=Max('updated_time')
+        )
+
+    def _remove(self, user_id):
+        for token in self.tokens.pop(user_id, ()):
+            postings = self.postings[token]
+            postings.pop(user_id, None)
+            if not postings:
+                del self.postings[token]
+
+    def _add(self, user_id, text):
+        counts = Counter(tokenize(text))
+        self.tokens[user_id] = list(counts)
+        for token, count in counts.items():
+            self.postings[token][user_id] = count
+
+    def load(self, using):
+        self.reset()
+        documents = SearchDocument.objects.using(using).values_list(
+            'pk', 'text'
+        )
+        for user_id, text in documents.iterator():
+            self._add(user_id, text)
+        self.state = self.get_state(using)
+
+    def update(self, texts, using):
+        """Apply ``{user_id: text}``, None texts removing documents."""
+        with self.lock:
+            if self.state is None:
+                return
+            for user_id, text in texts.items():
+                self._remove(user_id)
+                if text is not None:
+                    self._add(user_id, text)
+            self.state = self.get_state(using)
+
+    def scores(self, terms, using):
+        """Return ``{user_id: score}`` of documents having every term."""
+        with self.lock:
+            if self.state is None or self.state != self.get_state(using):
+                self.load(using)
+            scores = None
+            for term in terms:
+                postings = self.postings.get(term, {})
+                if scores is None:
+                    scores = dict(postings)
+                else:
+                    scores = {
+                        user_id: score + postings[user_id]
+                        for user_id, score in scores.items()
+                        if user_id in postings
+                    }
+            return scores or {}
+
+    def match(self, queryset, terms, using):
+        """
+        Return the documents of ``queryset`` having every term, ranked
+        by the occurrences of the terms, as ``RankedDocuments``.
+        """
+        scores = self.scores(terms, using)
+        if scores and queryset.query.has_filters():
+            # Facet filters, read as one query without parameters.
+            allowed = set(queryset.values_list('pk', flat=True))
+            scores = {
+                pk: score for pk, score in scores.items() if pk in allowed
+            }
+        ranked = sorted(
+            ((pk, float(score)) for pk, score in scores.items()),
+            key=lambda item: (-item[1], item[0]),
+        )
+        return RankedDocuments(queryset.model.objects.using(using), ranked)
+
+
+inverted_index = InvertedIndex()
+
+
+def get_backend(using):
+    if connections[using].vendor == 'postgresql':
+        return PostgresBackend()
+    return inverted_index
@@ -0,0 +1,209 @@
+"""
+Search documents of the resumes.
+
+Every user has a search document holding the text of their skills,
+experiences, educations and certificates, and a facet row per distinct
+skill, company, position, institution, degree, certificate and issuer.
+Once the transaction that changed resumes commits, their documents are
+rebuilt by a background job, once per user however many rows changed.
+"""
+import threading
+
+from django.contrib.auth import get_user_model
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.db.models import Count, Value
+from django.dispatch import receiver
+
+from jobs import queue
+from resume.models import (
+    Skill,
+    Education,
+    Certificate,
+    Experience
+)
+from resume.signals import resume_changed, resumes_created
+from search.backends import RankedDocuments, get_backend
+from search.models import SearchDocument, SearchFacet
+
+
+# Fields in the search text per model, with the facet of the short ones.
+SEARCH_FIELDS = (
+    (Skill, (('title', None), ('canonical__name', 'skills'))),
+    (Experience, (
+        ('company', 'companies'),
+        ('position', 'positions'),
+        ('description', None),
+    )),
+    (Education, (
+        ('institution', 'institutions'),
+        ('degree', 'degrees'),
+    )),
+    (Certificate, (
+        ('title', 'certificates'),
+        ('issuing_organization', 'issuers'),
+    )),
+)
+
+FACETS = tuple(
+    facet for _, fields in SEARCH_FIELDS for _, facet in fields if facet
+)
+
+
+def build_documents(user_ids, using=DEFAULT_DB_ALIAS):
+    """
+    Return ``({user_id: text}, {(user_id, facet, value)})`` for the
+    existing users of ``user_ids``, with one query per section.
+    """
+    existing = get_user_model().objects.using(using).filter(
+        pk__in=user_ids
+    ).values_list('pk', flat=True)
+    texts = {user_id: [] for user_id in existing}
+    facets = set()
+    for model, fields in SEARCH_FIELDS:
+        rows = model.objects.using(using).filter(
+            user__in=list(texts)
+        ).order_by('user', 'pk').values_list(
+            'user', *[name for name, _ in fields]
+        )
+        for user_id, *values in rows:
+            for (_, facet), value in zip(fields, values):
+                value = (value or '').strip()
+                if not value:
+                    continue
+                texts[user_id].append(value)
+                if facet is not None:
+                    facets.add((user_id, facet, value))
+    return {
+        user_id: '\n'.join(parts) for user_id, parts in texts.items()
+    }, facets
+
+
+def update_documents(user_ids, using=DEFAULT_DB_ALIAS):
+    """Rebuild the search documents of ``user_ids``."""
+    user_ids = set(user_ids)
+    texts, facets = build_documents(user_ids, using=using)
+    with transaction.atomic(using=using):
+        SearchFacet.objects.using(using).filter(user__in=user_ids).delete()
+        SearchDocument.objects.using(using).bulk_create(
+            [
+                SearchDocument(user_id=user_id, text=text)
+                for user_id, text in texts.items()
+            ],
+            update_conflicts=True,
+            unique_fields=['user'],
+            update_fields=['text', 'updated_time'],
+        )
+        SearchFacet.objects.using(using).bulk_create([
+            SearchFacet(user_id=user_id, facet=facet, value=value)
+            for user_id, facet, value in facets
+        ])
+        # Users that no longer exist are dropped from the index.
+        texts.update((user_id, None) for user_id in user_ids - set(texts))
+        get_backend(using).update(texts, using)
+
+
+# Users per ``search.index`` job.
+INDEX_BATCH = 500
+
+
+def enqueue_update(user_ids):
+    """Queue jobs rebuilding the documents of ``user_ids``."""
+    user_ids = sorted(user_ids)
+    for start in range(0, len(user_ids), INDEX_BATCH):
+        queue.enqueue(
+            'search.index',
+            {'user_ids': user_ids[start:start + INDEX_BATCH]},
+        )
+
+
+class _Batch:
+    """Users whose documents are queued once a transaction commits."""
+
+    def __init__(self):
+        self.user_ids = set()
+
+    def __call__(self):
+        if getattr(_pending, 'batch', None) is self:
+            del _pending.batch
+        enqueue_update(self.user_ids)
+
+
+# The batch of the current transaction.
+_pending = threading.local()
+
+
+def schedule_update(user_ids):
+    """
+    Rebuild the documents of ``user_ids`` in the background once the
+    current transaction commits, queuing at once outside transactions.
+    """
+    connection = transaction.get_connection()
+    batch = getattr(_pending, 'batch', None)
+    # The batch of a rolled back transaction is no longer registered.
+    if batch is None or not any(
+        callback[1] is batch for callback in connection.run_on_commit
+    ):
+        batch = _pending.batch = _Batch()
+        batch.user_ids.update(user_ids)
+        transaction.on_commit(batch)
+    else:
+        batch.user_ids.update(user_ids)
+
+
+@receiver(resume_changed)
+def resume_changed_handler(sender, user_id, **kwargs):
+    schedule_update([user_id])
+
+
+@receiver(resumes_created)
+def resumes_created_handler(sender, user_ids, **kwargs):
+    schedule_update(user_ids)
+
+
+def search(terms=(), filters=None, using=DEFAULT_DB_ALIAS):
+    """
+    Return the search documents having every term and every
+    ``{facet: [values]}`` filter, annotated with a ``rank`` and best
+    matches first, as a queryset or the ``RankedDocuments`` of the
+    in-process backend.
+    """
+    documents = SearchDocument.objects.using(using)
+    facets = SearchFacet.objects.using(using)
+    for facet, values in (filters or {}).items():
+        for value in values:
+            documents = documents.filter(user__in=facets.filter(
+                facet=facet, value=value
+            ).values('user'))
+    if terms:
+        return get_backend(using).match(documents, terms, using)
+    return documents.annotate(rank=Value(0.0)).order_by('-rank', 'pk')
+
+
+def facet_counts(documents, limit=10, using=DEFAULT_DB_ALIAS):
+    """
+    Return the most common values of every facet among ``documents``
+    as ``{facet: [{'value': ..., 'count': ...}]}``.
+    """
+    if isinstance(documents, RankedDocuments):
+        counted = documents.count_facets()
+        return {
+            facet: [
+                {'value': value, 'count': count}
+                for value, count in sorted(
+                    counted[facet].items(),
+                    key=lambda item: (-item[1], item[0]),
+                )[:limit]
+            ]
+            for facet in FACETS
+        }
+    users = documents.order_by().values('pk')
+    counts = {}
+    for facet in FACETS:
+        counts[facet] = list(
+            SearchFacet.objects.using(using).filter(
+                facet=facet, user__in=users
+            ).values('value').annotate(
+                count=Count('user')
+            ).order_by('-count', 'value')[:limit]
+        )
+    return counts
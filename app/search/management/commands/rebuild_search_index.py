@@ -0,0 +1,37 @@
+"""
+Django command to rebuild the resume search index.
+"""
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from search import index
+
+
+class Command(BaseCommand):
+    """Rebuild the search documents of every user in chunks."""
+    help = (
+        'Rebuild the search document and facets of every user, for '
+        'existing data or after changing the indexed fields.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        if options['chunk_size'] < 1:
+            raise CommandError('--chunk-size must be positive.')
+
+        users = get_user_model().objects.order_by('pk')
+        count, last = 0, 0
+        while True:
+            chunk = list(users.filter(pk__gt=last).values_list(
+                'pk', flat=True
+            )[:options['chunk_size']])
+            if not chunk:
+                break
+            index.update_documents(chunk)
+            count, last = count + len(chunk), chunk[-1]
+            self.stdout.write(f'Indexed {count} users...')
+        self.stdout.write(self.style.SUCCESS(
+            f'Rebuilt the search index of {count} users.'
+        ))
@@ -0,0 +1,48 @@
+# Generated by Django 4.2.30 on 2026-10-18 11:15
+
+from django.conf import settings
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('accounts', '0006_profile_unique_user'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchDocument',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='search_document', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('text', models.TextField(blank=True)),
+                ('vector', django.contrib.postgres.search.SearchVectorField(null=True)),
+                ('updated_time', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'indexes': [django.contrib.postgres.indexes.GinIndex(fields=['vector'], name='search_document_vector_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='SearchFacet',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('facet', models.CharField(max_length=20)),
+                ('value', models.CharField(max_length=255)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_facets', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['facet', 'value'], name='search_facet_value_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='searchfacet',
+            constraint=models.UniqueConstraint(fields=('user', 'facet', 'value'), name='search_facet_unique_value'),
+        ),
+    ]
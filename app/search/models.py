@@ -0,0 +1,58 @@
+"""
+Models of the resume search index.
+"""
+from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
+from django.db import models
+
+
+class SearchDocument(models.Model):
+    """
+    The searchable text of a user's resume, rebuilt whenever the resume
+    changes. ``vector`` is only filled on PostgreSQL.
+    """
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        primary_key=True,
+        related_name='search_document',
+        on_delete=models.CASCADE
+    )
+    text = models.TextField(blank=True)
+    vector = SearchVectorField(null=True)
+    updated_time = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            GinIndex(fields=['vector'], name='search_document_vector_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.user_id}'
+
+
+class SearchFacet(models.Model):
+    """A facet value of a user's resume, such as a skill or a company."""
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        related_name='search_facets',
+        on_delete=models.CASCADE
+    )
+    facet = models.CharField(max_length=20)
+    value = models.CharField(max_length=255)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'facet', 'value'],
+                name='search_facet_unique_value',
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=['facet', 'value'], name='search_facet_value_idx'
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.facet}: {self.value}'
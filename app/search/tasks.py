@@ -0,0 +1,12 @@
+"""
+Background jobs of the search app.
+"""
+from jobs.queue import task
+from search import index
+
+
+@task('search.index', timeout=10 * 60)
+def index_resumes(user_ids):
+    """Rebuild the search documents of ``user_ids``."""
+    index.update_documents(user_ids)
+    return {'users': len(user_ids)}
@@ -0,0 +1,181 @@
+"""
+Tests for the resume search index.
+"""
+from contextlib import suppress
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import transaction
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+from jobs import queue
+from jobs.models import Job
+from resume.models import (
+    Skill,
+    Experience,
+)
+from search import index
+from search.backends import inverted_index
+from search.models import SearchDocument, SearchFacet
+
+
+def create_user(email='user@example.com', password='testpass123'):
+    """Create and return a user."""
+    return get_user_model().objects.create_user(email, password)
+
+
+def facets(user):
+    return set(
+        SearchFacet.objects.filter(user=user).values_list('facet', 'value')
+    )
+
+
+class SearchIndexTests(TestCase):
+
+    def setUp(self):
+        inverted_index.reset()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user = create_user()
+            Skill.objects.create(user=self.user, title='Python')
+            self.experience = Experience.objects.create(
+                user=self.user,
+                company='Acme',
+                position='Developer',
+                description='Built search engines.',
+                start_date='2020-01-01',
+            )
+        queue.run_pending()
+
+    def test_document_built_on_commit(self):
+        """Test section writes update the document once committed."""
+        document = SearchDocument.objects.get(user=self.user)
+
+        self.assertIn('Built search engines.', document.text)
+        self.assertEqual(facets(self.user), {
+            ('skills', 'Python'),
+            ('companies', 'Acme'),
+            ('positions', 'Developer'),
+        })
+
+    def test_not_indexed_before_commit(self):
+        """Test nothing is indexed before the transaction commits."""
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            Skill.objects.create(user=self.user, title='Go')
+
+        self.assertNotIn(('skills', 'Go'), facets(self.user))
+        self.assertEqual(len(callbacks), 1)
+
+    def test_update_and_delete_sections(self):
+        """Test changed and deleted rows leave the document."""
+        with self.captureOnCommitCallbacks(execute=True):
+            self.experience.company = 'Globex'
+            self.experience.save()
+            Skill.objects.filter(user=self.user).get().delete()
+        queue.run_pending()
+
+        self.assertEqual(facets(self.user), {
+            ('companies', 'Globex'),
+            ('positions', 'Developer'),
+        })
+        self.assertEqual(
+            [row['pk'] for row in index.search(['globex']).values('pk')],
+            [self.user.pk],
+        )
+        self.assertFalse(index.search(['python']).exists())
+
+    def test_deleted_user_removed(self):
+        """Test deleting a user drops their document and facets."""
+        self.assertTrue(index.search(['acme']).exists())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.delete()
+        queue.run_pending()
+
+        self.assertFalse(SearchDocument.objects.exists())
+        self.assertFalse(SearchFacet.objects.exists())
+        self.assertFalse(index.search(['acme']).exists())
+
+    def test_writes_rebuild_each_user_once(self):
+        """Test many writes in a transaction queue the user once."""
+        with self.captureOnCommitCallbacks() as callbacks:
+            for i in range(5):
+                Skill.objects.create(user=self.user, title=f'Skill {i}')
+
+        self.assertEqual(len(callbacks), 1)
+        with self.assertNumQueries(1):
+            callbacks[0]()
+        job = Job.objects.get(status=Job.QUEUED)
+        self.assertEqual(job.payload, {'user_ids': [self.user.pk]})
+        self.assertNotIn(('skills', 'Skill 0'), facets(self.user))
+
+        queue.run_pending()
+
+        self.assertEqual(
+            SearchFacet.objects.filter(user=self.user, facet='skills').count(),
+            6,
+        )
+
+    def test_rolled_back_writes_not_queued(self):
+        """Test the users of a rolled back savepoint are not queued."""
+        with self.captureOnCommitCallbacks(execute=True):
+            with suppress(RuntimeError), transaction.atomic():
+                Skill.objects.create(user=self.user, title='Go')
+                raise RuntimeError
+            other = create_user(email='other@example.com')
+
+        job = Job.objects.get(status=Job.QUEUED)
+        self.assertEqual(job.payload, {'user_ids': [other.pk]})
+
+    def test_login_does_not_reindex(self):
+        """Test saving fields outside the resume queues nothing."""
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.user.save(update_fields=['last_login'])
+
+        self.assertEqual(callbacks, [])
+
+    def test_bulk_provisioned_users_indexed(self):
+        """Test users created in bulk get a document."""
+        with self.captureOnCommitCallbacks(execute=True):
+            admin = get_user_model().objects.create_superuser(
+                'admin@example.com', 'testpass123'
+            )
+        client = APIClient()
+        client.force_authenticate(user=admin)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            res = client.post(
+                reverse('accounts:users-bulk'),
+                [{'email': 'new@example.com'}],
+                format='json',
+            )
+        queue.run_pending()
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertTrue(SearchDocument.objects.filter(
+            user__email='new@example.com'
+        ).exists())
+
+    def test_index_rebuilt_when_changed_elsewhere(self):
+        """Test the in-process index notices other processes' writes."""
+        self.assertTrue(index.search(['python']).exists())
+
+        other = create_user(email='other@example.com')
+        SearchDocument.objects.create(user=other, text='Rust')
+
+        self.assertTrue(index.search(['rust']).exists())
+
+    def test_rebuild_command(self):
+        """Test the command rebuilds every document."""
+        SearchDocument.objects.all().delete()
+        SearchFacet.objects.all().delete()
+
+        out = StringIO()
+        call_command('rebuild_search_index', chunk_size=1, stdout=out)
+
+        self.assertEqual(SearchDocument.objects.count(), 1)
+        self.assertEqual(len(facets(self.user)), 3)
+        self.assertIn('Rebuilt the search index of 1 users.', out.getvalue())
@@ -0,0 +1,182 @@
+"""
+Tests for the search API.
+"""
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+from accounts.models import Profile
+from jobs import queue
+from resume.models import (
+    Skill,
+    Education,
+    Certificate,
+    Experience,
+)
+from search import backends
+from search.backends import inverted_index
+
+
+SEARCH_URL = reverse('search:search')
+
+
+def create_user(email='user@example.com', password='testpass123'):
+    """Create and return a user."""
+    return get_user_model().objects.create_user(email, password)
+
+
+def create_resume(user, skills, company, institution='Tech Uni'):
+    for title in skills:
+        Skill.objects.create(user=user, title=title)
+    Experience.objects.create(
+        user=user,
+        company=company,
+        position='Developer',
+        description='Worked on developing applications.',
+        start_date='2020-01-01',
+    )
+    Education.objects.create(
+        user=user,
+        institution=institution,
+        degree='Bachelor',
+        start_date='2015-09-01',
+    )
+    Certificate.objects.create(
+        user=user,
+        title='Cloud Practitioner',
+        issuing_organization='AWS',
+        issue_date='2021-05-01',
+    )
+
+
+class SearchAPITests(TestCase):
+
+    def setUp(self):
+        inverted_index.reset()
+        self.client = APIClient()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.jane = create_user(email='jane@example.com')
+            Profile.objects.filter(user=self.jane).update(
+                first_name='Jane', last_name='Doe'
+            )
+            create_resume(self.jane, ['Python', 'Django'], 'Acme')
+            self.john = create_user(email='john@example.com')
+            create_resume(self.john, ['Python', 'Go'], 'Globex', 'Poly')
+            # Python twice, so John ranks first for it.
+            Skill.objects.create(user=self.john, title='Python scripting')
+            self.admin = get_user_model().objects.create_superuser(
+                'admin@example.com', 'testpass123'
+            )
+        queue.run_pending()
+        self.client.force_authenticate(user=self.admin)
+
+    def test_search_requires_staff(self):
+        """Test regular users cannot search."""
+        self.client.force_authenticate(user=self.jane)
+
+        res = self.client.get(SEARCH_URL, {'q': 'python'})
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_full_text_search(self):
+        """Test every word must match, best matches first."""
+        res = self.client.get(SEARCH_URL, {'q': 'Python'})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['count'], 2)
+        self.assertEqual(
+            [row['email'] for row in res.data['results']],
+            ['john@example.com', 'jane@example.com'],
+        )
+
+        res = self.client.get(SEARCH_URL, {'q': 'python django'})
+
+        self.assertEqual(res.data['count'], 1)
+        self.assertEqual(res.data['results'][0], {
+            'id': self.jane.pk,
+            'email': 'jane@example.com',
+            'first_name': 'Jane',
+            'last_name': 'Doe',
+            'rank': res.data['results'][0]['rank'],
+        })
+
+    def test_search_every_indexed_field(self):
+        """Test positions, institutions and certificates are searched."""
+        for query, count in [
+            ('developer', 2),
+            ('poly', 1),
+            ('cloud aws', 2),
+            ('applications', 2),
+            ('cobol', 0),
+        ]:
+            res = self.client.get(SEARCH_URL, {'q': query})
+
+            self.assertEqual(res.data['count'], count, query)
+
+    def test_facet_counts(self):
+        """Test facet values are counted among matching users."""
+        res = self.client.get(SEARCH_URL, {'q': 'python'})
+
+        facets = res.data['facets']
+        self.assertEqual(facets['skills'][0], {'value': 'Python', 'count': 2})
+        self.assertEqual(
+            {row['value'] for row in facets['companies']}, {'Acme', 'Globex'}
+        )
+        self.assertEqual(facets['issuers'], [{'value': 'AWS', 'count': 2}])
+
+    def test_facet_filters(self):
+        """Test facet parameters keep users with every value."""
+        res = self.client.get(
+            SEARCH_URL, {'skills': ['Python', 'Go']}
+        )
+
+        self.assertEqual(
+            [row['email'] for row in res.data['results']],
+            ['john@example.com'],
+        )
+        self.assertEqual(res.data['facets']['companies'], [
+            {'value': 'Globex', 'count': 1},
+        ])
+
+        res = self.client.get(SEARCH_URL, {'q': 'python', 'companies': 'Acme'})
+
+        self.assertEqual(res.data['count'], 1)
+
+    def test_pagination(self):
+        """Test results are paginated with limit and offset."""
+        res = self.client.get(SEARCH_URL, {'limit': 1})
+
+        self.assertEqual(res.data['count'], 3)
+        self.assertEqual(len(res.data['results']), 1)
+        self.assertIsNotNone(res.data['next'])
+
+    def test_query_size_bounded(self):
+        """Test only a page of rows and batches of users are queried."""
+        # Loading the index, its state, the page and a facet query per
+        # user.
+        with mock.patch.object(backends, 'USER_BATCH', 1), \
+                self.assertNumQueries(5):
+            res = self.client.get(
+                SEARCH_URL, {'q': 'developer', 'limit': 1, 'offset': 1}
+            )
+
+        self.assertEqual(res.data['count'], 2)
+        self.assertEqual(
+            [row['email'] for row in res.data['results']],
+            ['john@example.com'],
+        )
+        self.assertEqual(
+            res.data['facets']['institutions'],
+            [{'value': 'Poly', 'count': 1}, {'value': 'Tech Uni', 'count': 1}],
+        )
+
+    def test_invalid_parameters(self):
+        """Test invalid parameters are rejected."""
+        res = self.client.get(SEARCH_URL, {'facet_limit': 'many'})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('facet_limit', res.data)